@@ -2,3 +2,4 @@ from .transaction import *
 from vortex.banking.account.bank_account_activity import *
 from vortex.banking.account.bank_activity import *
 from .statements_reader import *
+from .ofx_reader import *
@@ -19,6 +19,10 @@ class BankAccount:
     def __hash__(self):
         return hash(self.id)
 
+    def __reduce__(self):
+        # Unpickle (e.g. from shelves or worker processes) to the shared account instances
+        return BankAccount.account_for_id, (self.id,)
+
     @staticmethod
     def account_for_id(id: int) -> 'BankAccount':
         for acc in [
@@ -1,12 +1,18 @@
+from bisect import bisect_left, bisect_right
 from decimal import Decimal
+from functools import cached_property
 from typing import Optional
 
+import numpy as np
+
 from vortex.banking.account.bank_account import BankAccount
 from vortex.banking.transaction.transaction import Transaction
+from vortex.banking.transaction.payee_dictionary import PAYEES
 from vortex.date_range import Day, DateRange
 from vortex.utils import checked_list_type, checked_type, checked_dict_type
+from vortex.utils.money import from_pence, to_pence
 
-__all__ = ["BankAccountActivity"]
+__all__ = ["BankAccountActivity", "BankAccountActivityView"]
 
 from vortex.utils.collection_utils import group_into_dict
 
@@ -17,6 +23,7 @@ class BankAccountActivity:
             account: BankAccount,
             transactions: list[Transaction],
             published_balances: dict[Day, Decimal],
+            validate: bool = True,
     ):
         self.account: BankAccount = checked_type(account, BankAccount)
         self.transactions: list[Transaction] = sorted(
@@ -39,91 +46,176 @@ class BankAccountActivity:
         self.transactions_by_date: dict[Day, list[Transaction]] = group_into_dict(self.transactions,
                                                                                   lambda t: t.payment_date)
         self.payment_dates: list[Day] = sorted(self.transactions_by_date.keys())
-        self.check_consistency()
+        self._build_balance_index()
+        if validate:
+            self.check_consistency()
+
+    def _build_balance_index(self):
+        # The index is held in whole pence, converting to decimals only for results.
+        # _cumulative_flows[i] is the sum of all transaction amounts on the first i payment dates, so
+        # flows over any date span are the difference of two entries found by bisecting payment_dates
+        self._day_totals: dict[Day, int] = {
+            d: sum(to_pence(tr.amount) for tr in self.transactions_by_date[d])
+            for d in self.payment_dates
+        }
+        cumulative = 0
+        self._cumulative_flows: list[int] = [cumulative]
+        for d in self.payment_dates:
+            cumulative += self._day_totals[d]
+            self._cumulative_flows.append(cumulative)
+
+        # _transaction_offsets[i] is the number of transactions on the first i payment dates, so the
+        # transactions on any run of payment dates are a contiguous slice of self.transactions
+        self._transaction_offsets: list[int] = [0]
+        for d in self.payment_dates:
+            self._transaction_offsets.append(self._transaction_offsets[-1] + len(self.transactions_by_date[d]))
+
+        # Array form of the same index for answering many balance queries at once. The eod balance on
+        # any day is the base of the nearest preceding balance date plus the cumulative flow to that day
+        self._payment_ordinals = np.array([d.ordinal for d in self.payment_dates], dtype=np.int64)
+        self._balance_ordinals = np.array([d.ordinal for d in self.balance_dates], dtype=np.int64)
+        self._cumulative_flow_array = np.array(self._cumulative_flows, dtype=np.int64)
+        self._balance_bases = np.array(
+            [to_pence(self.published_balances[d]) - self._cumulative_flow_to(d) for d in self.balance_dates],
+            dtype=np.int64
+        )
 
-    def check_consistency(self):
-        for d1, d2 in zip(self.balance_dates, self.balance_dates[1:]):
+    def _cumulative_flow_to(self, date: Day) -> int:
+        return self._cumulative_flows[bisect_right(self.payment_dates, date)]
+
+    def _cumulative_flow_before(self, date: Day) -> int:
+        return self._cumulative_flows[bisect_left(self.payment_dates, date)]
+
+    def _day_total(self, date: Day) -> int:
+        return self._day_totals.get(date, 0)
+
+    def check_consistency(self, first_day: Optional[Day] = None, last_day: Optional[Day] = None):
+        """Check that consecutive published balances differ by the transactions between them.
+
+        A single sweep over balance dates and payment dates. If `first_day` and/or `last_day` are given only
+        the balance intervals overlapping that span are checked
+        """
+        balance_dates = self.balance_dates
+        i_first = 0 if first_day is None else max(bisect_left(balance_dates, first_day) - 1, 0)
+        i_last = len(balance_dates) if last_day is None else bisect_right(balance_dates, last_day) + 1
+        balance_dates = balance_dates[i_first:i_last]
+        if len(balance_dates) < 2:
+            return
+        i_payment = bisect_right(self.payment_dates, balance_dates[0])
+        for d1, d2 in zip(balance_dates, balance_dates[1:]):
             balance1 = self.published_balances[d1]
             balance2 = self.published_balances[d2]
-            payment_dates = [d for d in self.payment_dates if d1 < d <= d2]
-            transaction_sum = sum(
-                sum(tr.amount for tr in self.transactions_by_date[d])
-                for d in payment_dates
-            )
+            j_payment = i_payment
+            while j_payment < len(self.payment_dates) and self.payment_dates[j_payment] <= d2:
+                j_payment += 1
+            transaction_sum = from_pence(self._cumulative_flows[j_payment] - self._cumulative_flows[i_payment])
             error = balance2 - balance1 - transaction_sum
             if abs(error) >= 0.01:
                 print("\n\n")
                 print(f"Errors in #{d1} -> #{d2}, error {error}")
-                for d in payment_dates:
+                for d in self.payment_dates[i_payment:j_payment]:
                     for tr in self.transactions_by_date[d]:
                         print(tr)
                 print("\n\n")
             assert abs(
                 error) < 0.01, f"Inconsistent balance {error} between {d1} and {d2}, sum trans {transaction_sum}, balance1 {balance1}, balance2 {balance2}"
+            i_payment = j_payment
+
+    def extended(
+            self,
+            transactions: list[Transaction],
+            published_balances: dict[Day, Decimal],
+    ) -> 'BankAccountActivity':
+        """This activity with newly ingested transactions and balances added.
+
+        Only the balance intervals overlapping the new data are re-checked, the rest having been
+        checked when this activity was built
+        """
+        new_days = [t.payment_date for t in transactions] + list(published_balances.keys())
+        activity = BankAccountActivity(
+            self.account,
+            self.transactions + transactions,
+            self.published_balances | published_balances,
+            validate=False,
+        )
+        if len(new_days) > 0:
+            activity.check_consistency(min(new_days), max(new_days))
+        return activity
+
+    def _eod_pence(self, date: Day) -> int:
+        i_balance = bisect_right(self.balance_dates, date) - 1
+        return int(self._balance_bases[i_balance]) + self._cumulative_flow_to(date)
 
     def balance_at_eod(self, date: Day) -> Decimal:
         if self.initial_balance_date > date:
             return 0
         assert self.initial_balance_date <= date, f"Date {date} is before initial balance date {self.initial_balance_date}"
-        nearest_date = max(d for d in self.balance_dates if d <= date)
-        nearest_balance = self.published_balances[nearest_date]
-        subsequent_payment_dates = [d for d in self.payment_dates if nearest_date < d <= date]
-        subsequent_transaction_amounts = sum(
-            sum(tr.amount for tr in self.transactions_by_date[d])
-            for d in subsequent_payment_dates
-        )
-        return nearest_balance + subsequent_transaction_amounts
+        return from_pence(self._eod_pence(date))
 
     def balance_at_sod(self, date: Day) -> Decimal:
-        eod_balance = self.balance_at_eod(date)
-        day_payments = sum(
-            tr.amount for tr in self.transactions_by_date.get(date, [])
-        )
-        return eod_balance - day_payments
+        return self.balance_at_eod(date) - from_pence(self._day_total(date))
+
+    def _balances_for_ordinals(self, ordinals: np.ndarray, at_start_of_day: bool) -> np.ndarray:
+        # Balances in pence
+        i_balance = np.searchsorted(self._balance_ordinals, ordinals, side="right") - 1
+        i_flow = np.searchsorted(self._payment_ordinals, ordinals, side="left" if at_start_of_day else "right")
+        return self._balance_bases[i_balance] + self._cumulative_flow_array[i_flow]
+
+    def period_balances(self, periods: list[DateRange], opening: bool) -> list[Optional[Decimal]]:
+        """The balance at the start (`opening`) or end of each period - the same as the initial or terminal balance
+        of `filter_on_period(period)`, but computed for all periods in one vectorised pass.
+
+        None for periods ending before the first published balance
+        """
+        if len(self.balance_dates) == 0:
+            return [None for _ in periods]
+        initial_ordinal = self.balance_dates[0].ordinal
+        has_balance = np.array([p.last_day >= self.balance_dates[0] for p in periods], dtype=bool)
+        if opening:
+            ordinals = np.array([max(p.first_day.ordinal, initial_ordinal) for p in periods], dtype=np.int64)
+        else:
+            ordinals = np.array([p.last_day.ordinal for p in periods], dtype=np.int64)
+        balances = self._balances_for_ordinals(np.maximum(ordinals, initial_ordinal), at_start_of_day=opening)
+        return [from_pence(b) if ok else None for b, ok in zip(balances.tolist(), has_balance.tolist())]
 
     def filter_on_period(self, period: DateRange) -> 'BankAccountActivity':
-        d1 = period.first_day
-        d2 = period.last_day
-        published_balances = {d: b for d, b in self.published_balances.items() if d1 <= d <= d2}
-        if d1 not in published_balances and d1 >= self.initial_balance_date:
-            bal1 = self.balance_at_eod(d1)
-            published_balances[d1] = bal1
-        if d2 not in published_balances and d2 >= self.initial_balance_date:
-            bal2 = self.balance_at_eod(d2)
-            published_balances[d2] = bal2
-        return BankAccountActivity(
-            self.account,
-            [t for t in self.transactions if d1 <= t.payment_date <= d2],
-            published_balances
-        )
+        if len(self.balance_dates) == 0 or period.last_day < self.balance_dates[0]:
+            initial_balance_date = None
+        else:
+            initial_balance_date = max(period.first_day, self.balance_dates[0])
+        return BankAccountActivityView(self, period.first_day, period.last_day, initial_balance_date)
+
+    @property
+    def num_transactions(self) -> int:
+        return len(self.transactions)
 
     @property
     def first_date(self) -> Optional[Day]:
-        if len(self.transactions) == 0:
+        if len(self.payment_dates) == 0:
             return None
-        return min(t.payment_date for t in self.transactions)
+        return self.payment_dates[0]
 
     @property
     def last_date(self) -> Optional[Day]:
-        if len(self.transactions) == 0:
+        if len(self.payment_dates) == 0:
             return None
-        return max(t.payment_date for t in self.transactions)
+        return self.payment_dates[-1]
 
     def net_flow(self, first_day: Optional[Day], last_day: Optional[Day]) -> Decimal:
+        if len(self.payment_dates) == 0:
+            return Decimal(0)
         first_day = first_day or self.first_date
         last_day = last_day or self.last_date
-        return sum(t.amount for t in self.transactions if first_day <= t.payment_date <= last_day)
+        if first_day > last_day:
+            return Decimal(0)
+        return from_pence(self._cumulative_flow_to(last_day) - self._cumulative_flow_before(first_day))
 
     @property
     def earliest_balance(self) -> Optional[Decimal]:
-        if len(self.published_balances) == 0:
+        if len(self.balance_dates) == 0:
             return None
-        earliest_day = min(self.published_balances.keys())
-        earliest_day_payments = sum(
-            tr.amount for tr in self.transactions_by_date.get(earliest_day, [])
-        )
-        balance_at_eod = self.published_balances[earliest_day]
-        return balance_at_eod - earliest_day_payments
+        earliest_day = self.balance_dates[0]
+        return from_pence(to_pence(self.published_balances[earliest_day]) - self._day_total(earliest_day))
 
     @property
     def latest_balance(self) -> Optional[Decimal]:
@@ -133,4 +225,153 @@ class BankAccountActivity:
 
     @property
     def payees(self) -> list[str]:
-        return sorted(list(set([t.payee for t in self.transactions])))
+        return sorted(PAYEES.payees[i] for i in {t.payee_id for t in self.transactions})
+
+
+class BankAccountActivityView(BankAccountActivity):
+    """
+    The activity of `source` restricted to the days `first_day` to `last_day`, as returned by `filter_on_period`.
+
+    Shares the sorted transactions and balance index of the (already validated) source rather than building
+    and checking a new activity. Transactions and published balances are only materialised when asked for.
+    """
+
+    def __init__(
+            self,
+            source: BankAccountActivity,
+            first_day: Day,
+            last_day: Day,
+            initial_balance_date: Optional[Day],
+    ):
+        assert not isinstance(source, BankAccountActivityView), "Views must be built on the underlying activity"
+        self.account: BankAccount = source.account
+        self._source: BankAccountActivity = source
+        self._first_day: Day = first_day
+        self._last_day: Day = last_day
+        self.initial_balance_date: Optional[Day] = initial_balance_date
+        self._i_first_payment = bisect_left(source.payment_dates, first_day)
+        self._i_last_payment = max(bisect_right(source.payment_dates, last_day), self._i_first_payment)
+
+    def filter_on_period(self, period: DateRange) -> 'BankAccountActivity':
+        if self.initial_balance_date is None or period.last_day < self.initial_balance_date:
+            initial_balance_date = None
+        else:
+            initial_balance_date = max(period.first_day, self.initial_balance_date)
+        return BankAccountActivityView(
+            self._source,
+            max(period.first_day, self._first_day),
+            min(period.last_day, self._last_day),
+            initial_balance_date
+        )
+
+    @cached_property
+    def payment_dates(self) -> list[Day]:
+        return self._source.payment_dates[self._i_first_payment:self._i_last_payment]
+
+    @cached_property
+    def transactions(self) -> list[Transaction]:
+        offsets = self._source._transaction_offsets
+        return self._source.transactions[offsets[self._i_first_payment]:offsets[self._i_last_payment]]
+
+    @cached_property
+    def transactions_by_date(self) -> dict[Day, list[Transaction]]:
+        return {d: self._source.transactions_by_date[d] for d in self.payment_dates}
+
+    @cached_property
+    def published_balances(self) -> dict[Day, Decimal]:
+        """The source's published balances within the view, plus the derived balances at its first and last day"""
+        if self.initial_balance_date is None:
+            return {}
+        balances = {self.initial_balance_date: self.balance_at_eod(self.initial_balance_date)}
+        for d in self._source.balance_dates[bisect_right(self._source.balance_dates, self.initial_balance_date):]:
+            if d > self._last_day:
+                break
+            balances[d] = self._source.published_balances[d]
+        if self._last_day > self.initial_balance_date:
+            balances[self._last_day] = self.balance_at_eod(self._last_day)
+        return balances
+
+    @cached_property
+    def balance_dates(self) -> list[Day]:
+        return sorted(self.published_balances.keys())
+
+    @cached_property
+    def _cumulative_flows(self) -> list[int]:
+        return self._source._cumulative_flows[self._i_first_payment:self._i_last_payment + 1]
+
+    @property
+    def num_transactions(self) -> int:
+        offsets = self._source._transaction_offsets
+        return offsets[self._i_last_payment] - offsets[self._i_first_payment]
+
+    def _in_view(self, date: Day) -> bool:
+        return self._first_day <= date <= self._last_day
+
+    def _cumulative_flow_to(self, date: Day) -> int:
+        return self._source._cumulative_flows[
+            bisect_right(self._source.payment_dates, date, self._i_first_payment, self._i_last_payment)
+        ] - self._source._cumulative_flows[self._i_first_payment]
+
+    def _cumulative_flow_before(self, date: Day) -> int:
+        return self._source._cumulative_flows[
+            bisect_left(self._source.payment_dates, date, self._i_first_payment, self._i_last_payment)
+        ] - self._source._cumulative_flows[self._i_first_payment]
+
+    def _day_total(self, date: Day) -> int:
+        if not self._in_view(date):
+            return 0
+        return self._source._day_total(date)
+
+    def _eod_pence(self, date: Day) -> int:
+        return self._source._eod_pence(min(date, self._last_day))
+
+    def period_balances(self, periods: list[DateRange], opening: bool) -> list[Optional[Decimal]]:
+        if self.initial_balance_date is None:
+            return [None for _ in periods]
+        initial_ordinal = self.initial_balance_date.ordinal
+        last_ordinal = self._last_day.ordinal
+        has_balance = [p.last_day >= self.initial_balance_date for p in periods]
+        if opening:
+            ordinals = np.array([max(p.first_day.ordinal, initial_ordinal) for p in periods], dtype=np.int64)
+        else:
+            ordinals = np.array([max(p.last_day.ordinal, initial_ordinal) for p in periods], dtype=np.int64)
+        # Past the end of the view the balance stays at the source's end of day balance on its last day
+        balances = np.where(
+            ordinals <= last_ordinal,
+            self._source._balances_for_ordinals(ordinals, at_start_of_day=opening),
+            self._source._balances_for_ordinals(np.array([last_ordinal]), at_start_of_day=False)[0],
+        )
+        return [from_pence(b) if ok else None for b, ok in zip(balances.tolist(), has_balance)]
+
+    @property
+    def first_date(self) -> Optional[Day]:
+        if self.num_transactions == 0:
+            return None
+        return self._source.payment_dates[self._i_first_payment]
+
+    @property
+    def last_date(self) -> Optional[Day]:
+        if self.num_transactions == 0:
+            return None
+        return self._source.payment_dates[self._i_last_payment - 1]
+
+    def net_flow(self, first_day: Optional[Day], last_day: Optional[Day]) -> Decimal:
+        if self.num_transactions == 0:
+            return Decimal(0)
+        first_day = first_day or self.first_date
+        last_day = last_day or self.last_date
+        if first_day > last_day:
+            return Decimal(0)
+        return from_pence(self._cumulative_flow_to(last_day) - self._cumulative_flow_before(first_day))
+
+    @property
+    def earliest_balance(self) -> Optional[Decimal]:
+        if self.initial_balance_date is None:
+            return None
+        return self.balance_at_sod(self.initial_balance_date)
+
+    @property
+    def latest_balance(self) -> Optional[Decimal]:
+        if self.initial_balance_date is None:
+            return None
+        return self.earliest_balance + self.net_flow(first_day=None, last_day=None)
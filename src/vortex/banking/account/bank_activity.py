@@ -1,8 +1,11 @@
 import shelve
 from decimal import Decimal
+from functools import cached_property
 from pathlib import Path
 from typing import List, Optional
 
+import pandas as pd
+
 from vortex.banking import BankAccountActivity
 
 __all__ = ["BankActivity"]
@@ -12,6 +15,7 @@ from vortex.banking.transaction.transaction import Transaction
 
 from vortex.date_range import DateRange, Day
 from vortex.date_range.accounting_month import AccountingMonth
+from vortex.date_range.date_range import SplitType
 from vortex.date_range.month import Month
 from vortex.date_range.simple_date_range import SimpleDateRange
 
@@ -27,14 +31,17 @@ class BankActivity:
             statement.account: statement
             for statement in statements
         }
-        self.sorted_transactions: List[Transaction] = sorted(
+
+    @cached_property
+    def sorted_transactions(self) -> List[Transaction]:
+        return sorted(
             [t for s in self.statements.values() for t in s.transactions],
             key=lambda t: (t.payment_date, t.payee),
         )
 
     @property
     def num_transactions(self):
-        return len(self.sorted_transactions)
+        return sum(s.num_transactions for s in self.statements.values())
 
     @property
     def non_empty(self):
@@ -69,6 +76,44 @@ class BankActivity:
     def restrict_to_period(self, period: DateRange) -> 'BankActivity':
         return BankActivity([stmt.filter_on_period(period) for stmt in self.statements.values()])
 
+    def balance_series(
+            self,
+            period: DateRange,
+            accounts: Optional[List[BankAccount]] = None,
+            granularity=Day,
+            opening: bool = False,
+    ) -> pd.DataFrame:
+        """End of period (or start of period if `opening`) balances for each day, month, accounting month etc
+        in `period`, as a frame indexed by the sub-periods with one column per account.
+
+        Sub-periods are clipped to `period`, so a partial first or last month is treated as the days it shares
+        with `period`
+        """
+        sub_periods = period.split_into(granularity, SplitType.OUTER)
+        frame = self.period_balances([p.intersection(period) for p in sub_periods], accounts, opening)
+        frame.index = pd.Index(sub_periods, dtype=object)
+        return frame
+
+    def period_balances(
+            self,
+            periods: List[DateRange],
+            accounts: Optional[List[BankAccount]] = None,
+            opening: bool = False,
+    ) -> pd.DataFrame:
+        accounts = accounts or self.accounts
+        return pd.DataFrame(
+            {account: self.statements[account].period_balances(periods, opening) for account in accounts},
+            index=pd.Index(periods, dtype=object),
+            columns=pd.Index(accounts, dtype=object),
+        )
+
+    @staticmethod
+    def total_across_accounts(balances: pd.DataFrame) -> List[Decimal]:
+        return [
+            sum([b for b in row if b is not None]) or Decimal("0")
+            for row in balances.values.tolist()
+        ]
+
     def restrict_to_accounts(self, *accounts) -> 'BankActivity':
         merged_statements = []
         for account in accounts:
@@ -78,12 +123,16 @@ class BankActivity:
     SHELF = Path(__file__).parent / "_bank_activity.shelf"
 
     @staticmethod
-    def build(force: bool) -> 'BankActivity':
+    def build(force: bool, refresh: bool = False) -> 'BankActivity':
+        """
+        `refresh` picks up new and changed statement files, extending rather than rebuilding accounts whose only
+        change is new files. `force` rebuilds everything
+        """
         key = f"bank_activity"
         with shelve.open(str(BankActivity.SHELF)) as shelf:
-            if key not in shelf or force:
+            if key not in shelf or force or refresh:
                 from vortex.banking import StatementsReader
-                statements = StatementsReader.read_statements(force)
+                statements = StatementsReader.read_statements(force, refresh)
                 shelf[key] = BankActivity(statements)
             return shelf[key]
 
@@ -1,198 +1,60 @@
-from typing import Optional
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional
 
 from vortex.banking.account.bank_account import ALL_BANK_ACCOUNTS
-from vortex.banking.category.payee_categories import PayeeCategory, MUSICIANS
+from vortex.banking.category import rules, payee_categories
+from vortex.banking.category.category_memo import CategoryMemo
+from vortex.banking.category.musician_index import MusicianIndex
+from vortex.banking.category.payee_categories import PayeeCategory, MUSICIANS, MUSICIANS_FILE
+from vortex.banking.category.rule_profile import RuleProfile
+from vortex.banking.category.rules import CategoryRule, Clause, CompiledRules, starts, contains, ends
+from vortex.banking.transaction import payee_dictionary
 from vortex.banking.transaction.transaction import Transaction
 from vortex.date_range import Day
+from vortex.utils import multi_pattern
+from vortex.utils.parallel import parallel_map
 
 
-def matches_start(transaction, matches: any) -> bool:
-    if isinstance(matches, str):
-        matches = [matches]
-    payee = transaction.payee.lower()
-    for match in matches:
-        if payee.startswith(match):
-            return True
-    return False
+def _is_credit(tr: Transaction) -> bool:
+    return tr.amount > 0
 
 
-def matches_end(transaction, matches: any) -> bool:
-    if isinstance(matches, str):
-        matches = [matches]
-    payee = transaction.payee.lower()
-    for match in matches:
-        if payee.endswith(match):
-            return True
-    return False
+def _is_debit(tr: Transaction) -> bool:
+    return tr.amount < 0
 
 
-def matches_anywhere(transaction, matches: any) -> bool:
-    if isinstance(matches, str):
-        matches = [matches]
-    payee = transaction.payee.lower()
-    for match in matches:
-        if match in payee:
-            return True
-    return False
+def _is_small_debit(tr: Transaction) -> bool:
+    return 0 > tr.amount > -200
 
 
-def _maybe_work_permit(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_anywhere(
-            transaction,
-            [
-                "ukvi uk",
-                "ukvi crewe",
-                "hingwan k c cos",
-                "mr j hill vjc cos",
-                "frusion media acco cos",
-                "klarna*cos",
-                "klarna*www",
-                "ukba",
-            ],
-    ):
-        return PayeeCategory.WORK_PERMITS
-    payee = transaction.payee
-    if transaction.payment_date == Day(2022, 5, 20) and "K HINGWAN VORTEX EXPENSESS" in payee:
-        return PayeeCategory.WORK_PERMITS
-    if transaction.payment_date == Day(2022, 11, 2) and "DUSTY KNUC" in payee:
-        return PayeeCategory.WORK_PERMITS
-
-
-def _maybe_rates(tr: Transaction) -> Optional[PayeeCategory]:
-    if matches_anywhere(tr, ["lb hackney rates", "lbh rates", "l.b. hackney nndr"]):
-        return PayeeCategory.RATES
-    if matches_start(tr, "lb hackney 601853394"):
-        return PayeeCategory.RATES
-
-
-
-def _maybe_electricity(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_anywhere(transaction, "edf energy"):
-        return PayeeCategory.ELECTRICITY
-
-
-def _maybe_equipment_costs(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(transaction, ["gear4music", "www.studiospares"]):
-        return PayeeCategory.EQUIPMENT_PURCHASE
-    if matches_anywhere(transaction, "www.thomann.de burgebrach"):
-        return PayeeCategory.EQUIPMENT_PURCHASE
-    if matches_anywhere(transaction, "get hire ltd"):
-        return PayeeCategory.EQUIPMENT_HIRE
-
-
-def _maybe_insurance(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(
-            transaction,
-            [
-                "close-jelf",
-                "close - marshcomm",
-                "axa insurance"
-            ]):
-        return PayeeCategory.INSURANCE
-
-
-def _maybe_internal_transfer(transaction: Transaction) -> Optional[PayeeCategory]:
-    for acc in ALL_BANK_ACCOUNTS:
-        if matches_anywhere(transaction, f"{acc.id} internet transfer"):
-            return PayeeCategory.INTERNAL_TRANSFER
-
-
-def _maybe_cc_fees(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_anywhere(transaction, "pas re cps"):
-        return PayeeCategory.CREDIT_CARD_FEES
-
-
-def _maybe_bb_loan(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(transaction, "loan"):
-        return PayeeCategory.BB_LOAN
-    if matches_anywhere(transaction, " loan"):
-        return PayeeCategory.BB_LOAN
-
-
-def _maybe_petty_cash(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_anywhere(transaction, ["cash halifax", "cash hsbc"]):
-        return PayeeCategory.PETTY_CASH
-    if matches_start(transaction, "cash notemac"):
-        return PayeeCategory.PETTY_CASH
-
-
-def _maybe_bank_fees(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_anywhere(
-            transaction,
-            [
+# In priority order - a transaction gets the category of the first clause, of the first rule, that it satisfies
+RULES = [
+    CategoryRule("advertising", [
+        Clause(PayeeCategory.ADVERTISING, starts("int"), contains("facebk")),
+    ]),
+    CategoryRule("accountant", [
+        Clause(PayeeCategory.ACCOUNTANT, starts("ck partnership")),
+    ]),
+    CategoryRule("bank_fees", [
+        Clause(
+            PayeeCategory.BANK_FEES,
+            contains(
                 "non-sterling transaction fee",
                 "charge renewal fee",
                 "total charges to",
                 "paytek admin",
-            ]
-
-    ):
-        return PayeeCategory.BANK_FEES
-
-    if matches_end(transaction, "payment charge"):
-        return PayeeCategory.BANK_FEES
-
-
-def _maybe_bank_interest(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_anywhere(transaction, "interest to"):
-        return PayeeCategory.BANK_INTEREST
-
-
-def _maybe_salaries(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(
-            transaction,
-            [
-                "pauline le divenac",
-                "daniel garel",
-                "kim macari",
-                "tea earle",
-                "ted mitchell",
-                "k hingwan vortex",
-                "chloe xiao",
-                "hector tejero",
-                "grace agbohou",
-                "hmrc paye"
-            ]
-
-    ):
-        return PayeeCategory.SALARIES
-
-
-def _maybe_memberships(transaction: Transaction) -> Optional[PayeeCategory]:
-    if transaction.amount > 0:
-        if matches_anywhere(transaction, "stripe") and not matches_anywhere(transaction, "mushroom"):
-            return PayeeCategory.MEMBERSHIPS
-        if matches_anywhere(transaction, ["chinekwu", "membership"]):
-            return PayeeCategory.MEMBERSHIPS
-
-
-def _maybe_card_sales(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_anywhere(transaction, "paypal ppwdl"):
-        return PayeeCategory.CARD_SALES
-    if matches_anywhere(transaction, "rails ltd butlr"):
-        return PayeeCategory.CARD_SALES
-
-
-def _maybe_cash_sales(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_anywhere(transaction, "cash in p.o."):
-        return PayeeCategory.CASH_SALES
-
-
-def _maybe_ticket_sales(transaction: Transaction) -> Optional[PayeeCategory]:
-    if transaction.amount > 0 and matches_start(transaction,
-                                                ["ticketweb uk", "ticketco uk", "tw client gbp", "uniiverse collabor"]):
-        return PayeeCategory.TICKET_SALES
-
-
-def _maybe_vortex_merch(tr: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(tr, "monster press"):
-        return PayeeCategory.VORTEX_MERCH
-
-
-def _maybe_bar_purchases(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(
-            transaction,
-            [
+            ),
+        ),
+        Clause(PayeeCategory.BANK_FEES, ends("payment charge")),
+    ]),
+    CategoryRule("bank_interest", [
+        Clause(PayeeCategory.BANK_INTEREST, contains("interest to")),
+    ]),
+    CategoryRule("bar_purchases", [
+        Clause(
+            PayeeCategory.BAR_STOCK,
+            starts(
                 "drinksuper",
                 "dalston local",
                 "east london brew",
@@ -205,317 +67,384 @@ def _maybe_bar_purchases(transaction: Transaction) -> Optional[PayeeCategory]:
                 "sainsbury",
                 "food & wine",
                 "queer brewing",
-            ]
-
-    ):
-        return PayeeCategory.BAR_STOCK
-
-
-def _maybe_gig_security(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(transaction, "denise williams"):
-        return PayeeCategory.GIG_SECURITY
-
-
-def _maybe_fire_alarm(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(transaction, "agf fire prot"):
-        return PayeeCategory.FIRE_ALARM
-
-
-def _maybe_vat(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(transaction, "hmrc vat"):
-        return PayeeCategory.VAT
-
-
-def _maybe_cleaning(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(transaction, "poolfresh"):
-        return PayeeCategory.CLEANING
-    if matches_start(transaction, "direct 365"):
-        return PayeeCategory.CLEANING
-
-
-def _maybe_donation(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_anywhere(transaction, "crowdfunder"):
-        return PayeeCategory.DONATION
-
-
-def _maybe_piano_tuner(transaction: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(transaction, ["b sharp pianos", "dafydd james", "d r james"]):
-        return PayeeCategory.PIANO_TUNER
-
-
-def _maybe_sound_engineer(tr: Transaction) -> Optional[PayeeCategory]:
-    if tr.amount > 0:
-        return None
-
-    known_engineers = [
-        "adrian kunstler",
-        "ali ward",
-        "andrei eliade",
-        "andrew marriott",
-        "aofie daly",
-        "bella cooper",
-        "chris penty",
-        "delphi mangan",
-        "d j tucker",
-        "egglectic",
-        "felix threadgill",
-        "giulo matheson",
-        "giulio matheson",
-        "jeremy sliwerski",
-        "joe mashiter",
-        "jorge martinez",
-        "kinga ilyes",
-        "lauren shapiro",
-        "laura kazaroff",  # On behalf of Mike O'Malley
-        "louis huddle",
-        "mike omalley",
-        "mike o'malley",
-        "milo mcguire",
-        "ochuko okiemute",
-        "thomas pew",
-        "tom o'brien",
-    ]
-    if matches_start(tr, known_engineers):
-        return PayeeCategory.SOUND_ENGINEER
-
-
-def _maybe_prs(tr: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(tr, ["prs ", "pannone "]):
-        return PayeeCategory.PRS
-
-
-def _maybe_mailchimp(tr: Transaction) -> Optional[PayeeCategory]:
-    if matches_anywhere(tr, "mailchi"):
-        return PayeeCategory.MAILCHIMP
-
-
-def _maybe_host(tr: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(tr, "oblong"):
-        return PayeeCategory.WEB_HOST
-
-
-def _maybe_bt(tr: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(tr, "bt group"):
-        return PayeeCategory.BT
-
-
-def _maybe_bar_snacks(tr: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(tr, "uk bar snacks"):
-        return PayeeCategory.BAR_SNACKS
-
-
-def _maybe_accountant(tr: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(tr, "ck partnership"):
-        return PayeeCategory.ACCOUNTANT
-
-
-def _maybe_musician_payments(tr: Transaction) -> Optional[PayeeCategory]:
-    payee = tr.payee.lower()
-    if tr.amount < 0:
-        for m in MUSICIANS:
-            if payee.startswith(m):
-                return PayeeCategory.MUSICIAN_PAYMENTS
-            if m in payee and "new vortex jazz" in payee:
-                return PayeeCategory.MUSICIAN_PAYMENTS
-            if m in payee and payee.startswith("vortex"):
-                return PayeeCategory.MUSICIAN_PAYMENTS
-
-
-def _maybe_mvt(tr: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(tr, "music venue trust"):
-        return PayeeCategory.MUSIC_VENUE_TRUST
-
-
-def _maybe_tissues(tr: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(tr, ["nisbets", "nisa local", "krystal", "acme catering"]):
-        return PayeeCategory.OPERATIONAL_COSTS
-    if matches_start(tr, ["amznmktplace", "argos ltd", "krys-"]) and 0 > tr.amount > -200:
-        return PayeeCategory.OPERATIONAL_COSTS
-    if matches_anywhere(tr, ["www.amazon", "marks & spencer", "canva* "]) and 0 > tr.amount > -200:
-        return PayeeCategory.OPERATIONAL_COSTS
-
-
-def _maybe_telephone(tr: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(tr, "studio upstairs"):
-        return PayeeCategory.TELEPHONE
-    if matches_anywhere(tr, "british telecom"):
-        return PayeeCategory.TELEPHONE
-
-
-def _maybe_building_maintenance(tr: Transaction) -> Optional[PayeeCategory]:
-    maintainers = [
-        "rentokil", "locksmiths", "vivid lifts",
-        "upney electrical", "ths electrical", "jar mechanical",
-        "a c kemp", "sango air con", "unknown works ltd",
-        "j & c joel", "vortex interiors", "h2 catering"
-    ]
-    if any(matches_anywhere(tr, maintainer) for maintainer in maintainers):
-        return PayeeCategory.BUILDING_MAINTENANCE
-
-
-def _maybe_musician_costs(tr: Transaction) -> Optional[PayeeCategory]:
-    if matches_anywhere(tr, [
-        "premier cars",
-        "kingslandlocke",
-        "eagle mini cabs",
-        "www.staycity.com",
-        "staycity group",
-        "avo hotel",
-        "global lodge",
-        "premier inn",
-    ]):
-        return PayeeCategory.MUSICIAN_COSTS
-    if matches_start(tr, "eurostar"):
-        return PayeeCategory.MUSICIAN_COSTS
-
-
-def _maybe_operational_costs(tr: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(
-            tr,
-            [
+            ),
+        ),
+    ]),
+    CategoryRule("bar_snacks", [
+        Clause(PayeeCategory.BAR_SNACKS, starts("uk bar snacks")),
+    ]),
+    CategoryRule("bb_loan", [
+        Clause(PayeeCategory.BB_LOAN, starts("loan")),
+        Clause(PayeeCategory.BB_LOAN, contains(" loan")),
+    ]),
+    CategoryRule("bt", [
+        Clause(PayeeCategory.BT, starts("bt group")),
+    ]),
+    CategoryRule("building_maintenance", [
+        Clause(
+            PayeeCategory.BUILDING_MAINTENANCE,
+            contains(
+                "rentokil", "locksmiths", "vivid lifts",
+                "upney electrical", "ths electrical", "jar mechanical",
+                "a c kemp", "sango air con", "unknown works ltd",
+                "j & c joel", "vortex interiors", "h2 catering",
+            ),
+        ),
+    ]),
+    CategoryRule("building_security", [
+        Clause(PayeeCategory.BUILDING_SECURITY, starts("adt inv", "adt fire", "adt leeds", "fowler fire")),
+    ]),
+    CategoryRule("card_sales", [
+        Clause(PayeeCategory.CARD_SALES, contains("paypal ppwdl")),
+        Clause(PayeeCategory.CARD_SALES, contains("rails ltd butlr")),
+    ]),
+    CategoryRule("cash_sales", [
+        Clause(PayeeCategory.CASH_SALES, contains("cash in p.o.")),
+    ]),
+    CategoryRule("cc_fees", [
+        Clause(PayeeCategory.CREDIT_CARD_FEES, contains("pas re cps")),
+    ]),
+    CategoryRule("cleaning", [
+        Clause(PayeeCategory.CLEANING, starts("poolfresh")),
+        Clause(PayeeCategory.CLEANING, starts("direct 365")),
+    ]),
+    CategoryRule("donation", [
+        Clause(PayeeCategory.DONATION, contains("crowdfunder")),
+    ]),
+    CategoryRule("electricity", [
+        Clause(PayeeCategory.ELECTRICITY, contains("edf energy")),
+    ]),
+    CategoryRule("equipment_costs", [
+        Clause(PayeeCategory.EQUIPMENT_PURCHASE, starts("gear4music", "www.studiospares")),
+        Clause(PayeeCategory.EQUIPMENT_PURCHASE, contains("www.thomann.de burgebrach")),
+        Clause(PayeeCategory.EQUIPMENT_HIRE, contains("get hire ltd")),
+    ]),
+    CategoryRule("fire_alarm", [
+        Clause(PayeeCategory.FIRE_ALARM, starts("agf fire prot")),
+    ]),
+    CategoryRule("gig_security", [
+        Clause(PayeeCategory.GIG_SECURITY, starts("denise williams")),
+    ]),
+    CategoryRule("host", [
+        Clause(PayeeCategory.WEB_HOST, starts("oblong")),
+    ]),
+    CategoryRule("insurance", [
+        Clause(PayeeCategory.INSURANCE, starts("close-jelf", "close - marshcomm", "axa insurance")),
+    ]),
+    CategoryRule("internal_transfer", [
+        Clause(
+            PayeeCategory.INTERNAL_TRANSFER,
+            contains([f"{acc.id} internet transfer" for acc in ALL_BANK_ACCOUNTS]),
+        ),
+    ]),
+    CategoryRule("license_renewal", [
+        Clause(PayeeCategory.LICENSING, starts("hackney.gov.uk")),
+    ]),
+    CategoryRule("mailchimp", [
+        Clause(PayeeCategory.MAILCHIMP, contains("mailchi")),
+    ]),
+    CategoryRule("memberships", [
+        Clause(PayeeCategory.MEMBERSHIPS, contains("stripe"), unless=contains("mushroom"), guard=_is_credit),
+        Clause(PayeeCategory.MEMBERSHIPS, contains("chinekwu", "membership"), guard=_is_credit),
+    ]),
+    CategoryRule("musician_costs", [
+        Clause(
+            PayeeCategory.MUSICIAN_COSTS,
+            contains(
+                "premier cars",
+                "kingslandlocke",
+                "eagle mini cabs",
+                "www.staycity.com",
+                "staycity group",
+                "avo hotel",
+                "global lodge",
+                "premier inn",
+            ),
+        ),
+        Clause(PayeeCategory.MUSICIAN_COSTS, starts("eurostar")),
+    ]),
+    CategoryRule("musician_payments", [
+        Clause(PayeeCategory.MUSICIAN_PAYMENTS, starts(MUSICIANS), guard=_is_debit),
+        Clause(PayeeCategory.MUSICIAN_PAYMENTS, contains(MUSICIANS), contains("new vortex jazz"), guard=_is_debit),
+        Clause(PayeeCategory.MUSICIAN_PAYMENTS, contains(MUSICIANS), starts("vortex"), guard=_is_debit),
+    ]),
+    CategoryRule("mvt", [
+        Clause(PayeeCategory.MUSIC_VENUE_TRUST, starts("music venue trust")),
+    ]),
+    CategoryRule("operational_costs", [
+        Clause(
+            PayeeCategory.OPERATIONAL_COSTS,
+            starts(
                 "post office",
                 "postoffice",
                 "leyland",
                 "krystal",
                 "dalston stationers",
                 "www.nisbets.com",
-                "lb hackney genfund"  # Hackney Council, bin collection
-            ]):
-        return PayeeCategory.OPERATIONAL_COSTS
+                "lb hackney genfund",  # Hackney Council, bin collection
+            ),
+        ),
+    ]),
+    CategoryRule("petty_cash", [
+        Clause(PayeeCategory.PETTY_CASH, contains("cash halifax", "cash hsbc")),
+        Clause(PayeeCategory.PETTY_CASH, starts("cash notemac")),
+    ]),
+    CategoryRule("piano_tuner", [
+        Clause(PayeeCategory.PIANO_TUNER, starts("b sharp pianos", "dafydd james", "d r james")),
+    ]),
+    CategoryRule("prs", [
+        Clause(PayeeCategory.PRS, starts("prs ", "pannone ")),
+    ]),
+    CategoryRule("rates", [
+        Clause(PayeeCategory.RATES, contains("lb hackney rates", "lbh rates", "l.b. hackney nndr")),
+        Clause(PayeeCategory.RATES, starts("lb hackney 601853394")),
+    ]),
+    CategoryRule("rent", [
+        Clause(PayeeCategory.RENT, starts("hcd vortex rent")),
+    ]),
+    CategoryRule("salaries", [
+        Clause(
+            PayeeCategory.SALARIES,
+            starts(
+                "pauline le divenac",
+                "daniel garel",
+                "kim macari",
+                "tea earle",
+                "ted mitchell",
+                "k hingwan vortex",
+                "chloe xiao",
+                "hector tejero",
+                "grace agbohou",
+                "hmrc paye",
+            ),
+        ),
+    ]),
+    CategoryRule("sound_engineer", [
+        Clause(
+            PayeeCategory.SOUND_ENGINEER,
+            starts(
+                "adrian kunstler",
+                "ali ward",
+                "andrei eliade",
+                "andrew marriott",
+                "aofie daly",
+                "bella cooper",
+                "chris penty",
+                "delphi mangan",
+                "d j tucker",
+                "egglectic",
+                "felix threadgill",
+                "giulo matheson",
+                "giulio matheson",
+                "jeremy sliwerski",
+                "joe mashiter",
+                "jorge martinez",
+                "kinga ilyes",
+                "lauren shapiro",
+                "laura kazaroff",  # On behalf of Mike O'Malley
+                "louis huddle",
+                "mike omalley",
+                "mike o'malley",
+                "milo mcguire",
+                "ochuko okiemute",
+                "thomas pew",
+                "tom o'brien",
+            ),
+            guard=lambda tr: not tr.amount > 0,
+        ),
+    ]),
+    CategoryRule("space_hire", [
+        Clause(
+            PayeeCategory.SPACE_HIRE,
+            contains(
+                "allsopp j",
+                "arisema tekle",
+                "berahab",
+                "blow the fuse",
+                "c sansom",
+                "chalk oliver",
+                "cheng xie",
+                "city of london",
+                "costley-white",
+                "david miller",
+                "daytime hire",
+                "derick downstairs",
+                "derick foodbar",
+                "derick rent",
+                "duke street",
+                "e l rossi",
+                "eastmond",
+                "elaine mitchener",
+                "emma rawicz",
+                "frank nancy",
+                "future sounds",
+                "ghosh a k",
+                "intothe void",
+                "jewish music",
+                "lise rossi",
+                "m tomassini"
+                "m b dunlop",
+                "mcloughlin d",
+                "n charles",
+                "olivia murphy",
+                "rayner a",
+                "rehears",
+                "rehersal",
+                "samuel glass",
+                "state of tru",
+                "tots tunes",
+                "vice uk",
+                "vortex jazz jazz connect",
+                "w g b marrows",
+                "yazz ahmed",
+                "room hire",
+                "roomhire",
+                "space hire",
+                "rehearsal",
+            ),
+            guard=_is_credit,
+        ),
+        Clause(PayeeCategory.SPACE_HIRE, contains("mushroom"), contains("stripe"), guard=_is_credit),
+    ]),
+    CategoryRule("subscriptions", [
+        Clause(PayeeCategory.SUBSCRIPTIONS, starts("music venues allia wimborne", "jazz in london vortex")),
+        Clause(PayeeCategory.SUBSCRIPTIONS, contains("www.kashflow.com")),
+        Clause(PayeeCategory.SUBSCRIPTIONS, starts("int"), contains("slack", "airtable", "shopify")),
+    ]),
+    CategoryRule("telephone", [
+        Clause(PayeeCategory.TELEPHONE, starts("studio upstairs")),
+        Clause(PayeeCategory.TELEPHONE, contains("british telecom")),
+    ]),
+    CategoryRule("ticket_sales", [
+        Clause(
+            PayeeCategory.TICKET_SALES,
+            starts("ticketweb uk", "ticketco uk", "tw client gbp", "uniiverse collabor"),
+            guard=_is_credit,
+        ),
+    ]),
+    CategoryRule("tissues", [
+        Clause(PayeeCategory.OPERATIONAL_COSTS, starts("nisbets", "nisa local", "krystal", "acme catering")),
+        Clause(PayeeCategory.OPERATIONAL_COSTS, starts("amznmktplace", "argos ltd", "krys-"), guard=_is_small_debit),
+        Clause(
+            PayeeCategory.OPERATIONAL_COSTS,
+            contains("www.amazon", "marks & spencer", "canva* "),
+            guard=_is_small_debit,
+        ),
+    ]),
+    CategoryRule("vat", [
+        Clause(PayeeCategory.VAT, starts("hmrc vat")),
+    ]),
+    CategoryRule("work_permit", [
+        Clause(
+            PayeeCategory.WORK_PERMITS,
+            contains(
+                "ukvi uk",
+                "ukvi crewe",
+                "hingwan k c cos",
+                "mr j hill vjc cos",
+                "frusion media acco cos",
+                "klarna*cos",
+                "klarna*www",
+                "ukba",
+            ),
+        ),
+        Clause(
+            PayeeCategory.WORK_PERMITS,
+            contains("k hingwan vortex expensess"),
+            guard=lambda tr: tr.payment_date == Day(2022, 5, 20) and "K HINGWAN VORTEX EXPENSESS" in tr.payee,
+        ),
+        Clause(
+            PayeeCategory.WORK_PERMITS,
+            contains("dusty knuc"),
+            guard=lambda tr: tr.payment_date == Day(2022, 11, 2) and "DUSTY KNUC" in tr.payee,
+        ),
+    ]),
+    CategoryRule("vortex_merch", [
+        Clause(PayeeCategory.VORTEX_MERCH, starts("monster press")),
+    ]),
+]
+
+COMPILED_RULES = CompiledRules(RULES)
+
+_CATEGORY_MEMO: Optional[CategoryMemo] = None
+
+
+def category_memo() -> CategoryMemo:
+    """The memo of categories found by COMPILED_RULES, loaded from its shelf on first use"""
+    global _CATEGORY_MEMO
+    if _CATEGORY_MEMO is None:
+        fingerprint = CategoryMemo.rules_fingerprint(
+            COMPILED_RULES,
+            [
+                Path(__file__),
+                Path(rules.__file__),
+                Path(multi_pattern.__file__),
+                Path(payee_categories.__file__),
+                Path(payee_dictionary.__file__),
+                MUSICIANS_FILE,
+            ],
+        )
+        _CATEGORY_MEMO = CategoryMemo.load(COMPILED_RULES, fingerprint)
+    return _CATEGORY_MEMO
 
 
-def _maybe_rent(tr: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(tr, "hcd vortex rent"):
-        return PayeeCategory.RENT
+_RULE_PROFILE: Optional[RuleProfile] = None
 
 
-def _maybe_license_renewal(tr: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(tr, "hackney.gov.uk"):
-        return PayeeCategory.LICENSING
+@contextmanager
+def profiling_categories():
+    """
+    Categorises every transaction inside the block with the rules, bypassing the memo, recording per-rule
+    counts and timings in the RuleProfile yielded
+    """
+    global _RULE_PROFILE
+    previous = _RULE_PROFILE
+    _RULE_PROFILE = RuleProfile(COMPILED_RULES)
+    try:
+        yield _RULE_PROFILE
+    finally:
+        _RULE_PROFILE = previous
 
 
-def _maybe_building_security(tr: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(tr, ["adt inv", "adt fire", "adt leeds", "fowler fire"]):
-        return PayeeCategory.BUILDING_SECURITY
+def category_for_transaction(transaction: Transaction) -> PayeeCategory:
+    if _RULE_PROFILE is not None:
+        return _RULE_PROFILE.category(transaction)
+    return category_memo().category(transaction)
 
 
-def _maybe_space_hire(tr: Transaction) -> Optional[PayeeCategory]:
-    if tr.amount > 0:
-        hirers = [
-            "allsopp j",
-            "arisema tekle",
-            "berahab",
-            "blow the fuse",
-            "c sansom",
-            "chalk oliver",
-            "cheng xie",
-            "city of london",
-            "costley-white",
-            "david miller",
-            "daytime hire",
-            "derick downstairs",
-            "derick foodbar",
-            "derick rent",
-            "duke street",
-            "e l rossi",
-            "eastmond",
-            "elaine mitchener",
-            "emma rawicz",
-            "frank nancy",
-            "future sounds",
-            "ghosh a k",
-            "intothe void",
-            "jewish music",
-            "lise rossi",
-            "m tomassini"
-            "m b dunlop",
-            "mcloughlin d",
-            "n charles",
-            "olivia murphy",
-            "rayner a",
-            "rehears",
-            "rehersal",
-            "samuel glass",
-            "state of tru",
-            "tots tunes",
-            "vice uk",
-            "vortex jazz jazz connect",
-            "w g b marrows",
-            "yazz ahmed",
-            "room hire",
-            "roomhire",
-            "space hire",
-            "rehearsal"
-        ]
-        if matches_anywhere(tr, hirers):
-            return PayeeCategory.SPACE_HIRE
-        if matches_anywhere(tr, "mushroom") and matches_anywhere(tr, "stripe"):
-            return PayeeCategory.SPACE_HIRE
-        return None
-    return None
+PARALLEL_CATEGORISE_MIN_TRANSACTIONS = 5000
 
 
-def _maybe_subscriptions(tr: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(tr, ["music venues allia wimborne", "jazz in london vortex"]):
-        return PayeeCategory.SUBSCRIPTIONS
-    if matches_anywhere(tr, "www.kashflow.com"):
-        return PayeeCategory.SUBSCRIPTIONS
-    payee = tr.payee.lower()
-    if matches_start(tr, "int"):
-        if matches_anywhere(tr, ["slack", "airtable", "shopify"]):
-            return PayeeCategory.SUBSCRIPTIONS
+def _category_from_rules(transaction: Transaction) -> PayeeCategory:
+    return COMPILED_RULES.category(transaction)
 
 
-def _maybe_advertising(tr: Transaction) -> Optional[PayeeCategory]:
-    if matches_start(tr, "int"):
-        if matches_anywhere(tr, ["facebk"]):
-            return PayeeCategory.ADVERTISING
+def _categories_from_pool(transactions: List[Transaction]) -> List[PayeeCategory]:
+    return parallel_map(
+        _category_from_rules,
+        transactions,
+        min_items=PARALLEL_CATEGORISE_MIN_TRANSACTIONS,
+        description="categorisation",
+    )
 
 
-def category_for_transaction(transaction: Transaction) -> PayeeCategory:
-    return (_maybe_advertising(transaction) or
-            _maybe_accountant(transaction) or
-            _maybe_bank_fees(transaction) or
-            _maybe_bank_interest(transaction) or
-            _maybe_bar_purchases(transaction) or
-            _maybe_bar_snacks(transaction) or
-            _maybe_bb_loan(transaction) or
-            _maybe_bt(transaction) or
-            _maybe_building_maintenance(transaction) or
-            _maybe_building_security(transaction) or
-            _maybe_card_sales(transaction) or
-            _maybe_cash_sales(transaction) or
-            _maybe_cc_fees(transaction) or
-            _maybe_cleaning(transaction) or
-            _maybe_donation(transaction) or
-            _maybe_electricity(transaction) or
-            _maybe_equipment_costs(transaction) or
-            _maybe_fire_alarm(transaction) or
-            _maybe_gig_security(transaction) or
-            _maybe_host(transaction) or
-            _maybe_insurance(transaction) or
-            _maybe_internal_transfer(transaction) or
-            _maybe_license_renewal(transaction) or
-            _maybe_mailchimp(transaction) or
-            _maybe_memberships(transaction) or
-            _maybe_musician_costs(transaction) or
-            _maybe_musician_payments(transaction) or
-            _maybe_mvt(transaction) or
-            _maybe_operational_costs(transaction) or
-            _maybe_petty_cash(transaction) or
-            _maybe_piano_tuner(transaction) or
-            _maybe_prs(transaction) or
-            _maybe_rates(transaction) or
-            _maybe_rent(transaction) or
-            _maybe_salaries(transaction) or
-            _maybe_sound_engineer(transaction) or
-            _maybe_space_hire(transaction) or
-            _maybe_subscriptions(transaction) or
-            _maybe_telephone(transaction) or
-            _maybe_ticket_sales(transaction) or
-            _maybe_tissues(transaction) or
-            _maybe_vat(transaction) or
-            _maybe_work_permit(transaction) or
-            _maybe_vortex_merch(transaction) or
-            PayeeCategory.UNCATEGORISED
-            )
+def categorize_many(transactions: List[Transaction]) -> List[PayeeCategory]:
+    """
+    The same categories as calling category_for_transaction on each transaction, but evaluating the rules once
+    per distinct memo key, so the cost grows with the number of distinct payees rather than of transactions
+    """
+    if _RULE_PROFILE is not None:
+        return [_RULE_PROFILE.category(t) for t in transactions]
+    return category_memo().categories_for(transactions, _categories_from_pool)
+
+
+MUSICIAN_INDEX = MusicianIndex(next(rule for rule in RULES if rule.name == "musician_payments"), MUSICIANS)
+
+
+def category_and_musician_for_transaction(transaction: Transaction) -> tuple[PayeeCategory, Optional[str]]:
+    """The transaction's category, along with the musician paid if it is a musician payment"""
+    category = category_for_transaction(transaction)
+    if category != PayeeCategory.MUSICIAN_PAYMENTS:
+        return category, None
+    match = MUSICIAN_INDEX.match(transaction)
+    return category, None if match is None else match[1]
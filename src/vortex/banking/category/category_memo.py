@@ -0,0 +1,100 @@
+import hashlib
+import shelve
+from pathlib import Path
+from typing import Callable, List
+
+from vortex.banking.category.payee_categories import PayeeCategory
+from vortex.banking.category.rules import CompiledRules
+from vortex.banking.transaction.transaction import Transaction
+from vortex.utils import checked_type, checked_list_type
+
+__all__ = ["CategoryMemo"]
+
+
+class CategoryMemo:
+    """
+    Categories already found by a set of rules, keyed by `CompiledRules.memo_key` - the lower-cased payee along
+    with the results of the rules' amount and date guards - so a payee that recurs every month is only run
+    through the rules once per distinct key.
+
+    Saved to a shelf under a fingerprint of the rule sources, so it is discarded as soon as they change
+    """
+    SHELF = Path(__file__).parent / "_category_memo.shelf"
+
+    def __init__(self, rules: CompiledRules, fingerprint: str):
+        self.rules: CompiledRules = checked_type(rules, CompiledRules)
+        self.fingerprint: str = checked_type(fingerprint, str)
+        self.categories: dict[tuple, PayeeCategory] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+        self._num_saved: int = 0
+
+    @staticmethod
+    def rules_fingerprint(rules: CompiledRules, source_files: List[Path]) -> str:
+        """Hash of the files the rules are defined in, and of their patterns, some of which come from config"""
+        sha = hashlib.sha256()
+        for file in checked_list_type(source_files, Path):
+            sha.update(file.read_bytes())
+        for _, clause in rules.clauses:
+            sha.update(repr([p.key for p in clause.all_of]).encode())
+            sha.update(repr(None if clause.unless is None else clause.unless.key).encode())
+        return sha.hexdigest()
+
+    @staticmethod
+    def load(rules: CompiledRules, fingerprint: str) -> 'CategoryMemo':
+        memo = CategoryMemo(rules, fingerprint)
+        with shelve.open(str(CategoryMemo.SHELF)) as shelf:
+            memo.categories = shelf.get(fingerprint, {})
+        memo._num_saved = len(memo.categories)
+        return memo
+
+    def save(self):
+        """Writes the memo to the shelf if anything has been added, dropping memos of earlier rules"""
+        if len(self.categories) == self._num_saved:
+            return
+        with shelve.open(str(CategoryMemo.SHELF)) as shelf:
+            for key in list(shelf.keys()):
+                if key != self.fingerprint:
+                    del shelf[key]
+            shelf[self.fingerprint] = self.categories
+        self._num_saved = len(self.categories)
+
+    def category(self, transaction: Transaction) -> PayeeCategory:
+        key = self.rules.memo_key(transaction)
+        category = self.categories.get(key)
+        if category is None:
+            self.misses += 1
+            category = self.rules.category(transaction)
+            self.categories[key] = category
+        else:
+            self.hits += 1
+        return category
+
+    def categories_for(
+            self,
+            transactions: List[Transaction],
+            categorise: Callable[[List[Transaction]], List[PayeeCategory]],
+    ) -> List[PayeeCategory]:
+        """
+        The category of each transaction. Those with keys not already memoised are collapsed to one transaction
+        per key and passed to `categorise` together
+        """
+        keys = [self.rules.memo_key(t) for t in transactions]
+        missing = {}
+        for key, transaction in zip(keys, transactions):
+            if key not in self.categories and key not in missing:
+                missing[key] = transaction
+        self.misses += len(missing)
+        self.hits += len(keys) - len(missing)
+        for key, category in zip(missing.keys(), categorise(list(missing.values()))):
+            self.categories[key] = category
+        return [self.categories[key] for key in keys]
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+    def __str__(self):
+        return f"Category memo: {self.hits} hits, {self.misses} misses ({self.hit_rate:.1%}), " \
+               f"{len(self.categories)} keys"
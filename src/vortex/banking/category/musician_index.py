@@ -0,0 +1,84 @@
+from typing import Callable, List, Optional
+
+from vortex.banking.category.payee_categories import PayeeCategory
+from vortex.banking.category.rules import CategoryRule, Patterns
+from vortex.banking.transaction.transaction import Transaction
+from vortex.utils import checked_list_type, checked_type
+from vortex.utils.multi_pattern import MultiPatternMatcher
+
+__all__ = ["MusicianIndex"]
+
+
+def _matches(patterns: Patterns, lower: str) -> bool:
+    if patterns.kind == Patterns.STARTS:
+        return any(lower.startswith(p) for p in patterns.patterns)
+    if patterns.kind == Patterns.CONTAINS:
+        return any(p in lower for p in patterns.patterns)
+    return any(lower.endswith(p) for p in patterns.patterns)
+
+
+class _MusicianClause:
+    """
+    A clause of the musician rule - the kind of match needed on a musician's name, along with the clause's other
+    patterns and guard
+    """
+
+    def __init__(self, category: PayeeCategory, name_kind: str, conditions: List[Patterns],
+                 guard: Optional[Callable[[Transaction], bool]]):
+        self.category: PayeeCategory = category
+        self.name_kind: str = name_kind
+        self.conditions: List[Patterns] = conditions
+        self.guard: Optional[Callable[[Transaction], bool]] = guard
+
+
+class MusicianIndex:
+    """
+    Finds the musician an outgoing payment was made to, from a prefix trie and substring automaton over the
+    musician names, rather than testing each name in turn.
+
+    The conditions come from the clauses of `rule` that match on `musicians` - a payment is to a musician if it
+    satisfies one of those clauses with that musician's name. If several musicians match, the one earliest in the
+    list wins
+    """
+
+    def __init__(self, rule: CategoryRule, musicians: List[str]):
+        self.rule: CategoryRule = checked_type(rule, CategoryRule)
+        self.musicians: List[str] = checked_list_type(musicians, str)
+        self._positions: dict[str, int] = {}
+        for i, m in enumerate(musicians):
+            self._positions.setdefault(m, i)
+        self._clauses: List[_MusicianClause] = []
+        for clause in rule.clauses:
+            names = [p for p in clause.all_of if p.patterns == tuple(musicians)]
+            if len(names) == 0:
+                continue
+            assert len(names) == 1 and names[0].kind != Patterns.ENDS, \
+                f"Rule {rule.name} should match musicians once, by start or content"
+            conditions = [p for p in clause.all_of if p is not names[0]]
+            self._clauses.append(_MusicianClause(clause.category, names[0].kind, conditions, clause.guard))
+        assert len(self._clauses) > 0, f"Rule {rule.name} has no clause matching on musicians"
+        self._matcher = MultiPatternMatcher(prefixes=musicians, substrings=musicians)
+
+    def _first_musician(self, lower: str, clauses: List[_MusicianClause]) -> Optional[tuple[PayeeCategory, str]]:
+        candidates = []
+        for clause in clauses:
+            if all(_matches(p, lower) for p in clause.conditions):
+                if clause.name_kind == Patterns.STARTS:
+                    names = self._matcher.prefixes_of(lower)
+                else:
+                    names = self._matcher.substrings_of(lower)
+                candidates += [(self._positions[name], name, clause.category) for name in names]
+        if len(candidates) == 0:
+            return None
+        _, musician, category = min(candidates, key=lambda c: c[0])
+        return category, musician
+
+    def musician_paid(self, payee: str) -> Optional[str]:
+        """The musician a payment to `payee` was made to, None if not to a musician. Ignores the clauses' guards"""
+        match = self._first_musician(payee.lower(), self._clauses)
+        return None if match is None else match[1]
+
+    def match(self, transaction: Transaction) -> Optional[tuple[PayeeCategory, str]]:
+        """The category, along with the musician paid, if `transaction` is a payment to a musician"""
+        clauses = [c for c in self._clauses if c.guard is None or c.guard(transaction)]
+        return self._first_musician(transaction.lower_payee, clauses)
@@ -1,13 +1,18 @@
 from enum import StrEnum, verify, UNIQUE
 from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
 
 from vortex.utils import checked_type
 
 
+MUSICIANS_FILE = Path(__file__).parent.parent.parent / "resources" / "musicians.txt"
+
+
 def _musicians():
-    file = Path(__file__).parent.parent.parent / "resources" / "musicians.txt"
     musicians = []
-    with open(file) as f:
+    with open(MUSICIANS_FILE) as f:
         for line in f.readlines():
             musicians.append(line.strip())
     return musicians
@@ -93,86 +98,143 @@ class PayeeCategory(StrEnum):
 
     @staticmethod
     def is_subject_to_vat(category: 'PayeeCategory') -> bool:
-        if category in [
-            PayeeCategory.BANK_FEES,
-            PayeeCategory.BB_LOAN,
-            PayeeCategory.BANK_INTEREST,
-            PayeeCategory.CREDIT_CARD_FEES,
-            PayeeCategory.DONATION,
-            PayeeCategory.GIG_SECURITY,
-            PayeeCategory.GRANT,
-            PayeeCategory.INSURANCE_PAYOUT,
-            PayeeCategory.INTERNAL_TRANSFER,
-            PayeeCategory.MEMBERSHIPS,
-            PayeeCategory.MUSIC_VENUE_TRUST,
-            PayeeCategory.MUSICIAN_PAYMENTS,
-            PayeeCategory.PETTY_CASH,
-            PayeeCategory.PIANO_TUNER,
-            PayeeCategory.RATES,
-            PayeeCategory.SALARIES,
-            PayeeCategory.SOUND_ENGINEER,
-            PayeeCategory.TICKET_SALES,
-            PayeeCategory.UNCATEGORISED,
-            PayeeCategory.VAT,
-            PayeeCategory.VORTEX_MERCH,
-            PayeeCategory.WORK_PERMITS
-        ]:
+        if category in NOT_SUBJECT_TO_VAT:
             return False
-
-        if category in [
-            PayeeCategory.ACCOUNTANT,
-            PayeeCategory.ADVERTISING,
-            PayeeCategory.AIRTABLE,         # Deprecated - use SUBSCRIPTIONS instead
-            PayeeCategory.BAR_SNACKS,
-            PayeeCategory.BAR_STOCK,
-            PayeeCategory.BT,
-            PayeeCategory.BUILDING_MAINTENANCE,
-            PayeeCategory.BUILDING_SECURITY,
-            PayeeCategory.BUILDING_WORKS,
-            PayeeCategory.CARD_SALES,
-            PayeeCategory.CLEANING,
-            PayeeCategory.ELECTRICITY,
-            PayeeCategory.EQUIPMENT_HIRE,
-            PayeeCategory.EQUIPMENT_MAINTENANCE,
-            PayeeCategory.EQUIPMENT_PURCHASE,
-            PayeeCategory.FIRE_ALARM,
-            PayeeCategory.FLOOD,
-            PayeeCategory.INSURANCE,
-            PayeeCategory.KASHFLOW,         # Deprecated - use SUBSCRIPTIONS instead
-            PayeeCategory.LEGAL_ADVICE,
-            PayeeCategory.LICENSING,
-            PayeeCategory.MAILCHIMP,
-            PayeeCategory.MARKETING,
-            PayeeCategory.MUSICIAN_COSTS,
-            PayeeCategory.OPERATIONAL_COSTS,
-            PayeeCategory.PRS,
-            PayeeCategory.RENT,
-            PayeeCategory.SLACK,            # Deprecated - use SUBSCRIPTIONS instead
-            PayeeCategory.SPACE_HIRE,
-            PayeeCategory.SUBSCRIPTIONS,
-            PayeeCategory.TELEPHONE,
-            PayeeCategory.THAMES_WATER,
-            PayeeCategory.UTILITIES,
-            PayeeCategory.WEB_HOST,
-        ]:
+        if category in SUBJECT_TO_VAT:
             return True
-
         raise ValueError(f"Unknown category for VAT [{category}]")
 
     @staticmethod
     def is_credit(category: 'PayeeCategory') -> bool:
         checked_type(category, PayeeCategory)
-        return category in [
-            PayeeCategory.CARD_SALES,
-            PayeeCategory.CASH_SALES,
-            PayeeCategory.TICKET_SALES,
-            PayeeCategory.SPACE_HIRE,
-            PayeeCategory.MEMBERSHIPS,
-            PayeeCategory.INSURANCE_PAYOUT
-        ]
+        return category in CREDITS
 
     @staticmethod
     def is_debit(category: 'PayeeCategory') -> bool:
         checked_type(category, PayeeCategory)
-        return not PayeeCategory.is_credit(category)
+        return category in DEBITS
+
+
+CATEGORIES: List[PayeeCategory] = list(PayeeCategory)
+CATEGORY_CODES: dict[PayeeCategory, int] = {c: i for i, c in enumerate(CATEGORIES)}
+
+
+class CategoryMask:
+    """
+    A set of categories as a bitmask over their codes, so membership is a shift and an and. `select` applies it
+    to a column of category codes, giving the boolean mask of those rows in the set
+    """
+    __slots__ = ("bits", "_table")
+
+    def __init__(self, categories: Iterable[PayeeCategory]):
+        bits = 0
+        for c in categories:
+            bits |= 1 << CATEGORY_CODES[checked_type(c, PayeeCategory)]
+        self.bits: int = bits
+        self._table: Optional[np.ndarray] = None
+
+    @staticmethod
+    def from_bits(bits: int) -> 'CategoryMask':
+        mask = CategoryMask([])
+        mask.bits = bits
+        return mask
+
+    def __contains__(self, category) -> bool:
+        code = CATEGORY_CODES.get(category)
+        return code is not None and (self.bits >> code) & 1 == 1
+
+    def __or__(self, other: 'CategoryMask') -> 'CategoryMask':
+        return CategoryMask.from_bits(self.bits | other.bits)
+
+    def __invert__(self) -> 'CategoryMask':
+        return CategoryMask.from_bits(((1 << len(CATEGORIES)) - 1) & ~self.bits)
+
+    def __eq__(self, other):
+        return isinstance(other, CategoryMask) and self.bits == other.bits
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    @property
+    def categories(self) -> List[PayeeCategory]:
+        return [c for c in CATEGORIES if c in self]
+
+    def select(self, codes: np.ndarray) -> np.ndarray:
+        """Boolean mask of the entries of `codes`, an array of category codes, whose categories are in the set"""
+        if self._table is None:
+            self._table = np.array([(self.bits >> i) & 1 == 1 for i in range(len(CATEGORIES))], dtype=bool)
+        return self._table[codes]
+
+
+NOT_SUBJECT_TO_VAT = CategoryMask([
+    PayeeCategory.BANK_FEES,
+    PayeeCategory.BB_LOAN,
+    PayeeCategory.BANK_INTEREST,
+    PayeeCategory.CREDIT_CARD_FEES,
+    PayeeCategory.DONATION,
+    PayeeCategory.GIG_SECURITY,
+    PayeeCategory.GRANT,
+    PayeeCategory.INSURANCE_PAYOUT,
+    PayeeCategory.INTERNAL_TRANSFER,
+    PayeeCategory.MEMBERSHIPS,
+    PayeeCategory.MUSIC_VENUE_TRUST,
+    PayeeCategory.MUSICIAN_PAYMENTS,
+    PayeeCategory.PETTY_CASH,
+    PayeeCategory.PIANO_TUNER,
+    PayeeCategory.RATES,
+    PayeeCategory.SALARIES,
+    PayeeCategory.SOUND_ENGINEER,
+    PayeeCategory.TICKET_SALES,
+    PayeeCategory.UNCATEGORISED,
+    PayeeCategory.VAT,
+    PayeeCategory.VORTEX_MERCH,
+    PayeeCategory.WORK_PERMITS
+])
+
+SUBJECT_TO_VAT = CategoryMask([
+    PayeeCategory.ACCOUNTANT,
+    PayeeCategory.ADVERTISING,
+    PayeeCategory.AIRTABLE,         # Deprecated - use SUBSCRIPTIONS instead
+    PayeeCategory.BAR_SNACKS,
+    PayeeCategory.BAR_STOCK,
+    PayeeCategory.BT,
+    PayeeCategory.BUILDING_MAINTENANCE,
+    PayeeCategory.BUILDING_SECURITY,
+    PayeeCategory.BUILDING_WORKS,
+    PayeeCategory.CARD_SALES,
+    PayeeCategory.CLEANING,
+    PayeeCategory.ELECTRICITY,
+    PayeeCategory.EQUIPMENT_HIRE,
+    PayeeCategory.EQUIPMENT_MAINTENANCE,
+    PayeeCategory.EQUIPMENT_PURCHASE,
+    PayeeCategory.FIRE_ALARM,
+    PayeeCategory.FLOOD,
+    PayeeCategory.INSURANCE,
+    PayeeCategory.KASHFLOW,         # Deprecated - use SUBSCRIPTIONS instead
+    PayeeCategory.LEGAL_ADVICE,
+    PayeeCategory.LICENSING,
+    PayeeCategory.MAILCHIMP,
+    PayeeCategory.MARKETING,
+    PayeeCategory.MUSICIAN_COSTS,
+    PayeeCategory.OPERATIONAL_COSTS,
+    PayeeCategory.PRS,
+    PayeeCategory.RENT,
+    PayeeCategory.SLACK,            # Deprecated - use SUBSCRIPTIONS instead
+    PayeeCategory.SPACE_HIRE,
+    PayeeCategory.SUBSCRIPTIONS,
+    PayeeCategory.TELEPHONE,
+    PayeeCategory.THAMES_WATER,
+    PayeeCategory.UTILITIES,
+    PayeeCategory.WEB_HOST,
+])
+
+CREDITS = CategoryMask([
+    PayeeCategory.CARD_SALES,
+    PayeeCategory.CASH_SALES,
+    PayeeCategory.TICKET_SALES,
+    PayeeCategory.SPACE_HIRE,
+    PayeeCategory.MEMBERSHIPS,
+    PayeeCategory.INSURANCE_PAYOUT,
+])
 
+DEBITS = ~CREDITS
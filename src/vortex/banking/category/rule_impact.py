@@ -0,0 +1,192 @@
+import hashlib
+import subprocess
+import types
+from pathlib import Path
+from typing import List, Optional
+
+from vortex.banking.category import payee_categories
+from vortex.banking.category.payee_categories import PayeeCategory, MUSICIANS_FILE
+from vortex.banking.category.rules import CategoryRule, Clause, CompiledRules, Patterns
+from vortex.banking.transaction.transaction import Transaction
+from vortex.date_range.accounting_month import AccountingMonth
+from vortex.utils import checked_list_type
+from vortex.utils.collection_utils import group_into_dict
+from vortex.utils.multi_pattern import MultiPatternMatcher
+
+__all__ = ["RuleImpact", "PayeeTokenIndex", "rules_at_revision"]
+
+
+def _guard_fingerprint(clause: Clause) -> Optional[str]:
+    if clause.guard is None:
+        return None
+    code = clause.guard.__code__
+    return hashlib.sha256(code.co_code + repr((code.co_consts, code.co_names)).encode()).hexdigest()
+
+
+def _clause_fingerprint(clause: Clause) -> tuple:
+    # Everything about a clause but its patterns - if this differs the whole clause counts as changed
+    return (
+        clause.category,
+        len(clause.all_of),
+        tuple(p.kind for p in clause.all_of),
+        None if clause.unless is None else clause.unless.key,
+        _guard_fingerprint(clause),
+    )
+
+
+def _add_patterns(changed: dict[str, set[str]], patterns: Patterns, only: Optional[set[str]] = None):
+    changed[patterns.kind].update(p for p in patterns.patterns if only is None or p in only)
+
+
+def _moved_rules(old_rules: List[CategoryRule], new_rules: List[CategoryRule]) -> set[str]:
+    # Rules kept in both whose position relative to the other kept rules has changed
+    new_names = {r.name for r in new_rules}
+    old_names = {r.name for r in old_rules}
+    old_order = [r.name for r in old_rules if r.name in new_names]
+    new_order = [r.name for r in new_rules if r.name in old_names]
+    moved = set()
+    for old_name, new_name in zip(old_order, new_order):
+        if old_name != new_name:
+            moved |= {old_name, new_name}
+    return moved
+
+
+class PayeeTokenIndex:
+    """
+    Inverted index from the whitespace separated tokens of lower-cased payees to the payees containing them.
+
+    Any payee containing a pattern contains each of the pattern's tokens within one of its own tokens, so the
+    payees that might match a set of patterns are found by scanning the vocabulary, not the payees
+    """
+
+    def __init__(self, payees: List[str]):
+        self.payees_by_token: dict[str, set[str]] = {}
+        for payee in set(payees):
+            for token in payee.lower().split():
+                self.payees_by_token.setdefault(token, set()).add(payee)
+        self._all_payees = set(payees)
+
+    def candidates(self, patterns: set[str]) -> set[str]:
+        """Payees which might start with, contain or end with any of `patterns`"""
+        longest_tokens = set()
+        for pattern in patterns:
+            tokens = pattern.split()
+            if len(tokens) == 0:
+                return set(self._all_payees)
+            longest_tokens.add(max(tokens, key=len))
+        matcher = MultiPatternMatcher(substrings=longest_tokens)
+        candidates = set()
+        for token, payees in self.payees_by_token.items():
+            if matcher.substrings_of(token):
+                candidates |= payees
+        return candidates
+
+
+class RuleImpact:
+    """
+    Which transactions change category when the categorisation rules change from `old_rules` to `new_rules`.
+
+    Clauses are compared by rule name and position. Where only their patterns differ, just the added and removed
+    patterns count as changed; otherwise, or if a rule is added, removed or reordered, all of its patterns do.
+    Only transactions whose payees match a changed pattern can change category, so only they are re-categorised
+    """
+
+    def __init__(self, old_rules: List[CategoryRule], new_rules: List[CategoryRule]):
+        self.old_rules: List[CategoryRule] = checked_list_type(old_rules, CategoryRule)
+        self.new_rules: List[CategoryRule] = checked_list_type(new_rules, CategoryRule)
+        self.old_compiled = CompiledRules(old_rules)
+        self.new_compiled = CompiledRules(new_rules)
+        self.changed_patterns: dict[str, set[str]] = self._changed_patterns()
+
+    def _changed_patterns(self) -> dict[str, set[str]]:
+        changed = {Patterns.STARTS: set(), Patterns.CONTAINS: set(), Patterns.ENDS: set()}
+        old_by_name = {r.name: r for r in self.old_rules}
+        new_by_name = {r.name: r for r in self.new_rules}
+        moved = _moved_rules(self.old_rules, self.new_rules)
+        for name in old_by_name.keys() | new_by_name.keys():
+            old_clauses = old_by_name[name].clauses if name in old_by_name else []
+            new_clauses = new_by_name[name].clauses if name in new_by_name else []
+            for i in range(max(len(old_clauses), len(new_clauses))):
+                old_clause = old_clauses[i] if i < len(old_clauses) else None
+                new_clause = new_clauses[i] if i < len(new_clauses) else None
+                if name not in moved and old_clause is not None and new_clause is not None \
+                        and _clause_fingerprint(old_clause) == _clause_fingerprint(new_clause):
+                    for old_patterns, new_patterns in zip(old_clause.all_of, new_clause.all_of):
+                        differing = set(old_patterns.patterns) ^ set(new_patterns.patterns)
+                        _add_patterns(changed, old_patterns, differing)
+                        _add_patterns(changed, new_patterns, differing)
+                    continue
+                for clause in [old_clause, new_clause]:
+                    if clause is not None:
+                        for patterns in clause.all_of:
+                            _add_patterns(changed, patterns)
+        return changed
+
+    @property
+    def has_changes(self) -> bool:
+        return any(len(patterns) > 0 for patterns in self.changed_patterns.values())
+
+    def affected_payees(self, payees: List[str]) -> set[str]:
+        """Those of `payees` matching a changed pattern"""
+        all_patterns = set().union(*self.changed_patterns.values())
+        if len(all_patterns) == 0:
+            return set()
+        matcher = MultiPatternMatcher(
+            prefixes=self.changed_patterns[Patterns.STARTS],
+            substrings=self.changed_patterns[Patterns.CONTAINS],
+            suffixes=self.changed_patterns[Patterns.ENDS],
+        )
+        affected = set()
+        for payee in PayeeTokenIndex(payees).candidates(all_patterns):
+            lower = payee.lower()
+            if matcher.prefixes_of(lower) or matcher.substrings_of(lower) or matcher.suffixes_of(lower):
+                affected.add(payee)
+        return affected
+
+    def changed_categories(
+            self,
+            transactions: List[Transaction]
+    ) -> List[tuple[Transaction, PayeeCategory, PayeeCategory]]:
+        """(transaction, old category, new category) for each transaction whose category changes"""
+        affected = self.affected_payees([t.payee for t in transactions])
+        changes = []
+        for t in transactions:
+            if t.payee in affected:
+                old_category = self.old_compiled.category(t)
+                new_category = self.new_compiled.category(t)
+                if old_category != new_category:
+                    changes.append((t, old_category, new_category))
+        return changes
+
+    def changes_by_month(
+            self,
+            transactions: List[Transaction]
+    ) -> dict[AccountingMonth, List[tuple[Transaction, PayeeCategory, PayeeCategory]]]:
+        """Changed categories grouped by the accounting month - and so statements tab - of their transaction"""
+        changes = self.changed_categories(transactions)
+        by_month = group_into_dict(changes, lambda change: AccountingMonth.containing(change[0].payment_date))
+        return {month: by_month[month] for month in sorted(by_month.keys())}
+
+
+def rules_at_revision(revision: str) -> List[CategoryRule]:
+    """The RULES of categorize.py, with the musicians of musicians.txt, as of a git revision"""
+    from vortex.banking.category import categorize
+
+    def file_at_revision(file: Path) -> str:
+        return subprocess.run(
+            ["git", "-C", str(file.parent), "show", f"{revision}:./{file.name}"],
+            check=True, capture_output=True, text=True,
+        ).stdout
+
+    musicians = [line.strip() for line in file_at_revision(MUSICIANS_FILE).splitlines()]
+    module = types.ModuleType(f"categorize_at_{revision}")
+    module.__file__ = categorize.__file__
+    current_musicians = payee_categories.MUSICIANS
+    payee_categories.MUSICIANS = musicians
+    try:
+        exec(compile(file_at_revision(Path(categorize.__file__)), module.__file__, "exec"), module.__dict__)
+    finally:
+        payee_categories.MUSICIANS = current_musicians
+    if not hasattr(module, "RULES"):
+        raise ValueError(f"categorize.py at {revision} has no RULES table")
+    return module.RULES
@@ -0,0 +1,76 @@
+import time
+from collections import Counter
+
+from tabulate import tabulate
+
+from vortex.banking.category.payee_categories import PayeeCategory
+from vortex.banking.category.rules import CompiledRules
+from vortex.banking.transaction.transaction import Transaction
+from vortex.utils import checked_type
+
+__all__ = ["RuleProfile"]
+
+
+class RuleProfile:
+    """
+    Per-rule counts and timings from categorising with a CompiledRules, for finding hot and dead rules.
+
+    A rule is evaluated for a transaction when all the patterns of one of its clauses match, and its guard is then
+    checked. It hits if it gives the category, and is shadowed if it would have matched but an earlier rule won.
+    The time to scan the payee for patterns is shared by all rules, so is reported separately
+    """
+
+    def __init__(self, rules: CompiledRules):
+        self.rules: CompiledRules = checked_type(rules, CompiledRules)
+        self.num_transactions: int = 0
+        self.fall_throughs: int = 0
+        self.scan_seconds: float = 0.0
+        self.evaluations: Counter = Counter()
+        self.hits: Counter = Counter()
+        self.shadowed: Counter = Counter()
+        self.seconds: Counter = Counter()
+
+    def category(self, transaction: Transaction) -> PayeeCategory:
+        """The same category as CompiledRules.category, checking every candidate clause to record shadowing"""
+        t0 = time.perf_counter()
+        candidates = self.rules.candidate_clauses(self.rules.transaction_groups(transaction))
+        self.scan_seconds += time.perf_counter() - t0
+        self.num_transactions += 1
+        winner = None
+        evaluated = set()
+        satisfied = set()
+        for i in candidates:
+            rule, clause = self.rules.clauses[i]
+            t0 = time.perf_counter()
+            passes = clause.guard is None or clause.guard(transaction)
+            self.seconds[rule.name] += time.perf_counter() - t0
+            evaluated.add(rule.name)
+            if passes:
+                satisfied.add(rule.name)
+                if winner is None:
+                    winner = (rule, clause)
+        self.evaluations.update(evaluated)
+        if winner is None:
+            self.fall_throughs += 1
+            return PayeeCategory.UNCATEGORISED
+        self.hits[winner[0].name] += 1
+        self.shadowed.update(satisfied - {winner[0].name})
+        return winner[1].category
+
+    def table(self) -> str:
+        rows = [
+            [
+                rule.name,
+                self.evaluations[rule.name],
+                self.hits[rule.name],
+                self.shadowed[rule.name],
+                f"{self.seconds[rule.name] * 1000:.2f}",
+            ]
+            for rule in self.rules.rules
+        ]
+        rows.append(["(pattern scan)", self.num_transactions, "", "", f"{self.scan_seconds * 1000:.2f}"])
+        rows.append([PayeeCategory.UNCATEGORISED, "", self.fall_throughs, "", ""])
+        return tabulate(rows, headers=["Rule", "Evaluations", "Hits", "Shadowed", "Time (ms)"])
+
+    def __str__(self):
+        return self.table()
@@ -0,0 +1,164 @@
+from typing import Callable, List, Optional
+
+from vortex.banking.category.payee_categories import PayeeCategory
+from vortex.banking.transaction.transaction import Transaction
+from vortex.utils import checked_type, checked_list_type, checked_optional_type
+from vortex.utils.multi_pattern import MultiPatternMatcher
+
+__all__ = ["Patterns", "starts", "contains", "ends", "Clause", "CategoryRule", "CompiledRules"]
+
+
+class Patterns:
+    """Matches a transaction whose lower-cased payee starts with, contains or ends with any of `patterns`"""
+    STARTS = "starts"
+    CONTAINS = "contains"
+    ENDS = "ends"
+
+    def __init__(self, kind: str, patterns: List[str]):
+        assert kind in (Patterns.STARTS, Patterns.CONTAINS, Patterns.ENDS), f"Unexpected kind {kind}"
+        self.kind: str = kind
+        self.patterns: tuple[str, ...] = tuple(checked_list_type(patterns, str))
+
+    @property
+    def key(self) -> tuple[str, tuple[str, ...]]:
+        return self.kind, self.patterns
+
+    def __str__(self):
+        return f"{self.kind}{list(self.patterns)}"
+
+
+def _patterns(kind: str, patterns) -> Patterns:
+    flattened = []
+    for p in patterns:
+        flattened.extend([p] if isinstance(p, str) else p)
+    return Patterns(kind, flattened)
+
+
+def starts(*patterns) -> Patterns:
+    return _patterns(Patterns.STARTS, patterns)
+
+
+def contains(*patterns) -> Patterns:
+    return _patterns(Patterns.CONTAINS, patterns)
+
+
+def ends(*patterns) -> Patterns:
+    return _patterns(Patterns.ENDS, patterns)
+
+
+class Clause:
+    """
+    Gives `category` to a transaction matching every one of `all_of`, not matching `unless`, and passing `guard`,
+    which sees the transaction itself for checks on amounts, dates or case
+    """
+
+    def __init__(
+            self,
+            category: PayeeCategory,
+            *all_of: Patterns,
+            unless: Optional[Patterns] = None,
+            guard: Optional[Callable[[Transaction], bool]] = None,
+    ):
+        assert len(all_of) > 0, "A clause needs at least one set of patterns"
+        self.category: PayeeCategory = checked_type(category, PayeeCategory)
+        self.all_of: List[Patterns] = checked_list_type(list(all_of), Patterns)
+        self.unless: Optional[Patterns] = checked_optional_type(unless, Patterns)
+        self.guard: Optional[Callable[[Transaction], bool]] = guard
+
+
+class CategoryRule:
+    """Named, ordered clauses - the first clause a transaction satisfies gives its category"""
+
+    def __init__(self, name: str, clauses: List[Clause]):
+        self.name: str = checked_type(name, str)
+        self.clauses: List[Clause] = checked_list_type(clauses, Clause)
+
+
+class CompiledRules:
+    """
+    Rules compiled into a single MultiPatternMatcher over all their patterns. A payee is scanned once, giving the
+    set of pattern groups it matches, and only clauses requiring one of those groups are then checked, in
+    priority order - rule order, then clause order within a rule
+    """
+
+    def __init__(self, rules: List[CategoryRule]):
+        self.rules: List[CategoryRule] = checked_list_type(rules, CategoryRule)
+        self.clauses: List[tuple[CategoryRule, Clause]] = [(rule, clause) for rule in rules for clause in rule.clauses]
+        group_ids: dict[tuple[str, tuple[str, ...]], int] = {}
+
+        def group_id(patterns: Patterns) -> int:
+            return group_ids.setdefault(patterns.key, len(group_ids))
+
+        self._required: List[frozenset[int]] = []
+        self._excluded: List[Optional[int]] = []
+        for _, clause in self.clauses:
+            self._required.append(frozenset(group_id(p) for p in clause.all_of))
+            self._excluded.append(None if clause.unless is None else group_id(clause.unless))
+
+        self._groups_by_pattern: dict[str, dict[str, List[int]]] = {
+            Patterns.STARTS: {}, Patterns.CONTAINS: {}, Patterns.ENDS: {}
+        }
+        for (kind, patterns), i_group in group_ids.items():
+            for pattern in patterns:
+                self._groups_by_pattern[kind].setdefault(pattern, []).append(i_group)
+        self._clauses_by_group: List[List[int]] = [[] for _ in group_ids]
+        for i_clause, required in enumerate(self._required):
+            for i_group in required:
+                self._clauses_by_group[i_group].append(i_clause)
+        self._matcher = MultiPatternMatcher(
+            prefixes=self._groups_by_pattern[Patterns.STARTS],
+            substrings=self._groups_by_pattern[Patterns.CONTAINS],
+            suffixes=self._groups_by_pattern[Patterns.ENDS],
+        )
+        self._guards: List[Callable[[Transaction], bool]] = []
+        for _, clause in self.clauses:
+            if clause.guard is not None and clause.guard not in self._guards:
+                self._guards.append(clause.guard)
+
+    def matched_groups(self, payee: str) -> set[int]:
+        """Ids of the pattern groups matched by `payee`"""
+        return self._matched_groups(payee.lower())
+
+    def transaction_groups(self, transaction: Transaction) -> set[int]:
+        """Ids of the pattern groups matched by the transaction's payee, using its interned lower-cased form"""
+        return self._matched_groups(transaction.lower_payee)
+
+    def _matched_groups(self, lower: str) -> set[int]:
+        groups = set()
+        by_pattern = self._groups_by_pattern
+        for pattern in self._matcher.prefixes_of(lower):
+            groups.update(by_pattern[Patterns.STARTS][pattern])
+        for pattern in self._matcher.substrings_of(lower):
+            groups.update(by_pattern[Patterns.CONTAINS][pattern])
+        for pattern in self._matcher.suffixes_of(lower):
+            groups.update(by_pattern[Patterns.ENDS][pattern])
+        return groups
+
+    def candidate_clauses(self, groups: set[int]) -> List[int]:
+        """Indices, in priority order, of the clauses whose patterns are all matched by `groups`"""
+        candidates = {i for g in groups for i in self._clauses_by_group[g]}
+        return [
+            i for i in sorted(candidates)
+            if self._required[i] <= groups and (self._excluded[i] is None or self._excluded[i] not in groups)
+        ]
+
+    def memo_key(self, transaction: Transaction) -> tuple:
+        """
+        Transactions with the same key get the same category - patterns only see the lower-cased payee, and
+        anything else a guard looks at is captured by its result
+        """
+        return transaction.lower_payee, tuple([guard(transaction) for guard in self._guards])
+
+    def first_match(self, transaction: Transaction) -> Optional[int]:
+        """Index of the first clause satisfied by `transaction`, None if there isn't one"""
+        for i in self.candidate_clauses(self.transaction_groups(transaction)):
+            guard = self.clauses[i][1].guard
+            if guard is None or guard(transaction):
+                return i
+        return None
+
+    def category(self, transaction: Transaction) -> PayeeCategory:
+        i = self.first_match(transaction)
+        if i is None:
+            return PayeeCategory.UNCATEGORISED
+        return self.clauses[i][1].category
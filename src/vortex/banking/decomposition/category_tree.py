@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Union
 
-from vortex.banking.category.payee_categories import PayeeCategory
+from vortex.banking.category.payee_categories import PayeeCategory, CategoryMask
 from vortex.utils import checked_type, checked_list_type
 
 
@@ -9,23 +9,33 @@ class AbstractCategoryTree(ABC):
     def __init__(self, name: str):
         self.name: str = checked_type(name, str)
 
+    @property
     @abstractmethod
-    def includes(self, category: PayeeCategory) -> bool:
+    def mask(self) -> CategoryMask:
+        """Every category under this node, compiled once on construction"""
         pass
 
+    def includes(self, category: PayeeCategory) -> bool:
+        return category in self.mask
+
 class CategoryLeaves(AbstractCategoryTree):
     def __init__(self, name: str, categories: list[PayeeCategory]):
         super().__init__(name)
         self.categories: list[PayeeCategory] = checked_list_type(categories, PayeeCategory)
+        self._mask = CategoryMask(categories)
 
-    def includes(self, category: PayeeCategory) -> bool:
-        return category in self.categories
+    @property
+    def mask(self) -> CategoryMask:
+        return self._mask
 
 class CategoryTree(AbstractCategoryTree):
     def __init__(self, name: str, categories: list[AbstractCategoryTree]):
         super().__init__(name)
         self.categories: list[AbstractCategoryTree] = checked_list_type(categories, AbstractCategoryTree)
+        self._mask = CategoryMask([])
+        for b in categories:
+            self._mask |= b.mask
 
-    def includes(self, category: PayeeCategory) -> bool:
-        return any(b.includes(category) for b in self.categories)
-
+    @property
+    def mask(self) -> CategoryMask:
+        return self._mask
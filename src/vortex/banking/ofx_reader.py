@@ -0,0 +1,76 @@
+from decimal import Decimal
+from pathlib import Path
+
+from ofxparse import OfxParser
+
+from vortex.banking.account.bank_account import BankAccount
+from vortex.banking.category.payee_categories import PayeeCategory
+from vortex.banking.transaction.transaction import Transaction
+from vortex.date_range import Day
+from vortex.utils import validation_boundary
+
+__all__ = ["OfxReader"]
+
+
+class OfxReader:
+    """
+    Reads OFX/QFX statement exports into the same transactions and published balances as the CSV statements.
+
+    Each transaction comes with the bank's FITID, which is unique within an account, so overlapping exports
+    can be merged exactly
+    """
+
+    SUFFIXES = (".ofx", ".qfx")
+
+    # Bump when parse_file's output changes, so cached results are re-parsed
+    PARSER_VERSION = 1
+
+    @staticmethod
+    @validation_boundary()
+    def parse_file(account: BankAccount, file: Path) -> tuple[dict[str, Transaction], dict[Day, Decimal]]:
+        """
+        Transactions keyed by FITID, and the published balances of each statement in the file - its ledger balance,
+        plus the balance at the end of the day before the statement starts, derived from the ledger balance and
+        the statement's transactions
+        """
+        transactions = {}
+        balances = {}
+        for statement in OfxReader._statements(file):
+            statement_transactions = {
+                ofx_transaction.id: OfxReader._transaction(account, file, ofx_transaction)
+                for ofx_transaction in statement.transactions
+            }
+            transactions.update(statement_transactions)
+            ledger_balance = getattr(statement, "balance", None)
+            if ledger_balance is None:
+                continue
+            ledger_day = Day.from_datetime(statement.balance_date)
+            balances[ledger_day] = Decimal(ledger_balance)
+            payment_days = [t.payment_date for t in statement_transactions.values()]
+            if hasattr(statement, "start_date"):
+                payment_days.append(Day.from_datetime(statement.start_date))
+            if len(payment_days) > 0:
+                opening_day = min(payment_days) - 1
+                balances[opening_day] = balances[ledger_day] - sum(
+                    t.amount for t in statement_transactions.values() if t.payment_date <= ledger_day
+                )
+        return transactions, balances
+
+    @staticmethod
+    def _statements(file: Path):
+        with open(file, 'rb') as f:
+            ofx = OfxParser.parse(f)
+        return [account.statement for account in ofx.accounts if account.statement is not None]
+
+    @staticmethod
+    def _transaction(account: BankAccount, file: Path, ofx_transaction) -> Transaction:
+        payee = ofx_transaction.payee or ofx_transaction.memo
+        if payee is None or payee.strip() == "":
+            raise ValueError(f"Transaction {ofx_transaction.id} in {file} has neither a payee nor a memo")
+        return Transaction(
+            account,
+            PayeeCategory.UNCATEGORISED,
+            Day.from_datetime(ofx_transaction.date),
+            payee,
+            Decimal(ofx_transaction.amount),
+        )
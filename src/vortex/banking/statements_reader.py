@@ -1,98 +1,262 @@
+import hashlib
 import shelve
 from decimal import Decimal
 from pathlib import Path
+from typing import Iterator, Optional
 
 from vortex.banking import BankAccountActivity
 from vortex.banking.account.bank_account import BankAccount, CURRENT_ACCOUNT
 from vortex.banking.category.payee_categories import PayeeCategory
+from vortex.banking.ofx_reader import OfxReader
 from vortex.banking.transaction.transaction import Transaction
-from vortex.date_range import Day
+from vortex.date_range import Day, DateParser
 from vortex.date_range.month import Month
+from vortex.utils import validation_boundary
+from vortex.utils.file_utils import read_csv_file
+from vortex.utils.parallel import parallel_map
 from env import STATEMENTS_DIR
 
 __all__ = ["StatementsReader"]
 
-from vortex.utils.file_utils import read_csv_file
-
 
 class StatementsReader:
     SHELF = Path(__file__).parent / "_statements_reader.shelf"
 
     @staticmethod
-    def read_published_balances(statements_dir: Path, force: bool) -> dict[BankAccount, dict[Day, Decimal]]:
-        key = f"uncategorised_balances"
-        with shelve.open(str(StatementsReader.SHELF)) as shelf:
-            if key not in shelf or force:
-                balances = {}
-                for directory in (statements_dir / "csv").glob("*"):
-                    if directory.name == ".DS_Store":
-                        continue
-                    assert directory.is_dir(), f"Expected {directory} to be a directory"
-                    account_id = int(directory.name)
-                    account = BankAccount.account_for_id(account_id)
-                    csv_files = list(directory.glob("*.csv"))
-                    account_balances = {}
-                    for file in csv_files:
-                        rows = read_csv_file(file)[1:]
-                        for row in rows:
-                            day = Day.parse(row[0])
-                            maybe_balance = row[5]
-                            if maybe_balance == "":
-                                continue
-                            account_balances[day] = Decimal(maybe_balance)
-                    balances[account] = account_balances
-                shelf[key] = balances
-            return shelf[key]
+    def _statement_files(statements_dir: Path, file_format: str) -> dict[BankAccount, list[Path]]:
+        suffixes = OfxReader.SUFFIXES if file_format == "ofx" else (".csv",)
+        files = {}
+        for directory in sorted((statements_dir / file_format).glob("*")):
+            if directory.name == ".DS_Store":
+                continue
+            assert directory.is_dir(), f"Expected {directory} to be a directory"
+            account_id = int(directory.name)
+            account = BankAccount.account_for_id(account_id)
+            files[account] = sorted(f for f in directory.iterdir() if f.suffix.lower() in suffixes)
+        return files
+
+    # Bump when _parse_statement_file's output changes, so cached results are re-parsed
+    CSV_PARSER_VERSION = 1
 
     @staticmethod
-    def read_transactions(statements_dir: Path, force: bool) -> dict[BankAccount, list[Transaction]]:
-        key = f"uncategorised_transactions"
+    def _file_signature(
+            file: Path,
+            previous: Optional[tuple[int, int, str, int]],
+            parser_version: int
+    ) -> tuple[int, int, str, int]:
+        # Only hash files whose size or mtime have changed
+        stat = file.stat()
+        if previous is not None and previous[:2] == (stat.st_size, stat.st_mtime_ns):
+            return previous[0], previous[1], previous[2], parser_version
+        return stat.st_size, stat.st_mtime_ns, hashlib.sha256(file.read_bytes()).hexdigest(), parser_version
+
+    @staticmethod
+    def _read_statement_files(
+            statements_dir: Path,
+            file_format: str,
+            force: bool,
+            key: str,
+            parse_file,
+            parser_version: int
+    ) -> dict[BankAccount, dict[str, tuple[tuple[int, int, str, int], object]]]:
+        """
+        The signature and result of `parse_file(account, file)` for each account's statement files in
+        `statements_dir/file_format`, keyed by file name in file name order.
+
+        Results are cached per file along with a manifest of the file's size, mtime, content hash and the version of
+        the parser that read it, so a forced refresh only parses files that are new, have changed or were read by an
+        older parser. Files no longer present are dropped
+        """
         with shelve.open(str(StatementsReader.SHELF)) as shelf:
             if key not in shelf or force:
-                transactions_by_account = {}
-                for directory in (statements_dir / "csv").glob("*"):
-                    if directory.name == ".DS_Store":
-                        continue
-                    assert directory.is_dir(), f"Expected {directory} to be a directory"
-                    account_id = int(directory.name)
-                    account = BankAccount.account_for_id(account_id)
-                    csv_files = list(directory.glob("*.csv"))
-                    transactions_for_account = []
-                    for file in csv_files:
-                        rows = read_csv_file(file)[1:]
-                        for row in rows:
-                            day = Day.parse(row[0])
-                            payee = row[2]
-                            paid_out = Decimal(row[3]) if row[3] != "" else Decimal(0)
-                            paid_in = Decimal(row[4]) if row[4] != "" else Decimal(0)
-                            amount = paid_in - paid_out
-                            trans = Transaction(
-                                account,
-                                PayeeCategory.UNCATEGORISED,
-                                day,
-                                payee,
-                                amount,
-                            )
-                            transactions_for_account.append(trans)
-                    transactions_by_account[account] = transactions_for_account
-                shelf[key] = transactions_by_account
+                cached = shelf.get(key, {})
+                signatures = {}
+                to_parse = []
+                for account, files in StatementsReader._statement_files(statements_dir, file_format).items():
+                    cached_for_account = cached.get(account, {})
+                    for file in files:
+                        previous_signature, _ = cached_for_account.get(file.name, (None, None))
+                        signature = StatementsReader._file_signature(file, previous_signature, parser_version)
+                        signatures[(account, file.name)] = signature
+                        if previous_signature is None or signature[2:] != previous_signature[2:]:
+                            to_parse.append((account, file))
+                parsed = dict(zip(
+                    [(account, file.name) for account, file in to_parse],
+                    StatementsReader._parse_files(parse_file, to_parse)
+                ))
+                refreshed = {}
+                for (account, file_name), signature in signatures.items():
+                    if (account, file_name) in parsed:
+                        result = parsed[(account, file_name)]
+                    else:
+                        result = cached[account][file_name][1]
+                    refreshed.setdefault(account, {})[file_name] = (signature, result)
+                shelf[key] = refreshed
             return shelf[key]
 
+    PARALLEL_PARSE_MIN_FILES = 8
+
     @staticmethod
-    def read_statements(force: bool) -> list[BankAccountActivity]:
-        balances_by_account = StatementsReader.read_published_balances(STATEMENTS_DIR, force)
-        transactions_by_account = StatementsReader.read_transactions(STATEMENTS_DIR, force)
-        assert set(balances_by_account.keys()) == set(transactions_by_account.keys()), \
-            "Expected balances and transactions to have the same accounts"
-        return [
-            BankAccountActivity(
+    def _parse_files(parse_file, account_files: list[tuple[BankAccount, Path]]) -> list:
+        """`parse_file(account, file)` for each pair, in order, spread over a process pool when there are enough"""
+        return parallel_map(
+            parse_file,
+            [account for account, _ in account_files],
+            [file for _, file in account_files],
+            min_items=StatementsReader.PARALLEL_PARSE_MIN_FILES,
+            description="statement parsing",
+        )
+
+    @staticmethod
+    def _statement_file_rows(account: BankAccount, file: Path) -> Iterator[tuple[Transaction, Optional[Decimal]]]:
+        """Each row's transaction, along with the account balance at the end of its day if the row publishes one"""
+        date_parser = DateParser()
+        for row in read_csv_file(file)[1:]:
+            day = Day.parse(row[0], date_parser)
+            payee = row[2]
+            paid_out = Decimal(row[3]) if row[3] != "" else Decimal(0)
+            paid_in = Decimal(row[4]) if row[4] != "" else Decimal(0)
+            amount = paid_in - paid_out
+            trans = Transaction.trusted(
                 account,
-                transactions_by_account[account],
-                balances_by_account[account]
+                PayeeCategory.UNCATEGORISED,
+                day,
+                payee,
+                amount,
+            )
+            maybe_balance = row[5]
+            yield trans, (Decimal(maybe_balance) if maybe_balance != "" else None)
+
+    @staticmethod
+    @validation_boundary()
+    def _parse_statement_file(account: BankAccount, file: Path) -> tuple[list[Transaction], dict[Day, Decimal]]:
+        transactions = []
+        balances = {}
+        for trans, maybe_balance in StatementsReader._statement_file_rows(account, file):
+            transactions.append(trans)
+            if maybe_balance is not None:
+                balances[trans.payment_date] = maybe_balance
+        return transactions, balances
+
+    @staticmethod
+    def _parsed_statement_files(statements_dir: Path, force: bool) -> tuple[dict, dict]:
+        csv_files = StatementsReader._read_statement_files(
+            statements_dir, "csv", force, "uncategorised_statement_files",
+            StatementsReader._parse_statement_file, StatementsReader.CSV_PARSER_VERSION
+        )
+        ofx_files = StatementsReader._read_statement_files(
+            statements_dir, "ofx", force, "uncategorised_ofx_files",
+            OfxReader.parse_file, OfxReader.PARSER_VERSION
+        )
+        return csv_files, ofx_files
+
+    @staticmethod
+    def _merge_parsed_files(
+            csv_results: list[tuple[list[Transaction], dict[Day, Decimal]]],
+            ofx_results: list[tuple[dict[str, Transaction], dict[Day, Decimal]]],
+            known_fitids: set[str],
+    ) -> tuple[list[Transaction], dict[Day, Decimal]]:
+        transactions = [t for file_transactions, _ in csv_results for t in file_transactions]
+        balances = {day: balance for _, file_balances in csv_results for day, balance in file_balances.items()}
+        # Overlapping exports repeat transactions, which share a FITID
+        transactions_by_fitid = {}
+        for file_transactions, file_balances in ofx_results:
+            for fitid, t in file_transactions.items():
+                if fitid not in known_fitids:
+                    transactions_by_fitid.setdefault(fitid, t)
+            balances |= file_balances
+        return transactions + list(transactions_by_fitid.values()), balances
+
+    @staticmethod
+    def read_parsed_statements(
+            statements_dir: Path,
+            force: bool
+    ) -> dict[BankAccount, tuple[list[Transaction], dict[Day, Decimal]]]:
+        csv_files, ofx_files = StatementsReader._parsed_statement_files(statements_dir, force)
+        accounts = list(csv_files.keys()) + [account for account in ofx_files.keys() if account not in csv_files]
+        return {
+            account: StatementsReader._merge_parsed_files(
+                [result for _, result in csv_files.get(account, {}).values()],
+                [result for _, result in ofx_files.get(account, {}).values()],
+                set(),
             )
-            for account in balances_by_account.keys()
-        ]
+            for account in accounts
+        }
 
+    @staticmethod
+    def read_published_balances(statements_dir: Path, force: bool) -> dict[BankAccount, dict[Day, Decimal]]:
+        return {
+            account: balances
+            for account, (_, balances) in StatementsReader.read_parsed_statements(statements_dir, force).items()
+        }
+
+    @staticmethod
+    def read_transactions(statements_dir: Path, force: bool) -> dict[BankAccount, list[Transaction]]:
+        return {
+            account: transactions
+            for account, (transactions, _) in StatementsReader.read_parsed_statements(statements_dir, force).items()
+        }
+
+    # Bump when BankAccountActivity, Transaction or anything else pickled in the cached activities changes layout
+    ACTIVITY_CACHE_VERSION = 1
+
+    @staticmethod
+    def read_statements(
+            force: bool,
+            refresh: bool = False,
+            statements_dir: Optional[Path] = None,
+    ) -> list[BankAccountActivity]:
+        """
+        Each account's activity is cached along with the manifest of the statement files it was built from.
+
+        With `refresh` the statement files are re-read, and if the only change to an account's files is new ones
+        its cached activity is extended with their transactions and balances, checking just the span they touch
+        for consistency. Any other change rebuilds the activity, as does `force` for every account
+        """
+        csv_files, ofx_files = StatementsReader._parsed_statement_files(
+            statements_dir or STATEMENTS_DIR, force or refresh
+        )
+        accounts = list(csv_files.keys()) + [account for account in ofx_files.keys() if account not in csv_files]
+        key = f"statement_activities_v{StatementsReader.ACTIVITY_CACHE_VERSION}"
+        with shelve.open(str(StatementsReader.SHELF)) as shelf:
+            cached = {} if force else shelf.get(key, {})
+            refreshed = {}
+            for account in accounts:
+                csv_for_account = csv_files.get(account, {})
+                ofx_for_account = ofx_files.get(account, {})
+                manifest = {("csv", name): signature[2:] for name, (signature, _) in csv_for_account.items()} | \
+                           {("ofx", name): signature[2:] for name, (signature, _) in ofx_for_account.items()}
+                cached_manifest, activity = cached.get(account, (None, None))
+                if cached_manifest is None or not cached_manifest.items() <= manifest.items():
+                    activity = BankAccountActivity(
+                        account,
+                        *StatementsReader._merge_parsed_files(
+                            [result for _, result in csv_for_account.values()],
+                            [result for _, result in ofx_for_account.values()],
+                            set(),
+                        )
+                    )
+                elif cached_manifest != manifest:
+                    known_fitids = {
+                        fitid
+                        for name, (_, (file_transactions, _)) in ofx_for_account.items()
+                        if ("ofx", name) in cached_manifest
+                        for fitid in file_transactions.keys()
+                    }
+                    activity = activity.extended(
+                        *StatementsReader._merge_parsed_files(
+                            [result for name, (_, result) in csv_for_account.items()
+                             if ("csv", name) not in cached_manifest],
+                            [result for name, (_, result) in ofx_for_account.items()
+                             if ("ofx", name) not in cached_manifest],
+                            known_fitids,
+                        )
+                    )
+                refreshed[account] = (manifest, activity)
+            for old_key in [k for k in shelf.keys() if k.startswith("statement_activities") and k != key]:
+                del shelf[old_key]
+            shelf[key] = refreshed
+        return [activity for _, activity in refreshed.values()]
 
 
 if __name__ == '__main__':
@@ -0,0 +1,84 @@
+from decimal import Decimal
+from typing import List
+
+import numpy as np
+
+from vortex.banking.category.payee_categories import PayeeCategory, CATEGORIES, CATEGORY_CODES
+from vortex.banking.transaction.transactions import Transactions
+from vortex.date_range import DateRange
+from vortex.date_range.simple_date_range import SimpleDateRange
+from vortex.utils import checked_list_type
+from vortex.utils.money import from_pence
+
+__all__ = ["CategoryCube"]
+
+
+class CategoryCube:
+    """
+    Transaction totals for each of a run of adjacent base periods and each PayeeCategory, built in one pass.
+
+    The total for any period made up of whole base periods, and any set of categories, is a sum over a block
+    of the matrix. Totals are held in pence, unless some amount isn't a whole number of pence, in which case
+    they are held as decimals
+    """
+
+    def __init__(self, base_periods: List[DateRange], totals: np.ndarray, exponents: np.ndarray):
+        self.base_periods: List[DateRange] = checked_list_type(base_periods, DateRange)
+        for p1, p2 in zip(base_periods, base_periods[1:]):
+            assert p1.last_day + 1 == p2.first_day, f"Base periods {p1} and {p2} are not adjacent"
+        assert totals.shape == (len(base_periods), len(CATEGORIES)), f"Unexpected shape {totals.shape}"
+        self.totals: np.ndarray = totals
+        self.exponents: np.ndarray = exponents
+        self._first_ordinals = np.array([p.first_day.ordinal for p in base_periods], dtype=np.int64)
+        self._last_ordinals = np.array([p.last_day.ordinal for p in base_periods], dtype=np.int64)
+
+    @staticmethod
+    def from_transactions(transactions: Transactions, base_periods: List[DateRange]) -> 'CategoryCube':
+        frame = transactions.frame
+        rows = np.full(len(frame), -1, dtype=np.int64)
+        for i_period, indices in enumerate(frame.periods_indices(base_periods)):
+            rows[indices] = i_period
+        in_period = rows >= 0
+        index = (rows[in_period], frame.category_codes[in_period])
+        shape = (len(base_periods), len(CATEGORIES))
+        exponents = np.zeros(shape, dtype=np.int32)
+        np.minimum.at(exponents, index, frame.exponents[in_period])
+        if frame.pence is not None:
+            totals = np.zeros(shape, dtype=np.int64)
+            np.add.at(totals, index, frame.pence[in_period])
+        else:
+            totals = np.full(shape, Decimal(0), dtype=object)
+            np.add.at(totals, index, np.array([t.amount for t in frame.transactions], dtype=object)[in_period])
+        return CategoryCube(base_periods, totals, exponents)
+
+    @staticmethod
+    def for_periods(transactions: Transactions, *period_lists: List[DateRange]) -> 'CategoryCube':
+        """A cube whose base periods are split at the boundaries of all the given periods, so that
+        each of them is a union of base periods"""
+        boundaries = sorted(
+            {p.first_day for periods in period_lists for p in periods} |
+            {p.last_day + 1 for periods in period_lists for p in periods}
+        )
+        base_periods = [SimpleDateRange(d1, d2 - 1) for d1, d2 in zip(boundaries, boundaries[1:])]
+        return CategoryCube.from_transactions(transactions, base_periods)
+
+    def _rows_for(self, period: DateRange) -> slice:
+        i_first = int(np.searchsorted(self._first_ordinals, period.first_day.ordinal))
+        i_last = int(np.searchsorted(self._last_ordinals, period.last_day.ordinal))
+        if i_first >= len(self.base_periods) or i_last >= len(self.base_periods) \
+                or self.base_periods[i_first].first_day != period.first_day \
+                or self.base_periods[i_last].last_day != period.last_day:
+            raise ValueError(f"{period} is not made up of whole base periods")
+        return slice(i_first, i_last + 1)
+
+    def total(self, period: DateRange, categories: List[PayeeCategory]) -> Decimal:
+        """The same decimal as restricting the transactions to `period` and `categories` and totalling them"""
+        rows = self._rows_for(period)
+        columns = sorted({CATEGORY_CODES[c] for c in categories})
+        if len(columns) == 0:
+            return Decimal(0)
+        block = self.totals[rows][:, columns]
+        if self.totals.dtype == object:
+            return sum(block.ravel().tolist(), Decimal(0))
+        exponent = min(0, int(self.exponents[rows][:, columns].min()))
+        return from_pence(int(block.sum())).quantize(Decimal(1).scaleb(exponent))
@@ -0,0 +1,69 @@
+import re
+from typing import List
+
+__all__ = ["PayeeDictionary", "PAYEES"]
+
+# Card payments end with the last four digits of the card, or a merchant reference after a '*'
+_CARD_REFERENCE_SUFFIX = re.compile(r"(\s+(cd|card)\s*\d{4}|\*[a-z0-9]*\d[a-z0-9]*)$")
+
+
+class PayeeDictionary:
+    """
+    Interns payee strings. Each distinct raw payee is stored once, with its lower-cased form - what the
+    categorisation rules match against - and its normalised form, and is given an integer id.
+
+    Ids are handed out in order of first appearance and never change while the dictionary exists, so within a
+    process payees can be compared, grouped and joined as integers.
+
+    Pickling the dictionary writes its payees in id order, and unpickling merges them into PAYEES, giving the ids
+    they have there. Those are the pickled ids whenever PAYEES agrees with the pickle on the ids they share, as it
+    does when the pickle is the first source of payees a process loads, or in a worker forked from the process that
+    pickled it
+    """
+
+    def __init__(self):
+        self.payees: List[str] = []
+        self.lowers: List[str] = []
+        self.normalised: List[str] = []
+        self._ids: dict[str, int] = {}
+        self._ids_by_normalised: dict[str, List[int]] = {}
+
+    @staticmethod
+    def normalise(payee: str) -> str:
+        """Lower-cased, with runs of whitespace collapsed to a single space and any card reference suffix removed"""
+        collapsed = " ".join(payee.lower().split())
+        return _CARD_REFERENCE_SUFFIX.sub("", collapsed).rstrip()
+
+    def id_for(self, payee: str) -> int:
+        payee_id = self._ids.get(payee)
+        if payee_id is None:
+            payee_id = len(self.payees)
+            self._ids[payee] = payee_id
+            self.payees.append(payee)
+            self.lowers.append(payee.lower())
+            normalised = PayeeDictionary.normalise(payee)
+            self.normalised.append(normalised)
+            self._ids_by_normalised.setdefault(normalised, []).append(payee_id)
+        return payee_id
+
+    def ids_for_normalised(self, normalised: str) -> List[int]:
+        """Ids of the raw payees with this normalised form"""
+        return self._ids_by_normalised.get(normalised, [])
+
+    def merge(self, payees: List[str]) -> List[int]:
+        """The id of each of `payees`, adding those not already here in order"""
+        return [self.id_for(payee) for payee in payees]
+
+    def __reduce__(self):
+        return _merged_into_payees, (list(self.payees),)
+
+    def __len__(self):
+        return len(self.payees)
+
+
+def _merged_into_payees(payees: List[str]) -> List[int]:
+    # Unpickled form of a PayeeDictionary - for each of its ids, the id of the same payee in PAYEES
+    return PAYEES.merge(payees)
+
+
+PAYEES = PayeeDictionary()
@@ -1,15 +1,30 @@
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 from vortex.banking.account.bank_account import BankAccount
 from vortex.banking.category.payee_categories import PayeeCategory
+from vortex.banking.transaction.payee_dictionary import PAYEES
 from vortex.date_range import Day
 from vortex.utils import checked_type
+from vortex.utils.money import maybe_to_pence
 
 __all__ = ["Transaction"]
 
+_set = object.__setattr__
+
 
 class Transaction:
+    """
+    Immutable, with its hash and identity key - every field bar the category - computed once at construction.
+    Bulk loaders whose fields are already of the right types can skip the checks with `Transaction.trusted`.
+
+    The payee is interned in PAYEES, and `payee_id` is its id there. `pence` is the amount in whole pence, None if
+    it has fractional pence
+    """
+    __slots__ = (
+        "account", "category", "payment_date", "payee", "payee_id", "amount", "pence", "identity_key", "_hash"
+    )
+
     def __init__(
             self,
             account: BankAccount,
@@ -18,23 +33,75 @@ class Transaction:
             payee: str,
             amount: Decimal,
     ):
-        self.account: BankAccount = checked_type(account, BankAccount)
-        self.category: PayeeCategory = checked_type(category, PayeeCategory)
-        self.payment_date: Day = checked_type(payment_date, Day)
-        self.payee: str = checked_type(payee, str)
-        self.amount: Decimal = checked_type(amount, Decimal)
+        self._init(
+            checked_type(account, BankAccount),
+            checked_type(category, PayeeCategory),
+            checked_type(payment_date, Day),
+            checked_type(payee, str),
+            checked_type(amount, Decimal),
+        )
+
+    def _init(self, account, category, payment_date, payee, amount):
+        payee_id = PAYEES.id_for(payee)
+        payee = PAYEES.payees[payee_id]
+        _set(self, "account", account)
+        _set(self, "category", category)
+        _set(self, "payment_date", payment_date)
+        _set(self, "payee", payee)
+        _set(self, "payee_id", payee_id)
+        _set(self, "amount", amount)
+        _set(self, "pence", maybe_to_pence(amount))
+        identity_key = (account, payment_date, payee_id, amount)
+        _set(self, "identity_key", identity_key)
+        _set(self, "_hash", hash((account, category, payment_date, payee, amount)))
+
+    @staticmethod
+    def trusted(
+            account: BankAccount,
+            category: PayeeCategory,
+            payment_date: Day,
+            payee: str,
+            amount: Decimal,
+    ) -> 'Transaction':
+        transaction = object.__new__(Transaction)
+        transaction._init(account, category, payment_date, payee, amount)
+        return transaction
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"Transaction is immutable, can't set {key}")
+
+    def __reduce__(self):
+        # Pickles the payee id, along with PAYEES, which is written once per pickle and unpickles to a map from
+        # these ids to those of the unpickling process
+        return Transaction._unpickled, (self.account, self.category, self.payment_date, PAYEES, self.payee_id,
+                                        self.amount)
+
+    @staticmethod
+    def _unpickled(account, category, payment_date, payee_ids: List[int], payee_id: int, amount) -> 'Transaction':
+        return Transaction.trusted(account, category, payment_date, PAYEES.payees[payee_ids[payee_id]], amount)
 
     def __eq__(self, other):
-        return self.__dict__ == other.__dict__
+        if not isinstance(other, Transaction):
+            return NotImplemented
+        return self._hash == other._hash and self.identity_key == other.identity_key \
+            and self.category == other.category
 
     def __str__(self):
         return f"{self.account.id}: {self.category} {self.payment_date}, {self.payee}, {self.amount}"
 
     def __hash__(self):
-        return hash((self.account, self.category, self.payment_date, self.payee, self.amount))
+        return self._hash
+
+    @property
+    def lower_payee(self) -> str:
+        return PAYEES.lowers[self.payee_id]
+
+    @property
+    def normalised_payee(self) -> str:
+        return PAYEES.normalised[self.payee_id]
 
     def same_except_for_category(self, rhs: 'Transaction'):
-        return self.clone(category= PayeeCategory.UNCATEGORISED) == rhs.clone(category= PayeeCategory.UNCATEGORISED)
+        return self.identity_key == rhs.identity_key
 
     def clone(
             self,
@@ -51,4 +118,3 @@ class Transaction:
             payee=payee or self.payee,
             amount=amount or self.amount,
         )
-
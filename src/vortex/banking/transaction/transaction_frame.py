@@ -0,0 +1,142 @@
+from decimal import Decimal
+from typing import List, Optional, Union
+
+import numpy as np
+
+from vortex.banking.account.bank_account import BankAccount
+from vortex.banking.category.payee_categories import PayeeCategory, CATEGORIES, CATEGORY_CODES, CategoryMask
+from vortex.banking.transaction.payee_dictionary import PAYEES
+from vortex.banking.transaction.transaction import Transaction
+from vortex.date_range import DateRange
+from vortex.utils.money import from_pence
+
+__all__ = ["TransactionFrame"]
+
+class TransactionFrame:
+    """
+    Columnar copy of a list of transactions, for filtering and totalling with numpy rather than
+    one transaction at a time.
+
+    Dates are day ordinals, amounts whole pence, accounts and categories small integer codes, and payees their
+    ids in PAYEES.
+    If any amount is not a whole number of pence `pence` is None and totals fall back to summing decimals
+    """
+
+    def __init__(
+            self,
+            transactions: List[Transaction],
+            ordinals: np.ndarray,
+            pence: Optional[np.ndarray],
+            exponents: np.ndarray,
+            account_codes: np.ndarray,
+            category_codes: np.ndarray,
+            payee_codes: np.ndarray,
+            accounts: List[BankAccount],
+            payees: List[str],
+    ):
+        self.transactions: List[Transaction] = transactions
+        self.ordinals: np.ndarray = ordinals
+        self.pence: Optional[np.ndarray] = pence
+        self.exponents: np.ndarray = exponents
+        self.account_codes: np.ndarray = account_codes
+        self.category_codes: np.ndarray = category_codes
+        self.payee_codes: np.ndarray = payee_codes
+        self.accounts: List[BankAccount] = accounts
+        self.payees: List[str] = payees
+        self._date_order: Optional[np.ndarray] = None
+        self._sorted_ordinals: Optional[np.ndarray] = None
+
+    @staticmethod
+    def from_transactions(transactions: List[Transaction]) -> 'TransactionFrame':
+        account_codes = {}
+        pence = []
+        exponents = []
+        for t in transactions:
+            exponents.append(t.amount.as_tuple().exponent)
+            if pence is not None:
+                p = t.pence
+                if p is not None:
+                    pence.append(p)
+                else:
+                    pence = None
+        return TransactionFrame(
+            transactions,
+            ordinals=np.array([t.payment_date.ordinal for t in transactions], dtype=np.int32),
+            pence=None if pence is None else np.array(pence, dtype=np.int64),
+            exponents=np.array([e if isinstance(e, int) else 0 for e in exponents], dtype=np.int32),
+            account_codes=np.array(
+                [account_codes.setdefault(t.account, len(account_codes)) for t in transactions], dtype=np.int8
+            ),
+            category_codes=np.array([CATEGORY_CODES[t.category] for t in transactions], dtype=np.int16),
+            payee_codes=np.array([t.payee_id for t in transactions], dtype=np.int32),
+            accounts=list(account_codes.keys()),
+            payees=PAYEES.payees,
+        )
+
+    def __len__(self):
+        return len(self.transactions)
+
+    def take(self, indices: np.ndarray) -> 'TransactionFrame':
+        """The frame of the transactions at `indices`, in that order. Account and payee codes are unchanged"""
+        return TransactionFrame(
+            [self.transactions[i] for i in indices.tolist()],
+            ordinals=self.ordinals[indices],
+            pence=None if self.pence is None else self.pence[indices],
+            exponents=self.exponents[indices],
+            account_codes=self.account_codes[indices],
+            category_codes=self.category_codes[indices],
+            payee_codes=self.payee_codes[indices],
+            accounts=self.accounts,
+            payees=self.payees,
+        )
+
+    def category_mask(self, categories: Union[List[PayeeCategory], CategoryMask]) -> np.ndarray:
+        if not isinstance(categories, CategoryMask):
+            categories = CategoryMask(categories)
+        return categories.select(self.category_codes)
+
+    def _date_index(self) -> tuple[Optional[np.ndarray], np.ndarray]:
+        # Positions of the transactions in date order (None if already in date order) and their sorted ordinals
+        if self._sorted_ordinals is None:
+            if np.all(self.ordinals[1:] >= self.ordinals[:-1]):
+                self._sorted_ordinals = self.ordinals
+            else:
+                self._date_order = np.argsort(self.ordinals, kind="stable")
+                self._sorted_ordinals = self.ordinals[self._date_order]
+        return self._date_order, self._sorted_ordinals
+
+    def periods_indices(self, periods: List[DateRange]) -> List[np.ndarray]:
+        """
+        For each period, the positions of the transactions within it, in their original order. Found by bisecting
+        the date index, so each period costs a slice rather than a pass over all transactions
+        """
+        date_order, sorted_ordinals = self._date_index()
+        firsts = np.searchsorted(
+            sorted_ordinals, [p.first_day.ordinal for p in periods], side="left"
+        ).tolist()
+        lasts = np.searchsorted(
+            sorted_ordinals, [p.last_day.ordinal for p in periods], side="right"
+        ).tolist()
+        if date_order is None:
+            return [np.arange(i, max(i, j)) for i, j in zip(firsts, lasts)]
+        return [np.sort(date_order[i:j]) for i, j in zip(firsts, lasts)]
+
+    @property
+    def categories(self) -> List[PayeeCategory]:
+        return [CATEGORIES[code] for code in np.unique(self.category_codes).tolist()]
+
+    def total(self, mask: Optional[np.ndarray] = None) -> Decimal:
+        """
+        Sum of amounts, of those selected by `mask` if given. The same decimal, exponent included, as adding the
+        amounts to Decimal(0) one at a time
+        """
+        if self.pence is None:
+            indices = range(len(self)) if mask is None else np.flatnonzero(mask).tolist()
+            total = Decimal(0)
+            for i in indices:
+                total += self.transactions[i].amount
+            return total
+        pence = self.pence if mask is None else self.pence[mask]
+        exponents = self.exponents if mask is None else self.exponents[mask]
+        exponent = min(0, int(exponents.min())) if len(exponents) > 0 else 0
+        return from_pence(int(pence.sum())).quantize(Decimal(1).scaleb(exponent))
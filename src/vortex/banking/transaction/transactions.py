@@ -1,8 +1,11 @@
 from decimal import Decimal
-from typing import List
+from typing import Iterable, List, Optional
+
+import numpy as np
 
 from vortex.banking.category.payee_categories import PayeeCategory
 from vortex.banking.transaction.transaction import Transaction
+from vortex.banking.transaction.transaction_frame import TransactionFrame
 from vortex.date_range import DateRange
 from vortex.utils import checked_list_type, checked_type
 
@@ -10,6 +13,34 @@ from vortex.utils import checked_list_type, checked_type
 class Transactions:
     def __init__(self, transactions: List[Transaction]):
         self.transactions: List[Transaction] = checked_list_type(transactions, Transaction)
+        self._frame: Optional[TransactionFrame] = None
+
+    @staticmethod
+    def _from_frame(frame: TransactionFrame) -> 'Transactions':
+        transactions = Transactions([])
+        transactions.transactions = frame.transactions
+        transactions._frame = frame
+        return transactions
+
+    @property
+    def frame(self) -> TransactionFrame:
+        """Columnar form of these transactions, built on first use"""
+        if self._frame is None or self._frame.transactions is not self.transactions:
+            self._frame = TransactionFrame.from_transactions(self.transactions)
+        return self._frame
+
+    def _restrict(self, mask: np.ndarray) -> 'Transactions':
+        return Transactions._from_frame(self.frame.take(np.flatnonzero(mask)))
+
+    def __getstate__(self):
+        # The frame is cheap to rebuild, so is left out of shelves
+        state = self.__dict__.copy()
+        state["_frame"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault("_frame", None)
 
     def __eq__(self, other):
         if not isinstance(other, Transactions):
@@ -27,38 +58,52 @@ class Transactions:
         return self.num_transactions == 0
 
     def restrict_to_category(self, category: PayeeCategory) -> 'Transactions':
-        return Transactions([t for t in self.transactions if t.category == category])
+        return self._restrict(self.frame.category_mask([category]))
 
     def restrict_to_categories(self, categories: List[PayeeCategory]) -> 'Transactions':
-        return Transactions([t for t in self.transactions if t.category in categories])
+        return self._restrict(self.frame.category_mask(categories))
 
     def restrict_to_period(self, period: DateRange) -> 'Transactions':
-        return Transactions([t for t in self.transactions if period.contains(t.payment_date)])
+        return self.split_by_periods([period])[0]
+
+    def split_by_periods(self, periods: List[DateRange]) -> List['Transactions']:
+        """The transactions in each of `periods`, the same as `restrict_to_period` on each in turn"""
+        return [Transactions._from_frame(self.frame.take(indices)) for indices in self.frame.periods_indices(periods)]
 
     @property
     def categories(self) -> List[PayeeCategory]:
-        return sorted(list(set([t.category for t in self.transactions])),
+        return sorted(self.frame.categories,
                       key=lambda c: "ZZZZ" if c is PayeeCategory.UNCATEGORISED else c.name)
 
     def __add__(self, other: 'Transactions') -> 'Transactions':
-        checked_type(other, Transactions)
-        trans_set = set(self.transactions)
-        other_trans_set = set(other.transactions)
-        for t in trans_set:
-            assert t not in other_trans_set, f"Duplicate transaction {t}"
-        for t in other_trans_set:
-            assert t not in trans_set, f"Duplicate transaction {t}"
-
-        return Transactions(self.transactions + other.transactions)
+        return Transactions.concat([self, checked_type(other, Transactions)])
+
+    @staticmethod
+    def concat(parts: Iterable['Transactions']) -> 'Transactions':
+        """
+        All the transactions of `parts`, in order. Raises a ValueError listing every transaction that appears
+        in more than one part - repeats within a single part are allowed
+        """
+        part_containing = {}
+        duplicates = {}
+        transactions = []
+        for i_part, part in enumerate(parts):
+            checked_type(part, Transactions)
+            for t in part.transactions:
+                if part_containing.setdefault(t, i_part) != i_part:
+                    duplicates[t] = None
+            transactions += part.transactions
+        if len(duplicates) > 0:
+            raise ValueError(
+                f"{len(duplicates)} duplicate transactions\n" + "\n".join(str(t) for t in duplicates)
+            )
+        return Transactions(transactions)
 
     @property
     def total_amount(self) -> Decimal:
-        total = Decimal(0)
-        for t in self.transactions:
-            total += t.amount
-        return total
+        return self.frame.total()
 
     def total_for(self, *categories):
-        return sum(self.restrict_to_category(c).total_amount for c in categories)
+        return sum(self.frame.total(self.frame.category_mask([c])) for c in categories)
 
 
@@ -14,6 +14,8 @@ class SplitType(Enum):
     INNER = 2
 
 class DateRange(ABC):
+    __slots__ = ()
+
     @property
     @abstractmethod
     def first_day(self) -> "Day":
@@ -70,6 +72,8 @@ class DateRange(ABC):
 
 
 class ContiguousDateRange(DateRange, ABC):
+    __slots__ = ()
+
     @abstractmethod
     def __add__(self, n) -> "ContiguousDateRange":
         raise NotImplementedError()
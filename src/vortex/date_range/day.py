@@ -1,7 +1,7 @@
-from datetime import date, timedelta, datetime
-from functools import total_ordering
+from datetime import date, datetime
+from typing import Optional
 
-from vortex.date_range import parse_date
+from vortex.date_range import parse_date, DateParser
 from vortex.date_range.date_range import ContiguousDateRange
 
 __all__ = ["Day"]
@@ -9,18 +9,58 @@ __all__ = ["Day"]
 from vortex.utils import checked_type
 
 
-@total_ordering
 class Day(ContiguousDateRange):
-    def __init__(self, y: int, m: int, d: int):
-        self.y: int = checked_type(y, int)
-        self.m: int = checked_type(m, int)
-        self.d: int = checked_type(d, int)
-        self.date: date = date(y, m, d)
+    """
+    A calendar day, held as its proleptic Gregorian ordinal.
+
+    Days are interned - constructing the same day twice returns the same instance - so they are cheap to
+    create, compare and hash, and pickle as just the ordinal
+    """
+    __slots__ = ("ordinal", "y", "m", "d")
+
+    _BY_YMD: dict[tuple[int, int, int], 'Day'] = {}
+    _BY_ORDINAL: dict[int, 'Day'] = {}
+
+    def __new__(cls, y: int, m: int, d: int):
+        # Only look up exact ints, so that the type checks don't depend on whether the day is already interned
+        day = Day._BY_YMD.get((y, m, d)) if type(y) is int and type(m) is int and type(d) is int else None
+        if day is None:
+            checked_type(y, int)
+            checked_type(m, int)
+            checked_type(d, int)
+            day = Day._intern(date(y, m, d).toordinal(), y, m, d)
+        return day
 
+    @staticmethod
+    def _intern(ordinal: int, y: int, m: int, d: int) -> 'Day':
+        day = object.__new__(Day)
+        day.ordinal = ordinal
+        day.y = y
+        day.m = m
+        day.d = d
+        Day._BY_YMD[(y, m, d)] = day
+        Day._BY_ORDINAL[ordinal] = day
+        return day
+
+    @staticmethod
+    def from_ordinal(ordinal: int) -> 'Day':
+        day = Day._BY_ORDINAL.get(ordinal)
+        if day is None:
+            as_date = date.fromordinal(ordinal)
+            day = Day._intern(int(ordinal), as_date.year, as_date.month, as_date.day)
+        return day
+
+    def __reduce__(self):
+        return Day.from_ordinal, (self.ordinal,)
+
+    @property
+    def date(self) -> date:
+        return date(self.y, self.m, self.d)
 
     @property
     def weekday(self) -> int:
-        return self.date.weekday()
+        # Ordinal 1, 1 Jan 0001, was a Monday
+        return (self.ordinal + 6) % 7
 
     @property
     def first_day(self) -> 'Day':
@@ -28,7 +68,7 @@ class Day(ContiguousDateRange):
 
     @property
     def iso_repr(self) -> str:
-        return self.date.isoformat()
+        return f"{self.y:04d}-{self.m:02d}-{self.d:02d}"
 
     def __str__(self):
         return self.iso_repr
@@ -37,20 +77,29 @@ class Day(ContiguousDateRange):
         return str(self)
 
     def __hash__(self):
-        return hash(self.date)
+        return hash(self.ordinal)
 
     @property
     def last_day(self) -> 'Day':
         return self
 
     def __eq__(self, other: 'Day') -> bool:
-        return isinstance(other, Day) and self.date == other.date
+        return self is other or (isinstance(other, Day) and self.ordinal == other.ordinal)
 
     def __lt__(self, other: 'Day') -> bool:
-        return self.date < other.date
+        return self.ordinal < other.ordinal
+
+    def __le__(self, other: 'Day') -> bool:
+        return self.ordinal <= other.ordinal
+
+    def __gt__(self, other: 'Day') -> bool:
+        return self.ordinal > other.ordinal
+
+    def __ge__(self, other: 'Day') -> bool:
+        return self.ordinal >= other.ordinal
 
     def __add__(self, n) -> 'Day':
-        return Day.from_date(self.date + timedelta(n))
+        return Day.from_ordinal(self.ordinal + n)
 
     @staticmethod
     def from_date(d: date) -> 'Day':
@@ -61,11 +110,17 @@ class Day(ContiguousDateRange):
         return Day(d.year, d.month, d.day)
 
     def days_since(self, rhs: 'Day') -> int:
-        return (self.date - rhs.date).days
+        return self.ordinal - rhs.ordinal
+
+    @staticmethod
+    def parse(text, parser: Optional[DateParser] = None) -> 'Day':
+        if parser is None:
+            return Day.from_date(parse_date(text))
+        return Day.from_date(parser.parse(text))
 
     @staticmethod
-    def parse(text) -> 'Day':
-        return Day.from_date(parse_date(text))
+    def containing(day: 'Day') -> 'Day':
+        return day
 
     @staticmethod
     def today() -> 'Day':
@@ -78,4 +133,4 @@ class Day(ContiguousDateRange):
 
     @property
     def excel_format(self) -> str:
-        return date(self.y, self.m, self.d).strftime("%d-%b-%Y")
+        return self.date.strftime("%d-%b-%Y")
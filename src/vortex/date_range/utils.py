@@ -1,24 +1,102 @@
-from datetime import datetime
+from datetime import datetime, date
+from typing import Iterable, List, Optional
+
+__all__ = ["parse_date", "DateParser", "DATE_FORMATS"]
+
+DATE_FORMATS = [
+    "%d %b %Y",
+    "%Y-%m-%d",
+    "%d-%b-%y",
+    "%d-%b-%Y",
+    "%d-%m-%y",
+    "%d-%m-%Y",
+    "%d %m %Y",
+    "%d/%m/%Y",
+    "%d %b %y",
+    "%Y-%b-%d",
+    "%Y%m%d",
+]
+
+
+def _parse_digits(text: str, day_start: int, month_start: int, year_start: int) -> Optional[date]:
+    # Slicing parser for fixed width numeric dates, None if `text` isn't one
+    y, m, d = text[year_start:year_start + 4], text[month_start:month_start + 2], text[day_start:day_start + 2]
+    if not (text.isascii() and y.isdigit() and m.isdigit() and d.isdigit()):
+        return None
+    try:
+        return date(int(y), int(m), int(d))
+    except ValueError:
+        return None
+
+
+class DateParser:
+    """
+    Parses dates written in any of DATE_FORMATS.
+
+    Remembers the format of the last text it parsed and tries that first, so that a source written in a single
+    format costs one attempt per date rather than a search through the formats. ISO and dd/mm/yyyy dates are
+    sliced rather than going through strptime, and the results for repeated texts are memoised.
+
+    The formats can't match the same text, so the result is the same whichever order they are tried in
+    """
+    MAX_MEMO_SIZE = 100 * 1000
+
+    def __init__(self):
+        self._format: Optional[str] = None
+        self._memo: dict[str, date] = {}
+
+    def parse(self, text: str) -> date:
+        parsed = self._memo.get(text)
+        if parsed is None:
+            parsed = self._parse(text.strip())
+            if len(self._memo) >= self.MAX_MEMO_SIZE:
+                self._memo.clear()
+            self._memo[text] = parsed
+        return parsed
+
+    def parse_all(self, texts: Iterable[str], strict: bool = True) -> List[Optional[date]]:
+        """
+        The date for each of `texts`, parsing each distinct text once. Unless `strict`, texts that aren't dates
+        give None rather than raising a ValueError
+        """
+        texts = list(texts)
+        parsed = {}
+        for text in dict.fromkeys(texts):
+            try:
+                parsed[text] = self.parse(text)
+            except ValueError:
+                if strict:
+                    raise
+                parsed[text] = None
+        return [parsed[text] for text in texts]
+
+    def _parse(self, text: str) -> date:
+        if len(text) == 10:
+            if text[4] == "-" and text[7] == "-":
+                parsed = _parse_digits(text, day_start=8, month_start=5, year_start=0)
+            elif text[2] == "/" and text[5] == "/":
+                parsed = _parse_digits(text, day_start=0, month_start=3, year_start=6)
+            else:
+                parsed = None
+            if parsed is not None:
+                return parsed
+        if self._format is not None:
+            try:
+                return datetime.strptime(text, self._format).date()
+            except ValueError:
+                pass
+        for fmt in DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(text, fmt).date()
+                self._format = fmt
+                return parsed
+            except ValueError:
+                pass
+        raise ValueError(f"Can't parse '{text}' as date")
+
+
+_DEFAULT_PARSER = DateParser()
 
-__all__ = ["parse_date"]
 
 def parse_date(text):
-    formats = [
-        "%d %b %Y",
-        "%Y-%m-%d",
-        "%d-%b-%y",
-        "%d-%b-%Y",
-        "%d-%m-%y",
-        "%d-%m-%Y",
-        "%d %m %Y",
-        "%d/%m/%Y",
-        "%d %b %y",
-        "%Y-%b-%d",
-        "%Y%m%d",
-    ]
-    for fmt in formats:
-        try:
-            return datetime.strptime(text.strip(), fmt).date()
-        except ValueError:
-            pass
-    raise ValueError(f"Can't parse '{text}' as date")
+    return _DEFAULT_PARSER.parse(text)
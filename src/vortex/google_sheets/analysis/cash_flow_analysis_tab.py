@@ -5,7 +5,7 @@ from typing import List
 from vortex.airtable_db.gigs_info import GigsInfo
 from vortex.banking import BankActivity
 from vortex.banking.category.payee_categories import PayeeCategory
-from vortex.banking.transaction.transactions import Transactions
+from vortex.banking.transaction.category_cube import CategoryCube
 from vortex.date_range import DateRange, ContiguousDateRange
 from vortex.date_range.date_range import SplitType
 from vortex.date_range.month import Month
@@ -21,8 +21,8 @@ class AnalysisColumn:
         self.name: str = checked_type(name, str)
         self.categories: list[PayeeCategory] = checked_list_type(categories, PayeeCategory)
 
-    def value(self, transactions: Transactions) -> Decimal:
-        return transactions.restrict_to_categories(self.categories).total_amount
+    def value(self, cube: CategoryCube, period: DateRange) -> Decimal:
+        return cube.total(period, self.categories)
 
     def __eq__(self, other):
         return isinstance(other, AnalysisColumn) and self.name == other.name and self.categories == other.categories
@@ -35,10 +35,10 @@ class AnalysisColumn:
 class CashFlowAnalysisRange(TabRange, ABC):
     def __init__(self,
                  top_left_cell: TabCell,
-                 transactions: Transactions,
+                 cube: CategoryCube,
                  periods: list[DateRange]
                  ):
-        self.transactions: Transactions = checked_type(transactions, Transactions)
+        self.cube: CategoryCube = checked_type(cube, CategoryCube)
         self.periods: List[DateRange] = checked_list_type(periods, DateRange)
         super().__init__(
             top_left_cell,
@@ -71,14 +71,13 @@ class CashFlowAnalysisRange(TabRange, ABC):
                 raise ValueError(f"duplicated category {k} in {self.name}")
         return categories
 
-    def value_for_period(self, period: DateRange, period_transactions: Transactions, column: AnalysisColumn) -> Decimal:
-        return column.value(period_transactions)
+    def value_for_period(self, period: DateRange, column: AnalysisColumn) -> Decimal:
+        return column.value(self.cube, period)
 
     @property
     def values(self) -> RangesAndValues:
         def row_for_period(i_period: int, period: DateRange):
-            period_transactions = self.transactions.restrict_to_period(period)
-            values = [self.value_for_period(period, period_transactions, col) for col in self.columns]
+            values = [self.value_for_period(period, col) for col in self.columns]
             total_formula = f"=SUM({self[i_period + 1, 1:len(self.headings)].in_a1_notation})"
             return [total_formula] + values
 
@@ -104,12 +103,12 @@ class CashFlowAnalysisRange(TabRange, ABC):
 class IrregularCostsRange(CashFlowAnalysisRange):
 
     def __init__(self, top_left_cell: TabCell,
-                 transactions: Transactions,
+                 cube: CategoryCube,
                  periods: List[DateRange]
                  ):
         super().__init__(
             top_left_cell,
-            transactions,
+            cube,
             periods
         )
 
@@ -135,12 +134,12 @@ class RegularCostsRange(CashFlowAnalysisRange):
     #             "Utilities", "Maintenance", "Operational", "Petty Cash", "Other"]
 
     def __init__(self, top_left_cell: TabCell,
-                 transactions: Transactions,
+                 cube: CategoryCube,
                  periods: List[DateRange]
                  ):
         super().__init__(
             top_left_cell,
-            transactions,
+            cube,
             periods
         )
 
@@ -201,13 +200,13 @@ class DrinksRange(CashFlowAnalysisRange):
     DRINKS_SALES = "Drinks Sales"
 
     def __init__(self, top_left_cell: TabCell,
-                 transactions: Transactions,
+                 cube: CategoryCube,
                  gigs_info: GigsInfo,
                  periods: List[DateRange]
                  ):
         super().__init__(
             top_left_cell,
-            transactions,
+            cube,
             periods
         )
         self.gigs_info: GigsInfo = checked_type(gigs_info, GigsInfo)
@@ -228,24 +227,24 @@ class DrinksRange(CashFlowAnalysisRange):
             AnalysisColumn.from_category(PayeeCategory.VAT),
         ]
 
-    def value_for_period(self, period: DateRange, period_transactions: Transactions, column: AnalysisColumn) -> Decimal:
+    def value_for_period(self, period: DateRange, column: AnalysisColumn) -> Decimal:
         if column.name == self.DRINKS_SALES:
             period_gigs = self.gigs_info.restrict_to_period(period)
             walk_in_sales = period_gigs.total_walk_in_sales
-            sales = column.value(period_transactions) - Decimal(walk_in_sales)
+            sales = column.value(self.cube, period) - Decimal(walk_in_sales)
             return sales
-        return column.value(period_transactions)
+        return column.value(self.cube, period)
 
 
 class GigCostsRange(CashFlowAnalysisRange):
 
     def __init__(self, top_left_cell: TabCell,
-                 transactions: Transactions,
+                 cube: CategoryCube,
                  periods: List[DateRange]
                  ):
         super().__init__(
             top_left_cell,
-            transactions,
+            cube,
             periods
         )
 
@@ -274,13 +273,13 @@ class TicketSalesRange(CashFlowAnalysisRange):
     WALK_IN = "Walk-in"
 
     def __init__(self, top_left_cell: TabCell,
-                 transactions: Transactions,
+                 cube: CategoryCube,
                  gigs_info: GigsInfo,
                  periods: List[DateRange]
                  ):
         super().__init__(
             top_left_cell,
-            transactions,
+            cube,
             periods
         )
         self.gigs_info: GigsInfo = checked_type(gigs_info, GigsInfo)
@@ -297,23 +296,23 @@ class TicketSalesRange(CashFlowAnalysisRange):
             AnalysisColumn.from_category(PayeeCategory.MUSIC_VENUE_TRUST),
         ]
 
-    def value_for_period(self, period: DateRange, period_transactions: Transactions, column: AnalysisColumn) -> Decimal:
+    def value_for_period(self, period: DateRange, column: AnalysisColumn) -> Decimal:
         if column.name == self.WALK_IN:
             month_gigs = self.gigs_info.restrict_to_period(period)
             walk_in_sales = month_gigs.total_walk_in_sales
             return Decimal(walk_in_sales)
-        return column.value(period_transactions)
+        return column.value(self.cube, period)
 
 
 class OtherIncomeRange(CashFlowAnalysisRange):
 
     def __init__(self, top_left_cell: TabCell,
-                 transactions: Transactions,
+                 cube: CategoryCube,
                  periods: List[DateRange]
                  ):
         super().__init__(
             top_left_cell,
-            transactions,
+            cube,
             periods
         )
 
@@ -421,12 +420,12 @@ class SummaryHeadingsRange(TabRange):
 
 class GigPnLRange(TabRange):
     def __init__(self, top_left_cell: TabCell,
-                 transactions: Transactions,
+                 cube: CategoryCube,
                  gigs_info: GigsInfo,
                  periods: List[DateRange]
                  ):
-        self.gig_income_range = TicketSalesRange(top_left_cell.offset(num_cols=1), transactions, gigs_info, periods)
-        self.gig_costs_range = GigCostsRange(self.gig_income_range.top_right_cell.offset(num_cols=1), transactions,
+        self.gig_income_range = TicketSalesRange(top_left_cell.offset(num_cols=1), cube, gigs_info, periods)
+        self.gig_costs_range = GigCostsRange(self.gig_income_range.top_right_cell.offset(num_cols=1), cube,
                                              periods)
         super().__init__(
             top_left_cell,
@@ -478,13 +477,18 @@ class PnLRange(TabRange):
 
     @property
     def values(self) -> RangesAndValues:
+        initial_balances = BankActivity.total_across_accounts(
+            self.bank_activity.period_balances(self.periods, opening=True)
+        )
+        terminal_balances = BankActivity.total_across_accounts(
+            self.bank_activity.period_balances(self.periods, opening=False)
+        )
+
         def row_values(i_row):
             terms = [f"{r[i_row, 0].in_a1_notation}" for r in self.ranges]
             sum_value = "=" + "+".join(terms)
-            period = self.periods[i_row - 1]
-            activity = self.bank_activity.restrict_to_period(period)
-            initial_pnl = activity.initial_balance_across_accounts
-            terminal_pnl = activity.terminal_balance_across_accounts
+            initial_pnl = initial_balances[i_row - 1]
+            terminal_pnl = terminal_balances[i_row - 1]
             pnl_change = terminal_pnl - initial_pnl
             return [sum_value, terminal_pnl, pnl_change]
 
@@ -564,21 +568,21 @@ class CashFlowAnalysisTab(Tab):
         self.periods: List[ContiguousDateRange] = checked_list_type(periods, ContiguousDateRange)
 
     def update(self,
-               transactions: Transactions,
+               cube: CategoryCube,
                gigs_info: GigsInfo,
                bank_activity: BankActivity
                ):
         month_headings_range = PeriodHeadingsRange(self.cell("B3"), self.periods)
         summary_headings_range = SummaryHeadingsRange(month_headings_range.bottom_left_cell.offset(num_rows=2))
-        gig_pnl_range = GigPnLRange(month_headings_range.top_right_cell.offset(num_cols=1), transactions, gigs_info, self.periods)
-        other_income_range = OtherIncomeRange(gig_pnl_range.top_right_cell.offset(num_cols=1), transactions,
+        gig_pnl_range = GigPnLRange(month_headings_range.top_right_cell.offset(num_cols=1), cube, gigs_info, self.periods)
+        other_income_range = OtherIncomeRange(gig_pnl_range.top_right_cell.offset(num_cols=1), cube,
                                               self.periods)
-        drinks_range = DrinksRange(other_income_range.top_right_cell.offset(num_cols=1), transactions, gigs_info,
+        drinks_range = DrinksRange(other_income_range.top_right_cell.offset(num_cols=1), cube, gigs_info,
                                    self.periods)
-        regular_costs_range = RegularCostsRange(drinks_range.top_right_cell.offset(num_cols=1), transactions,
+        regular_costs_range = RegularCostsRange(drinks_range.top_right_cell.offset(num_cols=1), cube,
                                                 self.periods)
         irregular_costs_range = IrregularCostsRange(regular_costs_range.top_right_cell.offset(num_cols=1),
-                                                    transactions,
+                                                    cube,
                                                     self.periods)
         value_ranges = [gig_pnl_range, other_income_range, drinks_range,
                         regular_costs_range,
@@ -158,10 +158,9 @@ class BankTicketSalesRange(MonthAnalysisRange):
             gigs_info: GigsInfo,
     ):
         super().__init__(top_left_cell, period, gigs_info)
-        self.transactions_by_month: dict[Month, Transactions] = {
-            month: transactions.restrict_to_period(month)
-            for month in self.months
-        }
+        self.transactions_by_month: dict[Month, Transactions] = dict(
+            zip(self.months, transactions.split_by_periods(self.months))
+        )
 
     @property
     def title(self) -> str:
@@ -202,10 +201,9 @@ class BankDrinkSalesRange(MonthAnalysisRange):
             gigs_info: GigsInfo,
     ):
         super().__init__(top_left_cell, period, gigs_info)
-        self.transactions_by_month: dict[Month, Transactions] = {
-            month: transactions.restrict_to_period(month)
-            for month in self.months
-        }
+        self.transactions_by_month: dict[Month, Transactions] = dict(
+            zip(self.months, transactions.split_by_periods(self.months))
+        )
 
     @property
     def title(self) -> str:
@@ -268,10 +266,9 @@ class BankDrinkSalesPerCustomerRange(MonthAnalysisRange):
             gigs_info: GigsInfo,
     ):
         super().__init__(top_left_cell, period, gigs_info)
-        self.transactions_by_month: dict[Month, Transactions] = {
-            month: transactions.restrict_to_period(month)
-            for month in self.months
-        }
+        self.transactions_by_month: dict[Month, Transactions] = dict(
+            zip(self.months, transactions.split_by_periods(self.months))
+        )
 
     def format_requests(self):
         return super().format_requests() + [
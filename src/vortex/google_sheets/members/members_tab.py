@@ -1,12 +1,13 @@
 from typing import List
 
 from vortex.data_objects.member import Member
-from vortex.date_range import Day
+from vortex.date_range import Day, DateParser
 from vortex.google_sheets import Tab, Workbook
 from vortex.google_sheets.colors import LIGHT_YELLOW, LIGHT_GREEN
 from vortex.google_sheets.tab_range import TabRange
 from vortex.myopt.nothing import Nothing
 from vortex.myopt.opt import Opt
+from vortex.utils import validation_boundary
 
 
 class MembersTab(Tab):
@@ -57,21 +58,31 @@ class MembersTab(Tab):
         member_range = TabRange(self.heading_range.top_left_cell, num_rows=1 + len(members), num_cols=6)
         self.workbook.batch_update_values([(member_range, values)])
 
+    @validation_boundary()
     def members_from_tab(self) -> List[Member]:
         def to_opt(cell_value):
             if cell_value == "":
                 return Nothing()
             return Opt.of(cell_value)
 
+        def cell(row, i_col):
+            return row[i_col] if len(row) > i_col else ""
+
         members = []
         values = self.read_values_for_columns(self.heading_range.columns_in_a1_notation)
-        for row in values[1:]:
+        rows = values[1:]
+        date_parser = DateParser()
+        start_dates = date_parser.parse_all([cell(row, 0) for row in rows], strict=False)
+        expiration_dates = date_parser.parse_all([cell(row, 4) for row in rows], strict=False)
+        for row, start_date, expiration_date in zip(rows, start_dates, expiration_dates):
             try:
-                start_date = Day.parse(row[0])
+                if start_date is None or (row[4] != "" and expiration_date is None):
+                    raise ValueError(f"Can't parse dates in {row}")
+                start_date = Day.from_date(start_date)
                 name = row[1]
                 email = to_opt(row[2])
                 membership_type = row[3]
-                expiration = to_opt(row[4]).map(Day.parse)
+                expiration = to_opt(row[4]).map(lambda _: Day.from_date(expiration_date))
                 cancelled = row[5]
                 members.append(Member(
                     name,
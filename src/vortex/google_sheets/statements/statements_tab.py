@@ -7,9 +7,9 @@ from vortex.banking import BankActivity
 from vortex.banking.transaction.transaction import Transaction
 from vortex.banking.transaction.transactions import Transactions
 from vortex.banking.account.bank_account import CURRENT_ACCOUNT, SAVINGS_ACCOUNT, CHARITABLE_ACCOUNT, BBL_ACCOUNT, BankAccount
-from vortex.banking.category.categorize import category_for_transaction
+from vortex.banking.category.categorize import categorize_many, category_memo
 from vortex.banking.category.payee_categories import PayeeCategory
-from vortex.date_range import Day, DateRange
+from vortex.date_range import Day, DateRange, DateParser
 from vortex.date_range.accounting_month import AccountingMonth
 from env import BANK_TRANSACTIONS_2025_ID, BANK_TRANSACTIONS_2024_ID, \
     BANK_TRANSACTIONS_2023_ID, BANK_TRANSACTIONS_2022_ID, BANK_TRANSACTIONS_2021_ID, \
@@ -17,6 +17,8 @@ from env import BANK_TRANSACTIONS_2025_ID, BANK_TRANSACTIONS_2024_ID, \
 from vortex.google_sheets import Tab, Workbook
 from vortex.google_sheets.colors import LIGHT_GREEN, LIGHT_YELLOW
 from vortex.google_sheets.tab_range import TabRange
+from vortex.utils import validation_boundary
+from vortex.utils.collection_utils import group_into_dict
 
 SHELF = Path(__file__).parent / "_categorised_transactions.shelf"
 
@@ -152,6 +154,9 @@ class StatementsTab(Tab):
         )
 
         transaction_values: List[List[Any]] = [self.HEADINGS]
+        tab_transactions_by_key = group_into_dict(tab_categorised_transactions, lambda t: t.identity_key)
+
+        rule_categories = categorize_many(transactions)
 
         def category_cell_value(i_transaction, bank_transaction):
             cell_category = ""
@@ -161,11 +166,11 @@ class StatementsTab(Tab):
             #     if categorised_transaction.same_except_for_category(bank_transaction):
             #         cell_category = sheet_category
             if cell_category == "":
-                matching = [t for t in tab_categorised_transactions if t.same_except_for_category(bank_transaction)]
+                matching = tab_transactions_by_key.get(bank_transaction.identity_key, [])
                 if len(matching) == 1:
                     cell_category = matching[0].category
             if cell_category == "" or cell_category == PayeeCategory.UNCATEGORISED:
-                cell_category = category_for_transaction(bank_transaction)
+                cell_category = rule_categories[i_transaction]
             if cell_category == PayeeCategory.UNCATEGORISED:
                 return ""
             return cell_category
@@ -192,6 +197,8 @@ class StatementsTab(Tab):
                 [float(net_balance)]
             )
 
+        category_memo().save()
+
         transaction_range = TabRange(self.heading_range.top_left_cell, num_rows=1 + len(transactions),
                                      num_cols=len(self.HEADINGS))
         self.workbook.batch_update_values([
@@ -199,6 +206,7 @@ class StatementsTab(Tab):
             (transaction_range, transaction_values),
         ])
 
+    @validation_boundary()
     def transactions_from_tab(self) -> Transactions:
 
         def to_payee_category(cell_value: str) -> PayeeCategory:
@@ -215,8 +223,10 @@ class StatementsTab(Tab):
 
         trans = []
         values = self.read_values_for_columns(self.heading_range.columns_in_a1_notation)
-        for row in values[self.heading_range.i_first_row + 1:]:
-            payment_date = Day.parse(row[self.DATE])
+        rows = values[self.heading_range.i_first_row + 1:]
+        payment_dates = DateParser().parse_all(row[self.DATE] for row in rows)
+        for row, payment_date in zip(rows, payment_dates):
+            payment_date = Day.from_date(payment_date)
             payee = row[self.PAYEE]
             amount = to_decimal(row[self.AMOUNT])
             account = BankAccount.from_name(row[self.ACCOUNT])
@@ -273,10 +283,11 @@ class StatementsTab(Tab):
                 return shelf[key]
         acc_month = AccountingMonth.containing(period.first_day)
         last_acc_month = AccountingMonth.containing(period.last_day)
-        transactions = Transactions([])
+        monthly_transactions = []
         while acc_month <= last_acc_month:
-            transactions += StatementsTab.transactions_for_month(acc_month, force)
+            monthly_transactions.append(StatementsTab.transactions_for_month(acc_month, force))
             acc_month += 1
+        transactions = Transactions.concat(monthly_transactions)
         with shelve.open(str(SHELF)) as shelf:
             shelf[key] = transactions.restrict_to_period(period)
             return shelf[key]
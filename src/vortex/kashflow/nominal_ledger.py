@@ -5,14 +5,17 @@ from numbers import Number
 from pathlib import Path
 from typing import List, Optional
 
-from vortex.date_range import Day, DateRange
+from vortex.date_range import Day, DateRange, DateParser
 from vortex.date_range.accounting_year import AccountingYear
 from vortex.date_range.simple_date_range import SimpleDateRange
 from env import KASHFLOW_CSV_DIR
-from vortex.utils import checked_list_type, checked_type, checked_optional_type
+from vortex.utils import checked_list_type, checked_type, checked_optional_type, validation_boundary
 from vortex.utils.collection_utils import group_into_dict
 from vortex.utils.file_utils import read_csv_file
 from vortex.utils.logging import log_message
+from vortex.utils.money import from_pence, maybe_to_pence
+
+_set = object.__setattr__
 
 
 class NominalLedgerItemType(Enum):
@@ -115,6 +118,12 @@ class VATMatcher:
 
 
 class NominalLedgerItem:
+    """
+    Immutable. Bulk loaders whose fields are already of the right types can skip the checks with `trusted`.
+    `pence` is the amount in whole pence, None if it has fractional pence
+    """
+    __slots__ = ("code", "item_type", "date", "reference", "narrative", "amount", "pence")
+
     def __init__(
             self,
             code: int,
@@ -124,12 +133,44 @@ class NominalLedgerItem:
             narrative: str,
             amount: Decimal,
     ):
-        self.code: int = checked_type(code, int)
-        self.item_type: str = checked_type(item_type, NominalLedgerItemType)
-        self.date: Day = checked_type(date, Day)
-        self.reference: str = checked_type(reference, str)
-        self.narrative: str = checked_type(narrative, str)
-        self.amount: Decimal = checked_type(amount, Decimal)
+        self._init(
+            checked_type(code, int),
+            checked_type(item_type, NominalLedgerItemType),
+            checked_type(date, Day),
+            checked_type(reference, str),
+            checked_type(narrative, str),
+            checked_type(amount, Decimal),
+        )
+
+    def _init(self, code, item_type, date, reference, narrative, amount):
+        _set(self, "code", code)
+        _set(self, "item_type", item_type)
+        _set(self, "date", date)
+        _set(self, "reference", reference)
+        _set(self, "narrative", narrative)
+        _set(self, "amount", amount)
+        _set(self, "pence", maybe_to_pence(amount))
+
+    @staticmethod
+    def trusted(
+            code: int,
+            item_type: NominalLedgerItemType,
+            date: Day,
+            reference: str,
+            narrative: str,
+            amount: Decimal,
+    ) -> 'NominalLedgerItem':
+        item = object.__new__(NominalLedgerItem)
+        item._init(code, item_type, date, reference, narrative, amount)
+        return item
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"NominalLedgerItem is immutable, can't set {key}")
+
+    def __reduce__(self):
+        return NominalLedgerItem.trusted, (
+            self.code, self.item_type, self.date, self.reference, self.narrative, self.amount
+        )
 
     def __str__(self):
         return f"{self.date}: {self.amount}, {self.code}, {self.reference}, {self.narrative}, {self.item_type}"
@@ -149,7 +190,12 @@ class NominalLedger:
         return NominalLedger([item for item in self.ledger_items if item.item_type == item_type])
 
     def total_amount(self) -> Decimal:
-        return sum(item.amount for item in self.ledger_items)
+        """The same decimal, exponent included, as summing the items' amounts"""
+        pence = [item.pence for item in self.ledger_items]
+        if len(pence) == 0 or None in pence:
+            return sum(item.amount for item in self.ledger_items)
+        exponent = min(0, min(item.amount.as_tuple().exponent for item in self.ledger_items))
+        return from_pence(sum(pence)).quantize(Decimal(1).scaleb(exponent))
 
     def total_for(self, item_type: NominalLedgerItemType) -> Decimal:
         return self.filter_on_item_type(item_type).total_amount()
@@ -177,6 +223,7 @@ class NominalLedger:
     SHELF = Path(__file__).parent / "_nominal_ledger.shelf"
 
     @staticmethod
+    @validation_boundary()
     def _from_csv_file(file: Path) -> 'NominalLedger':
         def ignore_row(row: List[any]):
             if len(row) <= 6:
@@ -197,16 +244,16 @@ class NominalLedger:
         while len(rows[0]) == 0 or str(rows[0][0]).lower() != "code":
             rows.pop(0)
         rows.pop(0)
+        rows = [row for row in rows[:-1] if not ignore_row(row)]
+        dates = DateParser().parse_all(row[2] for row in rows)
         ledger_items = []
         i = 4
-        for row in rows[:-1]:
-            if ignore_row(row):
-                continue
+        for row, date in zip(rows, dates):
             try:
                 i += 1
                 code = int(row[0])
                 item_type = row[1].strip()
-                date = Day.parse(row[2])
+                date = Day.from_date(date)
                 reference = row[3].strip()
                 narrative = row[4].strip()
                 if row[5].strip() == "":
@@ -217,7 +264,7 @@ class NominalLedger:
                         amount = to_decimal(row[6])
                 else:
                     amount = -to_decimal(row[5])
-                ledger_items.append(NominalLedgerItem(
+                ledger_items.append(NominalLedgerItem.trusted(
                     code=code,
                     item_type=NominalLedgerItemType.from_text(item_type),
                     date=date,
@@ -2,16 +2,17 @@ from tabulate import tabulate
 
 from vortex.banking import BankActivity
 from vortex.date_range.month import Month
+from vortex.date_range.simple_date_range import SimpleDateRange
 
 
 def do_analysis(force: bool):
     bank_activity = BankActivity.build(force=force)
-    m = Month(2023, 1)
-    table = []
-    while m < Month(2026, 1):
-        net_cash = bank_activity.restrict_to_period(m).terminal_balance_across_accounts
-        table.append([f"{m.y}/{m.m:02d}", net_cash])
-        m += 1
+    period = SimpleDateRange(Month(2023, 1).first_day, Month(2025, 12).last_day)
+    balances = bank_activity.balance_series(period, granularity=Month)
+    table = [
+        [f"{m.y}/{m.m:02d}", net_cash]
+        for m, net_cash in zip(balances.index, BankActivity.total_across_accounts(balances))
+    ]
     print(tabulate(table))
 
 def explain_dec():
@@ -21,10 +21,9 @@ def write_balances(year: int, force: bool):
         ["EOD balances"] + [acc.name for acc in accounts],
         ["Date"] + [acc.id for acc in accounts],
     ]
-    for d in period.days:
-        restricted = activity.restrict_to_period(d)
-        row = [d] + [restricted.terminal_balance(acc) for acc in accounts]
-        table.append(row)
+    balances = activity.balance_series(period, accounts, granularity=Day)
+    for d, row in zip(balances.index, balances.values.tolist()):
+        table.append([d] + row)
 
     name = f"Vortex Balances {year}.csv"
     path = ACCOUNTANT_DIR / name
@@ -0,0 +1,24 @@
+from vortex.banking import BankActivity
+from vortex.banking.category.categorize import RULES
+from vortex.banking.category.rule_impact import RuleImpact, rules_at_revision
+
+
+def print_rule_impact(revision: str):
+    """Transactions whose category would change from the rules at `revision` to the current ones, by month"""
+    impact = RuleImpact(rules_at_revision(revision), RULES)
+    if not impact.has_changes:
+        print(f"No rule changes since {revision}")
+        return
+    transactions = BankActivity.build(force=False).sorted_transactions
+    changes_by_month = impact.changes_by_month(transactions)
+    for month, changes in changes_by_month.items():
+        print()
+        print(f"{month}: {len(changes)} changed")
+        for t, old_category, new_category in changes:
+            print(f"    {t.payment_date}, {t.payee}, {t.amount}: {old_category} -> {new_category}")
+    print()
+    print(f"Statement tabs to rewrite: {', '.join(str(m) for m in changes_by_month.keys()) or 'none'}")
+
+
+if __name__ == '__main__':
+    print_rule_impact("HEAD")
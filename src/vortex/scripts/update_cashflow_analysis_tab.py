@@ -1,6 +1,7 @@
 from env import CASHFLOW_ANALYSIS_ID
 from vortex.airtable_db import VortexAirtableDB
 from vortex.banking import BankActivity
+from vortex.banking.transaction.category_cube import CategoryCube
 from vortex.date_range import Day
 from vortex.date_range.date_range import SplitType
 from vortex.date_range.month import Month
@@ -19,12 +20,14 @@ def update_tab(first_day: Day, last_day: Day, force: bool):
     gigs_info = VortexAirtableDB().gigs_info_for_period(period, force=force)
 
     years = period.split_into(Year, SplitType.OUTER)
+    quarters = period.split_into(Quarter, SplitType.OUTER)
+    cube = CategoryCube.for_periods(transactions, years, quarters)
+
     tab = CashFlowAnalysisTab(Workbook(CASHFLOW_ANALYSIS_ID), "Yearly", years)
-    tab.update(transactions, gigs_info, bank_activity)
+    tab.update(cube, gigs_info, bank_activity)
 
-    quarters = period.split_into(Quarter, SplitType.OUTER)
     tab = CashFlowAnalysisTab(Workbook(CASHFLOW_ANALYSIS_ID), "Quarterly", quarters)
-    tab.update(transactions, gigs_info, bank_activity)
+    tab.update(cube, gigs_info, bank_activity)
 
 if __name__ == '__main__':
     first_day = Month(2023, 1).first_day
@@ -1,6 +1,7 @@
 from decimal import Decimal
 
 from vortex.banking import BankActivity
+from vortex.banking.category.categorize import category_memo
 from vortex.banking.category.payee_categories import PayeeCategory
 from vortex.date_range.accounting_month import AccountingMonth
 from vortex.date_range.month import Month
@@ -38,7 +39,7 @@ def ensure_tab_consistent(month: AccountingMonth, refresh_bank_activity: bool, r
     tab = statements_tab_for_month(month)
 
 
-    bank_activity = BankActivity.build(force=refresh_bank_activity).restrict_to_period(month)
+    bank_activity = BankActivity.build(force=False, refresh=refresh_bank_activity).restrict_to_period(month)
     if refresh_sheet or (not statements_consistent(tab, bank_activity, fail_on_inconsistency=False)):
         # tab.clear_all()
         tab.update(bank_activity)
@@ -99,3 +100,4 @@ if __name__ == '__main__':
         ensure_tab_consistent(acc_month, refresh_bank_activity=True, refresh_sheet=True)
         # compare_uncategorized_with_kashflow(acc_month)
         acc_month = acc_month + 1
+    print(category_memo())
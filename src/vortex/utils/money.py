@@ -0,0 +1,25 @@
+from decimal import Decimal
+from typing import Optional
+
+PENCE_PER_POUND = 100
+
+
+def to_pence(amount: Decimal) -> int:
+    """`amount` as a whole number of pence. Raises a ValueError if it has fractional pence"""
+    pence = amount.scaleb(2)
+    if pence != pence.to_integral_value():
+        raise ValueError(f"{amount} is not a whole number of pence")
+    return int(pence)
+
+
+def maybe_to_pence(amount: Decimal) -> Optional[int]:
+    """`amount` as a whole number of pence, or None if it has fractional pence"""
+    pence = amount.scaleb(2)
+    if pence != pence.to_integral_value():
+        return None
+    return int(pence)
+
+
+def from_pence(pence: int) -> Decimal:
+    """`pence` as a decimal amount in pounds, to two decimal places"""
+    return Decimal(int(pence)).scaleb(-2)
@@ -0,0 +1,100 @@
+from collections import deque
+from typing import Iterable, List
+
+__all__ = ["MultiPatternMatcher"]
+
+_END = ""  # Trie key marking the end of a pattern - never a character of the text
+
+
+def _trie(patterns: Iterable[str], reverse: bool) -> dict:
+    root = {}
+    for pattern in patterns:
+        node = root
+        for c in (reversed(pattern) if reverse else pattern):
+            node = node.setdefault(c, {})
+        node[_END] = pattern
+    return root
+
+
+def _walk(trie: dict, chars) -> List[str]:
+    # Patterns in the trie that `chars` starts with, shortest first
+    found = []
+    node = trie
+    if _END in node:
+        found.append(node[_END])
+    for c in chars:
+        node = node.get(c)
+        if node is None:
+            break
+        if _END in node:
+            found.append(node[_END])
+    return found
+
+
+class MultiPatternMatcher:
+    """
+    Finds which of a fixed set of patterns a text starts with, ends with, or contains, in a single pass over the
+    text for each kind of pattern, however many patterns there are.
+
+    Prefixes and suffixes are held in tries, substrings in an Aho-Corasick automaton
+    """
+
+    def __init__(self, prefixes: Iterable[str] = (), substrings: Iterable[str] = (), suffixes: Iterable[str] = ()):
+        self._prefix_trie = _trie(prefixes, reverse=False)
+        self._suffix_trie = _trie(suffixes, reverse=True)
+        self._goto: List[dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[tuple[str, ...]] = [()]
+        self._build_automaton(substrings)
+
+    def _build_automaton(self, substrings: Iterable[str]):
+        outputs = [set()]
+        for pattern in substrings:
+            state = 0
+            for c in pattern:
+                next_state = self._goto[state].get(c)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][c] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                state = next_state
+            outputs[state].add(pattern)
+        # Breadth first, so each state's failure state has its outputs complete before they are inherited
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for c, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail > 0 and c not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(c, 0)
+                outputs[next_state] |= outputs[self._fail[next_state]]
+                queue.append(next_state)
+        for state in range(1, len(outputs)):
+            outputs[state] |= outputs[0]
+        self._outputs = [tuple(sorted(o)) for o in outputs]
+
+    def prefixes_of(self, text: str) -> List[str]:
+        return _walk(self._prefix_trie, text)
+
+    def suffixes_of(self, text: str) -> List[str]:
+        return _walk(self._suffix_trie, reversed(text))
+
+    def substrings_of(self, text: str) -> set[str]:
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found = set(outputs[0])
+        state = 0
+        for c in text:
+            while True:
+                next_state = goto[state].get(c)
+                if next_state is not None:
+                    state = next_state
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
@@ -0,0 +1,25 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pickle import PicklingError
+from typing import Callable
+
+__all__ = ["parallel_map"]
+
+
+def parallel_map(func: Callable, *arg_lists: list, min_items: int, description: str) -> list:
+    """
+    `func` applied to each tuple of corresponding elements of `arg_lists`, in order. Spread over a process pool
+    when there are at least `min_items` and more than one CPU, falling back to running serially if the pool can't
+    be used - `func` and its arguments have to be picklable
+    """
+    num_items = len(arg_lists[0])
+    max_workers = os.cpu_count() or 1
+    if num_items >= min_items and max_workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                chunksize = max(1, num_items // (4 * max_workers))
+                return list(executor.map(func, *arg_lists, chunksize=chunksize))
+        except (OSError, BrokenProcessPool, PicklingError) as e:
+            print(f"Parallel {description} failed ({e}), running serially")
+    return [func(*args) for args in zip(*arg_lists)]
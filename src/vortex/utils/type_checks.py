@@ -4,26 +4,167 @@ __all__ = [
     "checked_optional_type",
     "checked_dict_type",
     "checked_opt_type",
+    "ValidationPolicy",
+    "ValidationStats",
+    "set_validation_policy",
+    "validation_policy",
+    "validation_boundary",
+    "collecting_validation_stats",
 ]
 
+import random
+import time
+from contextlib import contextmanager
+from enum import Enum
+from itertools import islice
+from typing import Optional
+
+from tabulate import tabulate
+
 from vortex.myopt.opt import Opt
 
 
+class ValidationPolicy(Enum):
+    """
+    How much checking the checked_* functions do.
+
+    FULL checks every object and every element of every collection. BOUNDARY checks only inside a
+    `validation_boundary()`, which the readers of statements, ledgers and tabs open while ingesting, so that
+    constructors re-wrapping already checked objects cost nothing. SAMPLED checks single objects but only a
+    fraction of the elements of each collection
+    """
+    FULL = "full"
+    BOUNDARY = "boundary"
+    SAMPLED = "sampled"
+
+
+class ValidationStats:
+    """Number of checks, elements checked and seconds spent, per expected type"""
+
+    def __init__(self):
+        self.by_type: dict[str, list] = {}
+
+    def record(self, expected_type, num_elements: int, seconds: float):
+        name = getattr(expected_type, "__name__", str(expected_type))
+        counts = self.by_type.setdefault(name, [0, 0, 0.0])
+        counts[0] += 1
+        counts[1] += num_elements
+        counts[2] += seconds
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(counts[2] for counts in self.by_type.values())
+
+    def __str__(self):
+        rows = [
+            [name, checks, elements, seconds]
+            for name, (checks, elements, seconds) in sorted(self.by_type.items(), key=lambda kv: -kv[1][2])
+        ]
+        return tabulate(rows, headers=["Type", "Checks", "Elements", "Seconds"], floatfmt=".3f")
+
+
+_POLICY = ValidationPolicy.FULL
+_SAMPLE_STRIDE = 10
+_BOUNDARY_DEPTH = 0
+_STATS: Optional[ValidationStats] = None
+_RNG = random.Random(1234)
+
+# Recomputed whenever the policy or boundary depth changes, so a check costs one global lookup when skipped
+_CHECKING = True
+_SAMPLING = False
+
+
+def _update_flags():
+    global _CHECKING, _SAMPLING
+    _CHECKING = _POLICY != ValidationPolicy.BOUNDARY or _BOUNDARY_DEPTH > 0
+    _SAMPLING = _POLICY == ValidationPolicy.SAMPLED
+
+
+def set_validation_policy(policy: ValidationPolicy, sample_fraction: float = 0.1):
+    global _POLICY, _SAMPLE_STRIDE
+    assert isinstance(policy, ValidationPolicy), f"{policy} is of type {type(policy)}, expected ValidationPolicy"
+    assert 0 < sample_fraction <= 1, f"Sample fraction {sample_fraction} should be in (0, 1]"
+    _POLICY = policy
+    _SAMPLE_STRIDE = max(1, round(1 / sample_fraction))
+    _update_flags()
+
+
+def validation_policy() -> ValidationPolicy:
+    return _POLICY
+
+
+@contextmanager
+def validation_boundary():
+    """Marks reading from outside the program - under BOUNDARY validation everything is checked inside this"""
+    global _BOUNDARY_DEPTH
+    _BOUNDARY_DEPTH += 1
+    _update_flags()
+    try:
+        yield
+    finally:
+        _BOUNDARY_DEPTH -= 1
+        _update_flags()
+
+
+@contextmanager
+def collecting_validation_stats():
+    """Times every check made inside the block, yielding the ValidationStats they are recorded in"""
+    global _STATS
+    previous = _STATS
+    _STATS = ValidationStats()
+    try:
+        yield _STATS
+    finally:
+        _STATS = previous
+
+
+def _elements(collection):
+    # All of the collection, or under SAMPLED every n'th element from a random start, along with how many that is
+    if not _SAMPLING or len(collection) <= _SAMPLE_STRIDE:
+        return collection, len(collection)
+    start = _RNG.randrange(_SAMPLE_STRIDE)
+    return islice(collection, start, None, _SAMPLE_STRIDE), len(range(start, len(collection), _SAMPLE_STRIDE))
+
+
+def _record(expected_type, num_elements, t0):
+    _STATS.record(expected_type, num_elements, time.perf_counter() - t0)
+
+
 def checked_type(obj, expected_type):
-    assert isinstance(obj, expected_type), f"{obj} is of type {type(obj)}, expected {expected_type}"
+    if _CHECKING:
+        if _STATS is None:
+            assert isinstance(obj, expected_type), f"{obj} is of type {type(obj)}, expected {expected_type}"
+        else:
+            t0 = time.perf_counter()
+            assert isinstance(obj, expected_type), f"{obj} is of type {type(obj)}, expected {expected_type}"
+            _record(expected_type, 1, t0)
     return obj
 
 
+def _check_elements(elements, expected_type):
+    for x in elements:
+        assert isinstance(x, expected_type), f"{x} is of type {type(x)}, expected {expected_type}"
+
+
 def checked_set_type(obj, expected_type):
-    assert isinstance(obj, set), f"{obj} is of type {type(obj)}, expected set"
-    for x in obj:
-        checked_type(x, expected_type)
+    if _CHECKING:
+        t0 = time.perf_counter() if _STATS is not None else None
+        assert isinstance(obj, set), f"{obj} is of type {type(obj)}, expected set"
+        elements, num_elements = _elements(obj)
+        _check_elements(elements, expected_type)
+        if t0 is not None:
+            _record(expected_type, num_elements, t0)
     return obj
 
+
 def checked_list_type(obj, expected_type):
-    assert isinstance(obj, list), f"{obj} is of type {type(obj)}, expected list"
-    for x in obj:
-        checked_type(x, expected_type)
+    if _CHECKING:
+        t0 = time.perf_counter() if _STATS is not None else None
+        assert isinstance(obj, list), f"{obj} is of type {type(obj)}, expected list"
+        elements, num_elements = _elements(obj)
+        _check_elements(elements, expected_type)
+        if t0 is not None:
+            _record(expected_type, num_elements, t0)
     return obj
 
 
@@ -40,8 +181,21 @@ def checked_opt_type(obj, expected_type):
 
 
 def checked_dict_type(obj, key_type, value_type):
-    assert isinstance(obj, dict), f"{obj} is of type {type(obj)}, expected dict"
-    for k, v in obj.items():
-        checked_type(k, key_type)
-        checked_type(v, value_type)
+    if _CHECKING:
+        if _STATS is None:
+            assert isinstance(obj, dict), f"{obj} is of type {type(obj)}, expected dict"
+            for k, v in _elements(obj.items())[0]:
+                assert isinstance(k, key_type), f"{k} is of type {type(k)}, expected {key_type}"
+                assert isinstance(v, value_type), f"{v} is of type {type(v)}, expected {value_type}"
+        else:
+            # Keys and values are checked in separate passes so each type is charged its own time
+            t0 = time.perf_counter()
+            assert isinstance(obj, dict), f"{obj} is of type {type(obj)}, expected dict"
+            elements, num_elements = _elements(obj.items())
+            elements = list(elements)
+            _check_elements((k for k, _ in elements), key_type)
+            _record(key_type, num_elements, t0)
+            t0 = time.perf_counter()
+            _check_elements((v for _, v in elements), value_type)
+            _record(value_type, num_elements, t0)
     return obj
@@ -0,0 +1,183 @@
+from decimal import Decimal
+from typing import List, Optional
+
+from date_range.fixtures import random_day
+from vortex.banking import BankAccountActivity
+from vortex.banking.account.bank_account import CURRENT_ACCOUNT, ALL_BANK_ACCOUNTS, BankAccount
+from vortex.banking.category.payee_categories import PayeeCategory
+from vortex.banking.category.rules import CategoryRule, Patterns
+from vortex.banking.transaction.transaction import Transaction
+from vortex.date_range import Day, DateRange
+from vortex.date_range.simple_date_range import SimpleDateRange
+from vortex.utils import RandomNumberGenerator
+
+__all__ = [
+    "random_amount",
+    "random_transactions",
+    "random_activity",
+    "random_sub_period",
+    "naive_balance_at_eod",
+    "naive_balance_at_sod",
+    "naive_total",
+    "random_rule_transactions",
+    "naive_category",
+    "naive_rule_outcomes",
+]
+
+PAYEES = [
+    "Thames Water",
+    "PRS for Music",
+    "Ticketweb",
+    "Sumup Payments",
+    "Zettle",
+    "Booker Wholesale",
+    "HMRC VAT",
+    "Vortex Jazz Foundation",
+]
+
+
+def random_amount(rng: RandomNumberGenerator, exponents: tuple[int, ...] = (-2,)) -> Decimal:
+    return Decimal(rng.randint(-50000, 50000)).scaleb(rng.choice(exponents))
+
+
+def random_transactions(
+        rng: RandomNumberGenerator,
+        period: DateRange,
+        num_transactions: int,
+        account: BankAccount = CURRENT_ACCOUNT,
+        categories: Optional[List[PayeeCategory]] = None,
+        exponents: tuple[int, ...] = (-2,),
+) -> List[Transaction]:
+    categories = categories or [PayeeCategory.UNCATEGORISED]
+    return [
+        Transaction(
+            account=account,
+            category=rng.choice(categories),
+            payment_date=random_day(rng, containing_range=period),
+            payee=rng.choice(PAYEES),
+            amount=random_amount(rng, exponents),
+        )
+        for _ in range(num_transactions)
+    ]
+
+
+def random_activity(rng: RandomNumberGenerator, account: BankAccount = CURRENT_ACCOUNT) -> BankAccountActivity:
+    """Activity with published balances on random days, each consistent with the transactions before it"""
+    first_day = random_day(rng, Day(2018, 1, 1), Day(2022, 1, 1))
+    period = SimpleDateRange(first_day, first_day + rng.randint(10, 400))
+    transactions = random_transactions(rng, period, rng.randint(1, 200), account)
+    balance_days = {first_day} | {random_day(rng, containing_range=period) for _ in range(rng.randint(0, 30))}
+    opening = random_amount(rng) * 10
+    published_balances = {
+        d: opening + sum((t.amount for t in transactions if t.payment_date <= d), Decimal(0))
+        for d in balance_days
+    }
+    return BankAccountActivity(account, transactions, published_balances)
+
+
+def random_sub_period(rng: RandomNumberGenerator, period: DateRange) -> DateRange:
+    d1 = random_day(rng, containing_range=period)
+    d2 = random_day(rng, containing_range=period)
+    return SimpleDateRange(min(d1, d2), max(d1, d2))
+
+
+def naive_balance_at_eod(
+        transactions: List[Transaction],
+        published_balances: dict[Day, Decimal],
+        date: Day
+) -> Decimal:
+    balance_days = [d for d in published_balances if d <= date]
+    if len(balance_days) == 0:
+        return Decimal(0)
+    balance_day = max(balance_days)
+    return published_balances[balance_day] + sum(
+        (t.amount for t in transactions if balance_day < t.payment_date <= date),
+        Decimal(0)
+    )
+
+
+def naive_balance_at_sod(
+        transactions: List[Transaction],
+        published_balances: dict[Day, Decimal],
+        date: Day
+) -> Decimal:
+    return naive_balance_at_eod(transactions, published_balances, date) - sum(
+        (t.amount for t in transactions if t.payment_date == date),
+        Decimal(0)
+    )
+
+
+def naive_total(transactions: List[Transaction]) -> Decimal:
+    total = Decimal(0)
+    for t in transactions:
+        total += t.amount
+    return total
+
+
+def _random_payee(rng: RandomNumberGenerator, rules: List[CategoryRule]) -> str:
+    # A payee built from the patterns of a random clause, so that it is likely to match it - or an earlier one
+    clause = rng.choice(rng.choice(rules).clauses)
+    starts, contains, ends = [rng.choice(["", "acme"])], [rng.choice(["", "ltd", "payment"])], []
+    for patterns in clause.all_of:
+        pattern = rng.choice(patterns.patterns)
+        {Patterns.STARTS: starts, Patterns.CONTAINS: contains, Patterns.ENDS: ends}[patterns.kind].append(pattern)
+    if clause.unless is not None and rng.randint(4) == 0:
+        contains.append(rng.choice(clause.unless.patterns))
+    payee = " ".join(p for p in starts[1:] + starts[:1] + contains + ends if p != "")
+    return payee.upper() if rng.is_heads() else payee
+
+
+def random_rule_transactions(
+        rng: RandomNumberGenerator,
+        rules: List[CategoryRule],
+        period: DateRange,
+        num_transactions: int,
+) -> List[Transaction]:
+    payees = [_random_payee(rng, rules) for _ in range(max(1, num_transactions // 5))] + PAYEES
+    return [
+        Transaction(
+            account=rng.choice(ALL_BANK_ACCOUNTS),
+            category=PayeeCategory.UNCATEGORISED,
+            payment_date=random_day(rng, containing_range=period),
+            payee=rng.choice(payees),
+            amount=random_amount(rng) * rng.choice([1, 10]),
+        )
+        for _ in range(num_transactions)
+    ]
+
+
+def _matches(patterns: Patterns, payee: str) -> bool:
+    if patterns.kind == Patterns.STARTS:
+        return any(payee.startswith(p) for p in patterns.patterns)
+    if patterns.kind == Patterns.CONTAINS:
+        return any(p in payee for p in patterns.patterns)
+    return any(payee.endswith(p) for p in patterns.patterns)
+
+
+def naive_category(rules: List[CategoryRule], transaction: Transaction) -> PayeeCategory:
+    """The category of the first clause the transaction satisfies, testing every clause in turn"""
+    payee = transaction.payee.lower()
+    for rule in rules:
+        for clause in rule.clauses:
+            if all(_matches(patterns, payee) for patterns in clause.all_of) \
+                    and (clause.unless is None or not _matches(clause.unless, payee)) \
+                    and (clause.guard is None or clause.guard(transaction)):
+                return clause.category
+    return PayeeCategory.UNCATEGORISED
+
+
+def naive_rule_outcomes(rules: List[CategoryRule], transaction: Transaction) -> tuple[set[str], List[str]]:
+    """
+    Names of the rules with a clause whose patterns the transaction matches, and, in priority order, of those
+    with a clause it satisfies, guard included
+    """
+    payee = transaction.payee.lower()
+    evaluated, satisfied = set(), []
+    for rule in rules:
+        for clause in rule.clauses:
+            if all(_matches(patterns, payee) for patterns in clause.all_of) \
+                    and (clause.unless is None or not _matches(clause.unless, payee)):
+                evaluated.add(rule.name)
+                if (clause.guard is None or clause.guard(transaction)) and rule.name not in satisfied:
+                    satisfied.append(rule.name)
+    return evaluated, satisfied
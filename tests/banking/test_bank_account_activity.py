@@ -0,0 +1,75 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from banking.fixtures import random_activity, random_sub_period, naive_balance_at_eod, naive_balance_at_sod
+from date_range.fixtures import random_day
+from testing_utils import RandomisedTest
+from vortex.banking import BankAccountActivity
+from vortex.banking.account.bank_account import CURRENT_ACCOUNT
+from vortex.date_range import Day
+from vortex.date_range.simple_date_range import SimpleDateRange
+
+
+def _span(activity: BankAccountActivity) -> SimpleDateRange:
+    last_day = max(activity.balance_dates[-1], activity.last_date or activity.balance_dates[-1])
+    return SimpleDateRange(activity.balance_dates[0] - 5, last_day + 5)
+
+
+class BankAccountActivityTests(TestCase):
+    @RandomisedTest(number_of_runs=20)
+    def test_balances_match_naive_recomputation(self, rng):
+        activity = random_activity(rng)
+        transactions, balances = activity.transactions, activity.published_balances
+        span = _span(activity)
+        for _ in range(20):
+            d = random_day(rng, containing_range=span)
+            self.assertEqual(activity.balance_at_eod(d), naive_balance_at_eod(transactions, balances, d))
+            if d >= activity.initial_balance_date:
+                self.assertEqual(activity.balance_at_sod(d), naive_balance_at_sod(transactions, balances, d))
+        self.assertEqual(activity.latest_balance, naive_balance_at_eod(transactions, balances, span.last_day))
+
+    @RandomisedTest(number_of_runs=20)
+    def test_nested_views_match_naive_recomputation(self, rng):
+        activity = random_activity(rng)
+        transactions, balances = activity.transactions, activity.published_balances
+        view = activity
+        period = _span(activity)
+        for _ in range(rng.randint(1, 4)):
+            period = random_sub_period(rng, period)
+            view = view.filter_on_period(period)
+            in_period = [t for t in transactions if period.contains_day(t.payment_date)]
+            self.assertEqual(view.transactions, in_period)
+            self.assertEqual(view.num_transactions, len(in_period))
+            self.assertEqual(view.net_flow(None, None), sum((t.amount for t in in_period), Decimal(0)))
+            if period.last_day < activity.initial_balance_date:
+                self.assertIsNone(view.latest_balance)
+                continue
+            first_day = max(period.first_day, activity.initial_balance_date)
+            self.assertEqual(view.earliest_balance, naive_balance_at_sod(transactions, balances, first_day))
+            self.assertEqual(view.latest_balance, naive_balance_at_eod(transactions, balances, period.last_day))
+            d = random_day(rng, first_day, period.last_day)
+            self.assertEqual(view.balance_at_eod(d), naive_balance_at_eod(transactions, balances, d))
+
+    @RandomisedTest(number_of_runs=20)
+    def test_period_balances_match_naive_recomputation(self, rng):
+        activity = random_activity(rng)
+        transactions, balances = activity.transactions, activity.published_balances
+        span = _span(activity)
+        view_period = random_sub_period(rng, span)
+        for source in [activity, activity.filter_on_period(view_period)]:
+            initial_day = source.initial_balance_date
+            period = view_period if source is not activity else span
+            periods = [random_sub_period(rng, period) for _ in range(10)]
+            closing = source.period_balances(periods, opening=False)
+            opening = source.period_balances(periods, opening=True)
+            for p, c, o in zip(periods, closing, opening):
+                if initial_day is None or p.last_day < initial_day:
+                    self.assertIsNone(c)
+                    self.assertIsNone(o)
+                    continue
+                self.assertEqual(c, naive_balance_at_eod(transactions, balances, p.last_day))
+                self.assertEqual(o, naive_balance_at_sod(transactions, balances, max(p.first_day, initial_day)))
+
+    def test_sub_penny_balances_raise(self):
+        with self.assertRaises(ValueError):
+            BankAccountActivity(CURRENT_ACCOUNT, [], {Day(2023, 1, 1): Decimal("100.005")})
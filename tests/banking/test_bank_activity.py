@@ -0,0 +1,42 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from banking.fixtures import random_activity, naive_balance_at_eod, naive_balance_at_sod
+from testing_utils import RandomisedTest
+from vortex.banking import BankActivity, BankAccountActivity
+from vortex.banking.account.bank_account import CURRENT_ACCOUNT, SAVINGS_ACCOUNT
+from vortex.date_range.simple_date_range import SimpleDateRange
+
+
+class BankActivityTests(TestCase):
+    @RandomisedTest(number_of_runs=10)
+    def test_balance_series_matches_daily_balances(self, rng):
+        current = random_activity(rng, CURRENT_ACCOUNT)
+        first_day = current.balance_dates[0]
+        # An account with published balances but no transactions
+        savings_balance = Decimal("1234.56")
+        savings = BankAccountActivity(
+            SAVINGS_ACCOUNT, [], {first_day + rng.randint(0, 20): savings_balance, first_day + 40: savings_balance}
+        )
+        activity = BankActivity([current, savings])
+        period = SimpleDateRange(first_day - 3, first_day + 60)
+        for opening in [False, True]:
+            series = activity.balance_series(period, opening=opening)
+            self.assertEqual(list(series.columns), [CURRENT_ACCOUNT, SAVINGS_ACCOUNT])
+            for day, row in series.iterrows():
+                for statement in [current, savings]:
+                    balance = row[statement.account]
+                    if day < statement.balance_dates[0]:
+                        self.assertIsNone(balance)
+                    elif opening:
+                        self.assertEqual(
+                            balance,
+                            naive_balance_at_sod(statement.transactions, statement.published_balances, day)
+                        )
+                    else:
+                        self.assertEqual(
+                            balance,
+                            naive_balance_at_eod(statement.transactions, statement.published_balances, day)
+                        )
+                        if statement.num_transactions > 0:
+                            self.assertEqual(balance, statement.balance_at_eod(day))
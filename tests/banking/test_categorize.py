@@ -0,0 +1,69 @@
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from banking.fixtures import random_rule_transactions, naive_category
+from testing_utils import RandomisedTest
+from vortex.banking.account.bank_account import CURRENT_ACCOUNT
+from vortex.banking.category import categorize
+from vortex.banking.category.categorize import RULES, categorize_many, category_for_transaction
+from vortex.banking.category.category_memo import CategoryMemo
+from vortex.banking.category.payee_categories import PayeeCategory
+from vortex.banking.category.rules import CategoryRule, Clause, CompiledRules, starts
+from vortex.banking.transaction.transaction import Transaction
+from vortex.date_range import Day
+from vortex.date_range.simple_date_range import SimpleDateRange
+
+PERIOD = SimpleDateRange(Day(2022, 1, 1), Day(2023, 12, 31))
+
+
+class CategorizeTests(TestCase):
+    def setUp(self):
+        self._shelf_dir = tempfile.TemporaryDirectory()
+        self._shelf = CategoryMemo.SHELF
+        CategoryMemo.SHELF = Path(self._shelf_dir.name) / "_category_memo.shelf"
+        categorize._CATEGORY_MEMO = None
+
+    def tearDown(self):
+        CategoryMemo.SHELF = self._shelf
+        categorize._CATEGORY_MEMO = None
+        self._shelf_dir.cleanup()
+
+    @RandomisedTest(number_of_runs=10)
+    def test_categorize_many_matches_per_transaction(self, rng):
+        transactions = random_rule_transactions(rng, RULES, PERIOD, rng.randint(0, 500))
+        expected = [naive_category(RULES, t) for t in transactions]
+        self.assertEqual([category_for_transaction(t) for t in transactions], expected)
+        categorize._CATEGORY_MEMO = None
+        self.assertEqual(categorize_many(transactions), expected)
+        memo = categorize.category_memo()
+        misses = memo.misses
+        self.assertEqual(categorize_many(transactions), expected)
+        self.assertEqual(memo.misses, misses)
+
+    def test_changing_a_pattern_invalidates_the_memo(self):
+        transaction = Transaction(CURRENT_ACCOUNT, PayeeCategory.UNCATEGORISED, Day(2023, 1, 1), "Zzyzx Ltd",
+                                  Decimal("-10.00"))
+        self.assertEqual(category_for_transaction(transaction), PayeeCategory.UNCATEGORISED)
+        memo = categorize.category_memo()
+        memo.save()
+
+        accountant = RULES[1]
+        self.assertEqual(accountant.name, "accountant")
+        changed = CategoryRule(accountant.name, [Clause(PayeeCategory.ACCOUNTANT, starts("ck partnership", "zzyzx"))])
+        categorize._CATEGORY_MEMO = None
+        with patch.object(categorize, "COMPILED_RULES", CompiledRules([RULES[0], changed] + RULES[2:])):
+            changed_memo = categorize.category_memo()
+            self.assertNotEqual(changed_memo.fingerprint, memo.fingerprint)
+            self.assertEqual(changed_memo.categories, {})
+            self.assertEqual(category_for_transaction(transaction), PayeeCategory.ACCOUNTANT)
+
+    def test_fingerprint_covers_source_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / "source.py"
+            source.write_text("PATTERN = 'a'")
+            fingerprint = CategoryMemo.rules_fingerprint(categorize.COMPILED_RULES, [source])
+            source.write_text("PATTERN = 'b'")
+            self.assertNotEqual(CategoryMemo.rules_fingerprint(categorize.COMPILED_RULES, [source]), fingerprint)
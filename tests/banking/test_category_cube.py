@@ -0,0 +1,35 @@
+from unittest import TestCase
+
+from banking.fixtures import random_transactions, random_sub_period, naive_total
+from testing_utils import RandomisedTest
+from vortex.banking.category.payee_categories import CATEGORIES
+from vortex.banking.transaction.category_cube import CategoryCube
+from vortex.banking.transaction.transactions import Transactions
+from vortex.date_range import Day
+from vortex.date_range.simple_date_range import SimpleDateRange
+
+PERIOD = SimpleDateRange(Day(2022, 1, 1), Day(2023, 12, 31))
+
+
+class CategoryCubeTests(TestCase):
+    @RandomisedTest(number_of_runs=20)
+    def test_totals_match_transactions(self, rng):
+        exponents = rng.choice([(-2,), (-2, -1, 0), (-3, -2, 0)])
+        transactions = Transactions(
+            random_transactions(rng, PERIOD, rng.randint(0, 300), categories=CATEGORIES, exponents=exponents)
+        )
+        periods = [random_sub_period(rng, PERIOD) for _ in range(rng.randint(1, 6))]
+        cube = CategoryCube.for_periods(transactions, periods)
+        for period in periods:
+            categories = [rng.choice(CATEGORIES) for _ in range(rng.randint(0, 5))]
+            expected = transactions.restrict_to_period(period).restrict_to_categories(categories)
+            self.assertEqual(str(cube.total(period, categories)), str(expected.total_amount))
+            self.assertEqual(
+                str(cube.total(period, categories)),
+                str(naive_total(expected.transactions))
+            )
+
+    def test_period_must_be_whole_base_periods(self):
+        cube = CategoryCube.for_periods(Transactions([]), [PERIOD])
+        with self.assertRaises(ValueError):
+            cube.total(SimpleDateRange(PERIOD.first_day, PERIOD.last_day - 1), CATEGORIES)
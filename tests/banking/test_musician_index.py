@@ -0,0 +1,94 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from banking.fixtures import random_transactions
+from testing_utils import RandomisedTest
+from vortex.banking.category import categorize
+from vortex.banking.category.categorize import category_and_musician_for_transaction, category_for_transaction, \
+    profiling_categories
+from vortex.banking.category.musician_index import MusicianIndex
+from vortex.banking.category.payee_categories import PayeeCategory
+from vortex.banking.category.rules import CategoryRule, Clause, starts, contains
+from vortex.banking.transaction.transaction import Transaction
+from vortex.date_range import Day
+from vortex.date_range.simple_date_range import SimpleDateRange
+
+MUSICIANS = ["alan wilkinson", "alan", "ant law", "andrew woolf", "bernard lyons", "law"]
+WORDS = ["vortex", "new vortex jazz", "gig", "ltd", "al"]
+
+
+def _is_debit(tr: Transaction) -> bool:
+    return tr.amount < 0
+
+
+def _musician_rule(musicians, *conditions) -> CategoryRule:
+    return CategoryRule("musician_payments", [
+        Clause(PayeeCategory.MUSICIAN_PAYMENTS, starts(musicians), guard=_is_debit),
+    ] + [
+        Clause(PayeeCategory.MUSICIAN_PAYMENTS, contains(musicians), condition, guard=_is_debit)
+        for condition in conditions
+    ])
+
+
+def _naive_musician_paid(musicians, payee, conditions=(contains("new vortex jazz"), starts("vortex"))):
+    payee = payee.lower()
+
+    def satisfies(condition):
+        if condition.kind == "starts":
+            return any(payee.startswith(p) for p in condition.patterns)
+        return any(p in payee for p in condition.patterns)
+
+    for m in musicians:
+        if payee.startswith(m):
+            return m
+        if m in payee and any(satisfies(c) for c in conditions):
+            return m
+    return None
+
+
+def _random_payee(rng, musicians) -> str:
+    words = [rng.choice(musicians + WORDS) for _ in range(rng.randint(1, 4))]
+    return " ".join(words).upper() if rng.is_heads() else " ".join(words)
+
+
+class MusicianIndexTests(TestCase):
+    @RandomisedTest(number_of_runs=50)
+    def test_same_as_testing_each_musician(self, rng):
+        index = MusicianIndex(_musician_rule(MUSICIANS, contains("new vortex jazz"), starts("vortex")), MUSICIANS)
+        for _ in range(20):
+            payee = _random_payee(rng, MUSICIANS)
+            self.assertEqual(index.musician_paid(payee), _naive_musician_paid(MUSICIANS, payee), payee)
+
+    @RandomisedTest(number_of_runs=20)
+    def test_conditions_come_from_the_rule(self, rng):
+        conditions = (contains("gig"),)
+        index = MusicianIndex(_musician_rule(MUSICIANS, *conditions), MUSICIANS)
+        for _ in range(20):
+            payee = _random_payee(rng, MUSICIANS)
+            self.assertEqual(index.musician_paid(payee), _naive_musician_paid(MUSICIANS, payee, conditions), payee)
+
+    @RandomisedTest(number_of_runs=20)
+    def test_match_applies_guards(self, rng):
+        index = MusicianIndex(_musician_rule(MUSICIANS, contains("new vortex jazz"), starts("vortex")), MUSICIANS)
+        period = SimpleDateRange(Day(2023, 1, 1), Day(2023, 12, 31))
+        for t in random_transactions(rng, period, 20):
+            t = Transaction(t.account, t.category, t.payment_date, _random_payee(rng, MUSICIANS), t.amount)
+            musician = _naive_musician_paid(MUSICIANS, t.payee) if t.amount < 0 else None
+            expected = None if musician is None else (PayeeCategory.MUSICIAN_PAYMENTS, musician)
+            self.assertEqual(index.match(t), expected)
+
+    @RandomisedTest(number_of_runs=10)
+    def test_category_and_musician_for_transaction(self, rng):
+        musicians = categorize.MUSICIAN_INDEX.musicians
+        period = SimpleDateRange(Day(2023, 1, 1), Day(2023, 12, 31))
+        sample = [rng.choice(musicians) for _ in range(20)]
+        with profiling_categories():
+            for t in random_transactions(rng, period, 50):
+                amount = t.amount if rng.is_heads() else -abs(t.amount) - Decimal("0.01")
+                t = Transaction(t.account, t.category, t.payment_date, _random_payee(rng, sample), amount)
+                category, musician = category_and_musician_for_transaction(t)
+                self.assertEqual(category, category_for_transaction(t))
+                if category == PayeeCategory.MUSICIAN_PAYMENTS:
+                    self.assertEqual(musician, _naive_musician_paid(musicians, t.payee), t.payee)
+                else:
+                    self.assertIsNone(musician)
@@ -0,0 +1,128 @@
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+from unittest import TestCase
+
+from banking.fixtures import random_amount, random_transactions, PAYEES
+from testing_utils import RandomisedTest
+from vortex.banking import StatementsReader
+from vortex.banking.account.bank_account import CURRENT_ACCOUNT
+from vortex.banking.ofx_reader import OfxReader
+from vortex.date_range import Day
+from vortex.date_range.simple_date_range import SimpleDateRange
+from vortex.utils import RandomNumberGenerator
+
+
+def _ofx_date(day: Day) -> str:
+    return day.iso_repr.replace("-", "") + "120000"
+
+
+def _ofx_text(transactions: list[tuple[str, Day, str, Decimal]], first_day: Day, last_day: Day, balance: Decimal):
+    """A minimal OFX 1.x export of one statement, with `transactions` as (FITID, day, payee, amount)"""
+    statement_transactions = "".join(
+        f"<STMTTRN><TRNTYPE>OTHER<DTPOSTED>{_ofx_date(day)}<TRNAMT>{amount}<FITID>{fitid}<NAME>{payee}</STMTTRN>\n"
+        for fitid, day, payee, amount in transactions
+    )
+    return (
+        "OFXHEADER:100\nDATA:OFXSGML\nVERSION:102\nSECURITY:NONE\nENCODING:USASCII\nCHARSET:1252\n"
+        "COMPRESSION:NONE\nOLDFILEUID:NONE\nNEWFILEUID:NONE\n\n"
+        "<OFX><BANKMSGSRSV1><STMTTRNRS><TRNUID>1<STATUS><CODE>0<SEVERITY>INFO</STATUS><STMTRS><CURDEF>GBP\n"
+        "<BANKACCTFROM><BANKID>000000<ACCTID>12345678<ACCTTYPE>CHECKING</BANKACCTFROM>\n"
+        f"<BANKTRANLIST><DTSTART>{_ofx_date(first_day)}<DTEND>{_ofx_date(last_day)}\n"
+        f"{statement_transactions}"
+        "</BANKTRANLIST>\n"
+        f"<LEDGERBAL><BALAMT>{balance}<DTASOF>{_ofx_date(last_day)}</LEDGERBAL>\n"
+        "</STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\n"
+    )
+
+
+def _random_ofx_transactions(rng: RandomNumberGenerator, first_day: Day, num_days: int, num_transactions: int):
+    return [
+        (f"FIT{rng.randint(0, 10 ** 9)}-{i}", first_day + rng.randint(0, num_days - 1), rng.choice(PAYEES),
+         random_amount(rng))
+        for i in range(num_transactions)
+    ]
+
+
+class OfxReaderTests(TestCase):
+    def setUp(self):
+        self._dirs = []
+        self._shelf = StatementsReader.SHELF
+
+    def tearDown(self):
+        StatementsReader.SHELF = self._shelf
+        for d in self._dirs:
+            d.cleanup()
+
+    def new_statements_dir(self):
+        # Randomised tests run several times per setUp, so each run starts with its own directory and shelf
+        self._dirs.append(tempfile.TemporaryDirectory())
+        self.statements_dir = Path(self._dirs[-1].name)
+        self.account_dir = self.statements_dir / "ofx" / str(CURRENT_ACCOUNT.id)
+        self.account_dir.mkdir(parents=True)
+        StatementsReader.SHELF = self.statements_dir / "_statements_reader.shelf"
+
+    def write_ofx(self, name: str, transactions, first_day: Day, last_day: Day, balance: Decimal) -> Path:
+        file = self.account_dir / name
+        file.write_text(_ofx_text(transactions, first_day, last_day, balance))
+        return file
+
+    @RandomisedTest(number_of_runs=5)
+    def test_opening_balance_is_derived_from_ledger_balance(self, rng):
+        self.new_statements_dir()
+        first_day = Day(2024, 3, 1)
+        transactions = _random_ofx_transactions(rng, first_day, 30, rng.randint(1, 10))
+        balance = random_amount(rng)
+        file = self.write_ofx("march.ofx", transactions, first_day, first_day + 29, balance)
+        parsed, balances = OfxReader.parse_file(CURRENT_ACCOUNT, file)
+        self.assertEqual(sorted(parsed.keys()), sorted(fitid for fitid, _, _, _ in transactions))
+        for fitid, day, payee, amount in transactions:
+            self.assertEqual((parsed[fitid].payment_date, parsed[fitid].payee, parsed[fitid].amount),
+                             (day, payee, amount))
+        self.assertEqual(balances, {
+            first_day + 29: balance,
+            first_day - 1: balance - sum(amount for _, _, _, amount in transactions),
+        })
+
+    @RandomisedTest(number_of_runs=5)
+    def test_overlapping_files_are_merged_by_fitid(self, rng):
+        self.new_statements_dir()
+        first_day = Day(2024, 3, 1)
+        transactions = sorted(_random_ofx_transactions(rng, first_day, 60, rng.randint(2, 20)), key=lambda t: t[1])
+        split_day = first_day + rng.randint(10, 30)
+        overlap_day = split_day - rng.randint(1, 10)
+        opening = random_amount(rng)
+        closing_1 = opening + sum(t[3] for t in transactions if t[1] < split_day)
+        closing_2 = opening + sum(t[3] for t in transactions)
+        self.write_ofx("1.ofx", [t for t in transactions if t[1] < split_day], first_day, split_day - 1, closing_1)
+        self.write_ofx("2.ofx", [t for t in transactions if t[1] >= overlap_day], overlap_day, first_day + 59, closing_2)
+        merged, balances = StatementsReader.read_parsed_statements(self.statements_dir, force=True)[CURRENT_ACCOUNT]
+        self.assertEqual(
+            sorted((t.payment_date, t.payee, t.amount) for t in merged),
+            sorted((day, payee, amount) for _, day, payee, amount in transactions)
+        )
+        self.assertEqual(balances[first_day + 59], closing_2)
+        self.assertEqual(balances[split_day - 1], closing_1)
+
+    @RandomisedTest(number_of_runs=5)
+    def test_merge_with_csv_results(self, rng):
+        self.new_statements_dir()
+        first_day = Day(2024, 3, 1)
+        ofx_transactions = _random_ofx_transactions(rng, first_day, 30, rng.randint(2, 10))
+        ofx_result = OfxReader.parse_file(
+            CURRENT_ACCOUNT, self.write_ofx("march.ofx", ofx_transactions, first_day, first_day + 29, Decimal("10.00"))
+        )
+        csv_transactions = random_transactions(rng, SimpleDateRange(first_day, first_day + 29), 3)
+        csv_balances = {first_day + 29: Decimal("20.00"), first_day + 40: Decimal("30.00")}
+        known_fitids = {fitid for fitid, _, _, _ in ofx_transactions if rng.randint(0, 1) == 0}
+
+        merged, balances = StatementsReader._merge_parsed_files(
+            [(csv_transactions, csv_balances)], [ofx_result], known_fitids
+        )
+        self.assertEqual(
+            merged,
+            csv_transactions + [t for fitid, t in ofx_result[0].items() if fitid not in known_fitids]
+        )
+        # OFX balances take precedence over those published in the CSV statements
+        self.assertEqual(balances, csv_balances | ofx_result[1])
+        self.assertEqual(balances[first_day + 29], Decimal("10.00"))
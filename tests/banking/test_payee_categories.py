@@ -0,0 +1,117 @@
+from unittest import TestCase
+
+import numpy as np
+
+from testing_utils import RandomisedTest
+from vortex.banking.category.payee_categories import PayeeCategory, CATEGORIES, CATEGORY_CODES, CategoryMask
+from vortex.banking.decomposition.category_tree import CategoryLeaves, CategoryTree
+
+# The category lists the predicates tested membership of before they were compiled into masks
+_OLD_NOT_SUBJECT_TO_VAT = {
+    PayeeCategory.BANK_FEES,
+    PayeeCategory.BB_LOAN,
+    PayeeCategory.BANK_INTEREST,
+    PayeeCategory.CREDIT_CARD_FEES,
+    PayeeCategory.DONATION,
+    PayeeCategory.GIG_SECURITY,
+    PayeeCategory.GRANT,
+    PayeeCategory.INSURANCE_PAYOUT,
+    PayeeCategory.INTERNAL_TRANSFER,
+    PayeeCategory.MEMBERSHIPS,
+    PayeeCategory.MUSIC_VENUE_TRUST,
+    PayeeCategory.MUSICIAN_PAYMENTS,
+    PayeeCategory.PETTY_CASH,
+    PayeeCategory.PIANO_TUNER,
+    PayeeCategory.RATES,
+    PayeeCategory.SALARIES,
+    PayeeCategory.SOUND_ENGINEER,
+    PayeeCategory.TICKET_SALES,
+    PayeeCategory.UNCATEGORISED,
+    PayeeCategory.VAT,
+    PayeeCategory.VORTEX_MERCH,
+    PayeeCategory.WORK_PERMITS,
+}
+
+_OLD_SUBJECT_TO_VAT = {
+    PayeeCategory.ACCOUNTANT,
+    PayeeCategory.ADVERTISING,
+    PayeeCategory.AIRTABLE,
+    PayeeCategory.BAR_SNACKS,
+    PayeeCategory.BAR_STOCK,
+    PayeeCategory.BT,
+    PayeeCategory.BUILDING_MAINTENANCE,
+    PayeeCategory.BUILDING_SECURITY,
+    PayeeCategory.BUILDING_WORKS,
+    PayeeCategory.CARD_SALES,
+    PayeeCategory.CLEANING,
+    PayeeCategory.ELECTRICITY,
+    PayeeCategory.EQUIPMENT_HIRE,
+    PayeeCategory.EQUIPMENT_MAINTENANCE,
+    PayeeCategory.EQUIPMENT_PURCHASE,
+    PayeeCategory.FIRE_ALARM,
+    PayeeCategory.FLOOD,
+    PayeeCategory.INSURANCE,
+    PayeeCategory.KASHFLOW,
+    PayeeCategory.LEGAL_ADVICE,
+    PayeeCategory.LICENSING,
+    PayeeCategory.MAILCHIMP,
+    PayeeCategory.MARKETING,
+    PayeeCategory.MUSICIAN_COSTS,
+    PayeeCategory.OPERATIONAL_COSTS,
+    PayeeCategory.PRS,
+    PayeeCategory.RENT,
+    PayeeCategory.SLACK,
+    PayeeCategory.SPACE_HIRE,
+    PayeeCategory.SUBSCRIPTIONS,
+    PayeeCategory.TELEPHONE,
+    PayeeCategory.THAMES_WATER,
+    PayeeCategory.UTILITIES,
+    PayeeCategory.WEB_HOST,
+}
+
+_OLD_CREDITS = {
+    PayeeCategory.CARD_SALES,
+    PayeeCategory.CASH_SALES,
+    PayeeCategory.TICKET_SALES,
+    PayeeCategory.SPACE_HIRE,
+    PayeeCategory.MEMBERSHIPS,
+    PayeeCategory.INSURANCE_PAYOUT,
+}
+
+
+def _old_is_subject_to_vat(category: PayeeCategory) -> bool:
+    if category in _OLD_NOT_SUBJECT_TO_VAT:
+        return False
+    if category in _OLD_SUBJECT_TO_VAT:
+        return True
+    raise ValueError(f"Unknown category for VAT [{category}]")
+
+
+class CategoryMaskTests(TestCase):
+    def test_predicates_match_category_lists(self):
+        for category in CATEGORIES:
+            self.assertEqual(PayeeCategory.is_credit(category), category in _OLD_CREDITS, category)
+            self.assertEqual(PayeeCategory.is_debit(category), category not in _OLD_CREDITS, category)
+            try:
+                expected = _old_is_subject_to_vat(category)
+            except ValueError:
+                self.assertRaises(ValueError, PayeeCategory.is_subject_to_vat, category)
+                continue
+            self.assertEqual(PayeeCategory.is_subject_to_vat(category), expected, category)
+
+    @RandomisedTest(number_of_runs=20)
+    def test_masks_match_sets(self, rng):
+        def random_categories():
+            return [rng.choice(CATEGORIES) for _ in range(rng.randint(0, 10))]
+
+        leaves = [CategoryLeaves(f"leaves {i}", random_categories()) for i in range(rng.randint(1, 5))]
+        tree = CategoryTree("tree", leaves)
+        expected = {c for leaf in leaves for c in leaf.categories}
+        for category in CATEGORIES:
+            self.assertEqual(tree.includes(category), category in expected)
+        self.assertEqual(~tree.mask, CategoryMask(set(CATEGORIES) - expected))
+        self.assertEqual(tree.mask.categories, [c for c in CATEGORIES if c in expected])
+        codes = np.array([CATEGORY_CODES[c] for c in random_categories()], dtype=np.int16)
+        np.testing.assert_array_equal(
+            tree.mask.select(codes), np.isin(codes, [CATEGORY_CODES[c] for c in expected])
+        )
@@ -0,0 +1,82 @@
+import os
+import pickle
+import subprocess
+import sys
+from unittest import TestCase
+
+from banking.fixtures import random_transactions, PAYEES as FIXTURE_PAYEES
+from testing_utils import RandomisedTest
+from vortex.banking.transaction.payee_dictionary import PayeeDictionary
+from vortex.date_range import Day
+from vortex.date_range.simple_date_range import SimpleDateRange
+
+PERIOD = SimpleDateRange(Day(2023, 1, 1), Day(2023, 12, 31))
+
+
+class PayeeDictionaryTests(TestCase):
+    def test_normalise(self):
+        for payee, expected in [
+            ("Thames Water", "thames water"),
+            ("  THAMES   Water\t", "thames water"),
+            ("TICKETWEB CD 1234", "ticketweb"),
+            ("Ticketweb  card 9876", "ticketweb"),
+            ("Ticketweb card9876", "ticketweb"),
+            ("SUMUP *VORTEX123", "sumup"),
+            ("Sumup *a1", "sumup"),
+            ("Zettle *Vortex Jazz", "zettle *vortex jazz"),
+            ("Sumup *vortex", "sumup *vortex"),
+            ("Booker CD 12345", "booker cd 12345"),
+            ("CD 1234 Booker", "cd 1234 booker"),
+        ]:
+            self.assertEqual(PayeeDictionary.normalise(payee), expected, payee)
+
+    @RandomisedTest(number_of_runs=20)
+    def test_payees_differing_by_case_whitespace_or_card_share_a_normalised_form(self, rng):
+        payees = PayeeDictionary()
+        base = rng.choice(FIXTURE_PAYEES)
+        variants = []
+        for _ in range(10):
+            words = [w.upper() if rng.is_heads() else w for w in base.split()]
+            variant = (" " * rng.randint(1, 3)).join(words)
+            if rng.is_heads():
+                variant += rng.choice([" CD ", " card ", " Card"]) + f"{rng.randint(0, 10000):04d}"
+            variants.append(variant)
+        ids = [payees.id_for(v) for v in variants]
+        self.assertEqual(sorted(payees.ids_for_normalised(base.lower())), sorted(set(ids)))
+        for v, i in zip(variants, ids):
+            self.assertEqual(payees.payees[i], v)
+            self.assertEqual(payees.normalised[i], base.lower())
+            self.assertEqual(PayeeDictionary.normalise(payees.normalised[i]), payees.normalised[i])
+
+    @RandomisedTest(number_of_runs=20)
+    def test_merge_keeps_ids_that_agree(self, rng):
+        original = PayeeDictionary()
+        original.merge([rng.choice(FIXTURE_PAYEES) + str(rng.randint(0, 20)) for _ in range(30)])
+        fresh = PayeeDictionary()
+        self.assertEqual(fresh.merge(original.payees), list(range(len(original))))
+        self.assertEqual(fresh.payees, original.payees)
+
+        other = PayeeDictionary()
+        other.merge([rng.choice(FIXTURE_PAYEES) + str(rng.randint(0, 20)) for _ in range(10)])
+        ids = other.merge(original.payees)
+        self.assertEqual([other.payees[i] for i in ids], original.payees)
+
+    @RandomisedTest(number_of_runs=3)
+    def test_transaction_payee_ids_survive_pickling_into_a_new_process(self, rng):
+        transactions = random_transactions(rng, PERIOD, 20)
+        script = (
+            "import pickle, sys\n"
+            "transactions = pickle.loads(sys.stdin.buffer.read())\n"
+            "print(repr([(t.payee_id, t.payee, t.normalised_payee) for t in transactions]))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            input=pickle.dumps(transactions),
+            capture_output=True,
+            env=os.environ | {"PYTHONPATH": os.pathsep.join(sys.path)},
+            check=True,
+        )
+        self.assertEqual(
+            result.stdout.decode().strip(),
+            repr([(t.payee_id, t.payee, t.normalised_payee) for t in transactions])
+        )
@@ -0,0 +1,65 @@
+from typing import List
+from unittest import TestCase
+
+from banking.fixtures import random_rule_transactions, naive_category
+from testing_utils import RandomisedTest
+from vortex.banking.category.categorize import RULES
+from vortex.banking.category.payee_categories import CATEGORIES
+from vortex.banking.category.rule_impact import RuleImpact
+from vortex.banking.category.rules import CategoryRule, Clause, Patterns
+from vortex.date_range import Day
+from vortex.date_range.simple_date_range import SimpleDateRange
+from vortex.utils import RandomNumberGenerator
+
+PERIOD = SimpleDateRange(Day(2022, 1, 1), Day(2023, 12, 31))
+
+
+def _mutated_clause(rng: RandomNumberGenerator, clause: Clause) -> Clause:
+    all_of = list(clause.all_of)
+    category = clause.category
+    mutation = rng.randint(3)
+    i = rng.randint(len(all_of))
+    patterns = list(all_of[i].patterns)
+    if mutation == 0 and len(patterns) > 1:
+        patterns.remove(rng.choice(patterns))
+    elif mutation == 1:
+        patterns.append(rng.choice(["ticketweb", "zettle", "sumup", "thames", "vortex"]))
+    else:
+        category = rng.choice(CATEGORIES)
+    all_of[i] = Patterns(all_of[i].kind, patterns)
+    return Clause(category, *all_of, unless=clause.unless, guard=clause.guard)
+
+
+def _mutated_rules(rng: RandomNumberGenerator, rules: List[CategoryRule]) -> List[CategoryRule]:
+    rules = list(rules)
+    for _ in range(rng.randint(1, 4)):
+        mutation = rng.randint(3)
+        i = rng.randint(len(rules))
+        if mutation == 0:
+            clauses = list(rules[i].clauses)
+            j = rng.randint(len(clauses))
+            clauses[j] = _mutated_clause(rng, clauses[j])
+            rules[i] = CategoryRule(rules[i].name, clauses)
+        elif mutation == 1:
+            del rules[i]
+        else:
+            j = rng.randint(len(rules))
+            rules[i], rules[j] = rules[j], rules[i]
+    return rules
+
+
+class RuleImpactTests(TestCase):
+    @RandomisedTest(number_of_runs=10)
+    def test_changes_match_recategorising_everything(self, rng):
+        new_rules = _mutated_rules(rng, RULES)
+        transactions = random_rule_transactions(rng, RULES, PERIOD, rng.randint(0, 500))
+        expected = []
+        for t in transactions:
+            old_category, new_category = naive_category(RULES, t), naive_category(new_rules, t)
+            if old_category != new_category:
+                expected.append((t, old_category, new_category))
+        self.assertEqual(RuleImpact(RULES, new_rules).changed_categories(transactions), expected)
+
+    def test_no_changes(self):
+        impact = RuleImpact(RULES, list(RULES))
+        self.assertFalse(impact.has_changes)
@@ -0,0 +1,52 @@
+from collections import Counter
+from unittest import TestCase
+
+from banking.fixtures import random_rule_transactions, naive_category, naive_rule_outcomes
+from testing_utils import RandomisedTest
+from vortex.banking.category.categorize import RULES, COMPILED_RULES, category_for_transaction, profiling_categories
+from vortex.date_range import Day
+from vortex.date_range.simple_date_range import SimpleDateRange
+
+PERIOD = SimpleDateRange(Day(2022, 1, 1), Day(2023, 12, 31))
+
+
+class RuleProfileTests(TestCase):
+    @RandomisedTest(number_of_runs=10)
+    def test_counts_match_testing_every_rule(self, rng):
+        transactions = random_rule_transactions(rng, RULES, PERIOD, rng.randint(1, 500))
+        with profiling_categories() as profile:
+            categories = [category_for_transaction(t) for t in transactions]
+        self.assertEqual(categories, [COMPILED_RULES.category(t) for t in transactions])
+        self.assertEqual(categories, [naive_category(RULES, t) for t in transactions])
+
+        evaluations, hits, shadowed = Counter(), Counter(), Counter()
+        fall_throughs = 0
+        for t in transactions:
+            evaluated, satisfied = naive_rule_outcomes(RULES, t)
+            evaluations.update(evaluated)
+            if len(satisfied) == 0:
+                fall_throughs += 1
+            else:
+                hits[satisfied[0]] += 1
+                shadowed.update(satisfied[1:])
+        self.assertEqual(profile.num_transactions, len(transactions))
+        self.assertEqual(profile.fall_throughs, fall_throughs)
+        self.assertEqual(+profile.evaluations, evaluations)
+        self.assertEqual(+profile.hits, hits)
+        self.assertEqual(+profile.shadowed, shadowed)
+        self.assertEqual(sum(profile.hits.values()) + profile.fall_throughs, len(transactions))
+
+    @RandomisedTest(number_of_runs=10)
+    def test_first_match_gives_the_hit_rule(self, rng):
+        transactions = random_rule_transactions(rng, RULES, PERIOD, rng.randint(1, 200))
+        for t in transactions:
+            with profiling_categories() as profile:
+                category = category_for_transaction(t)
+            i = COMPILED_RULES.first_match(t)
+            if i is None:
+                self.assertEqual((profile.fall_throughs, +profile.hits), (1, Counter()))
+            else:
+                rule, clause = COMPILED_RULES.clauses[i]
+                self.assertEqual(category, clause.category)
+                self.assertEqual(+profile.hits, Counter({rule.name: 1}))
+                self.assertEqual(naive_rule_outcomes(RULES, t)[1][0], rule.name)
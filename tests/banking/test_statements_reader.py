@@ -0,0 +1,178 @@
+import os
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from banking.fixtures import random_amount, PAYEES
+from testing_utils import RandomisedTest
+from vortex.banking import BankAccountActivity, StatementsReader
+from vortex.banking.account.bank_account import CURRENT_ACCOUNT
+from vortex.date_range import Day
+from vortex.utils import RandomNumberGenerator
+from vortex.utils.file_utils import write_csv_file
+
+HEADER = ["Date", "Type", "Description", "Paid out", "Paid in", "Balance"]
+
+
+def _statement_rows(rng: RandomNumberGenerator, first_day: Day, num_days: int, opening: Decimal):
+    """Rows for the days from `first_day`, publishing the balance on each day's last row, and the closing balance"""
+    balance = opening
+    rows = []
+    for d in [first_day + i for i in range(num_days)]:
+        for _ in range(rng.randint(0, 3)):
+            amount = random_amount(rng)
+            balance += amount
+            paid_out, paid_in = (str(-amount), "") if amount < 0 else ("", str(amount))
+            rows.append([d.iso_repr, "DEB", rng.choice(PAYEES), paid_out, paid_in, ""])
+        if len(rows) > 0 and rows[-1][0] == d.iso_repr:
+            rows[-1][5] = str(balance)
+    return rows, balance
+
+
+def _spy_on(cls, method_name: str):
+    """Patches the method with a mock that records calls but still runs it"""
+    return patch.object(cls, method_name, autospec=True, side_effect=getattr(cls, method_name))
+
+
+class StatementsReaderTestCase(TestCase):
+    def setUp(self):
+        self._dirs = []
+        self._shelf = StatementsReader.SHELF
+
+    def tearDown(self):
+        StatementsReader.SHELF = self._shelf
+        for d in self._dirs:
+            d.cleanup()
+
+    def new_statements_dir(self):
+        # Randomised tests run several times per setUp, so each run starts with its own directory and shelf
+        self._dirs.append(tempfile.TemporaryDirectory())
+        self.statements_dir = Path(self._dirs[-1].name)
+        self.account_dir = self.statements_dir / "csv" / str(CURRENT_ACCOUNT.id)
+        self.account_dir.mkdir(parents=True)
+        StatementsReader.SHELF = self.statements_dir / "_statements_reader.shelf"
+
+    def write_months(
+            self,
+            rng: RandomNumberGenerator,
+            num_months: int,
+            first_day: Day = Day(2023, 1, 1),
+            opening: Decimal = Decimal("1000.00"),
+    ) -> tuple[Day, Decimal]:
+        """Writes a statement file of 30 days for each month, returning the day after and the closing balance"""
+        for _ in range(num_months):
+            rows, closing = _statement_rows(rng, first_day, 30, opening)
+            if first_day == Day(2023, 1, 1):
+                rows = [[(first_day - 1).iso_repr, "BAL", "OPENING", "", "", str(opening)]] + rows
+            write_csv_file(self.account_dir / f"{first_day.iso_repr}.csv", [HEADER] + rows)
+            first_day, opening = first_day + 30, closing
+        return first_day, opening
+
+    def read_statements(self, force: bool, refresh: bool = False) -> BankAccountActivity:
+        activities = StatementsReader.read_statements(force, refresh, statements_dir=self.statements_dir)
+        self.assertEqual([a.account for a in activities], [CURRENT_ACCOUNT])
+        return activities[0]
+
+
+class ParsedStatementFilesTests(StatementsReaderTestCase):
+    def parse(self, force: bool) -> tuple[dict[str, tuple], list[str]]:
+        """The current account's cached csv files, along with the names of those parsed to produce them"""
+        parse_file = StatementsReader._parse_statement_file
+        with patch.object(StatementsReader, "_parse_statement_file", side_effect=parse_file) as parsed:
+            csv_files, _ = StatementsReader._parsed_statement_files(self.statements_dir, force)
+        return csv_files.get(CURRENT_ACCOUNT, {}), [c.args[1].name for c in parsed.call_args_list]
+
+    @RandomisedTest(number_of_runs=3)
+    def test_unchanged_files_are_not_reparsed(self, rng):
+        self.new_statements_dir()
+        self.write_months(rng, 2)
+        files, parsed = self.parse(force=True)
+        self.assertEqual(parsed, sorted(files.keys()))
+        refreshed, parsed = self.parse(force=True)
+        self.assertEqual(parsed, [])
+        self.assertEqual(refreshed, files)
+
+    @RandomisedTest(number_of_runs=3)
+    def test_changed_file_is_reparsed(self, rng):
+        self.new_statements_dir()
+        self.write_months(rng, 2)
+        files, _ = self.parse(force=True)
+        changed = sorted(files.keys())[0]
+        self.write_months(rng, 1, opening=Decimal("2000.00"))
+        stat = (self.account_dir / changed).stat()
+        os.utime(self.account_dir / changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        refreshed, parsed = self.parse(force=True)
+        self.assertEqual(parsed, [changed])
+        self.assertNotEqual(refreshed[changed], files[changed])
+        self.assertEqual(refreshed[changed][1], StatementsReader._parse_statement_file(
+            CURRENT_ACCOUNT, self.account_dir / changed
+        ))
+
+    @RandomisedTest(number_of_runs=3)
+    def test_new_files_are_only_read_when_forced(self, rng):
+        self.new_statements_dir()
+        next_day, closing = self.write_months(rng, 1)
+        files, _ = self.parse(force=True)
+        self.write_months(rng, 1, next_day, closing)
+        unforced, parsed = self.parse(force=False)
+        self.assertEqual(parsed, [])
+        self.assertEqual(unforced, files)
+        forced, parsed = self.parse(force=True)
+        self.assertEqual(parsed, [next_day.iso_repr + ".csv"])
+        self.assertEqual(sorted(forced.keys()), sorted(list(files.keys()) + parsed))
+
+    @RandomisedTest(number_of_runs=2)
+    def test_parser_version_change_reparses_every_file(self, rng):
+        self.new_statements_dir()
+        self.write_months(rng, 2)
+        files, _ = self.parse(force=True)
+        with patch.object(StatementsReader, "CSV_PARSER_VERSION", StatementsReader.CSV_PARSER_VERSION + 1):
+            refreshed, parsed = self.parse(force=True)
+        self.assertEqual(parsed, sorted(files.keys()))
+        self.assertEqual([result for _, result in refreshed.values()], [result for _, result in files.values()])
+
+
+class ReadStatementsTests(StatementsReaderTestCase):
+    def assert_same_activity(self, a1: BankAccountActivity, a2: BankAccountActivity):
+        self.assertEqual(sorted(map(str, a1.transactions)), sorted(map(str, a2.transactions)))
+        self.assertEqual(a1.published_balances, a2.published_balances)
+        self.assertEqual(a1.latest_balance, a2.latest_balance)
+
+    @RandomisedTest(number_of_runs=5)
+    def test_extending_with_new_file_equals_full_rebuild(self, rng):
+        self.new_statements_dir()
+        next_day, closing = self.write_months(rng, 2)
+        self.read_statements(force=True)
+        self.write_months(rng, 1, next_day, closing)
+        with (
+            _spy_on(BankAccountActivity, "extended") as extended,
+            _spy_on(BankAccountActivity, "check_consistency") as check_consistency,
+        ):
+            extended_activity = self.read_statements(force=False, refresh=True)
+        self.assertEqual(extended.call_count, 1)
+        self.assertEqual(check_consistency.call_count, 1)
+        self.assertGreaterEqual(check_consistency.call_args.args[1], next_day)
+        self.assert_same_activity(extended_activity, self.read_statements(force=True))
+
+    @RandomisedTest(number_of_runs=5)
+    def test_inconsistent_new_file_fails(self, rng):
+        self.new_statements_dir()
+        next_day, closing = self.write_months(rng, 2)
+        self.read_statements(force=True)
+        self.write_months(rng, 1, next_day, closing + Decimal("1.00"))
+        with self.assertRaises(AssertionError):
+            self.read_statements(force=False, refresh=True)
+
+    @RandomisedTest(number_of_runs=2)
+    def test_force_rebuilds_unchanged_activity(self, rng):
+        self.new_statements_dir()
+        self.write_months(rng, 2)
+        activity = self.read_statements(force=True)
+        with _spy_on(BankAccountActivity, "check_consistency") as check_consistency:
+            self.assert_same_activity(self.read_statements(force=False, refresh=True), activity)
+            self.assertEqual(check_consistency.call_count, 0)
+            self.assert_same_activity(self.read_statements(force=True), activity)
+            self.assertEqual(check_consistency.call_count, 1)
+            self.assertEqual(check_consistency.call_args.args[1:], ())
@@ -0,0 +1,46 @@
+import pickle
+from unittest import TestCase
+
+from banking.fixtures import random_transactions
+from testing_utils import RandomisedTest
+from vortex.banking.category.payee_categories import CATEGORIES
+from vortex.banking.transaction.transaction import Transaction
+from vortex.date_range import Day
+from vortex.date_range.simple_date_range import SimpleDateRange
+
+PERIOD = SimpleDateRange(Day(2022, 1, 1), Day(2023, 12, 31))
+FIELDS = ["account", "category", "payment_date", "payee", "amount"]
+
+
+class TransactionTests(TestCase):
+    def assert_same_slots(self, t1: Transaction, t2: Transaction):
+        self.assertEqual(
+            [getattr(t1, s) for s in Transaction.__slots__], [getattr(t2, s) for s in Transaction.__slots__]
+        )
+
+    @RandomisedTest(number_of_runs=20)
+    def test_fields_cannot_be_assigned(self, rng):
+        for t in random_transactions(rng, PERIOD, 5, categories=CATEGORIES):
+            for slot in Transaction.__slots__:
+                with self.assertRaises(AttributeError):
+                    setattr(t, slot, getattr(t, slot))
+            with self.assertRaises(AttributeError):
+                t.note = "new attribute"
+
+    @RandomisedTest(number_of_runs=20)
+    def test_trusted_matches_constructor(self, rng):
+        exponents = rng.choice([(-2,), (-3, -2, 0)])
+        for t in random_transactions(rng, PERIOD, 20, categories=CATEGORIES, exponents=exponents):
+            trusted = Transaction.trusted(*[getattr(t, f) for f in FIELDS])
+            self.assert_same_slots(trusted, t)
+            self.assertEqual(trusted, t)
+            self.assertEqual(hash(trusted), hash(t))
+
+    @RandomisedTest(number_of_runs=20)
+    def test_pickle_round_trip(self, rng):
+        transactions = random_transactions(rng, PERIOD, 20, categories=CATEGORIES, exponents=(-3, -2, 0))
+        unpickled = pickle.loads(pickle.dumps(transactions))
+        self.assertEqual(unpickled, transactions)
+        for t1, t2 in zip(unpickled, transactions):
+            self.assertEqual(t1.payee, t2.payee)
+            self.assert_same_slots(t1, t2)
@@ -0,0 +1,64 @@
+from unittest import TestCase
+
+from banking.fixtures import random_transactions, random_sub_period, naive_total
+from testing_utils import RandomisedTest
+from vortex.banking.category.payee_categories import CATEGORIES
+from vortex.banking.transaction.transaction_frame import TransactionFrame
+from vortex.banking.transaction.transactions import Transactions
+from vortex.date_range import Day
+from vortex.date_range.simple_date_range import SimpleDateRange
+
+PERIOD = SimpleDateRange(Day(2022, 1, 1), Day(2023, 12, 31))
+
+
+def _random_transactions(rng) -> Transactions:
+    # Sometimes include amounts with fractional pence, which can't be held as whole pence
+    exponents = rng.choice([(-2,), (-2, -1, 0), (-3, -2, 0)])
+    return Transactions(
+        random_transactions(rng, PERIOD, rng.randint(0, 300), categories=CATEGORIES, exponents=exponents)
+    )
+
+
+class TransactionsTests(TestCase):
+    @RandomisedTest(number_of_runs=20)
+    def test_totals_match_naive_sum(self, rng):
+        transactions = _random_transactions(rng)
+        self.assertEqual(str(transactions.total_amount), str(naive_total(transactions.transactions)))
+        periods = [random_sub_period(rng, PERIOD) for _ in range(5)]
+        for period, in_period in zip(periods, transactions.split_by_periods(periods)):
+            expected = [t for t in transactions.transactions if period.contains_day(t.payment_date)]
+            self.assertEqual(in_period.transactions, expected)
+            self.assertEqual(str(in_period.total_amount), str(naive_total(expected)))
+            categories = [rng.choice(CATEGORIES) for _ in range(rng.randint(1, 5))]
+            restricted = in_period.restrict_to_categories(categories)
+            expected = [t for t in expected if t.category in categories]
+            self.assertEqual(restricted.transactions, expected)
+            self.assertEqual(str(restricted.total_amount), str(naive_total(expected)))
+
+    @RandomisedTest(number_of_runs=20)
+    def test_concat_matches_single_frame(self, rng):
+        parts = [_random_transactions(rng) for _ in range(rng.randint(0, 4))]
+        # Drop any transaction repeated across parts, which concat rejects
+        seen = set()
+        parts = [Transactions([t for t in part.transactions if t not in seen and not seen.add(t)]) for part in parts]
+        combined = [t for part in parts for t in part.transactions]
+        concatenated = Transactions.concat(parts)
+        self.assertEqual(concatenated, Transactions(combined))
+        self.assertEqual(str(concatenated.total_amount), str(naive_total(combined)))
+        self.assertEqual(
+            str(concatenated.frame.total()), str(TransactionFrame.from_transactions(combined).total())
+        )
+        for category in CATEGORIES:
+            self.assertEqual(
+                str(concatenated.total_for(category)),
+                str(Transactions(combined).total_for(category))
+            )
+
+    @RandomisedTest(number_of_runs=10)
+    def test_concat_rejects_transactions_repeated_across_parts(self, rng):
+        transactions = _random_transactions(rng).transactions
+        if len(transactions) == 0:
+            return
+        repeated = rng.choice(transactions)
+        with self.assertRaises(ValueError):
+            Transactions.concat([Transactions(transactions), Transactions([repeated])])
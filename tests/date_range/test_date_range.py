@@ -1,7 +1,10 @@
+import pickle
+from datetime import datetime
 from unittest import TestCase
 
 from date_range.fixtures import random_day, random_month, random_accounting_year, random_week, random_accounting_month, \
     random_quarter
+from vortex.date_range import Day, DateParser, DATE_FORMATS
 from vortex.date_range.accounting_month import AccountingMonth
 from vortex.date_range.accounting_year import AccountingYear
 from vortex.date_range.month import Month
@@ -29,6 +32,27 @@ class DateRangeTests(TestCase):
             self.assertLessEqual(d0, d1)
 
 
+class DayTests(TestCase):
+    @RandomisedTest(number_of_runs=100)
+    def test_matches_date(self, rng):
+        d = random_day(rng)
+        n = rng.randint(-1000, 1000)
+        self.assertEqual((d + n).date.toordinal(), d.date.toordinal() + n)
+        self.assertEqual(d.weekday, d.date.weekday())
+        self.assertEqual(d.iso_repr, d.date.isoformat())
+        self.assertEqual(Day.from_ordinal(d.ordinal), d)
+
+    @RandomisedTest(number_of_runs=10)
+    def test_interned(self, rng):
+        d = random_day(rng)
+        self.assertIs(Day(d.y, d.m, d.d), d)
+        self.assertIs(Day.from_date(d.date) + 1 - 1, d)
+        self.assertIs(pickle.loads(pickle.dumps(d)), d)
+        self.assertFalse(hasattr(d, "__dict__"))
+        with self.assertRaises(AssertionError):
+            Day(float(d.y), d.m, d.d)
+
+
 class MonthTests(TestCase):
     def test_tab_name(self):
         m = Month(2023, 4)
@@ -151,3 +175,43 @@ class QuarterTests(TestCase):
         q = random_quarter(rng)
         self.assertEqual(Quarter.containing(q.first_day), q)
         self.assertEqual(Quarter.containing(q.last_day), q)
+
+
+class DateParserTests(TestCase):
+    @staticmethod
+    def _strptime_date(text):
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(text.strip(), fmt).date()
+            except ValueError:
+                pass
+        raise ValueError(f"Can't parse '{text}' as date")
+
+    @RandomisedTest(number_of_runs=20)
+    def test_same_as_trying_every_format(self, rng):
+        parser = DateParser()
+        texts = []
+        for _ in range(50):
+            d = random_day(rng).date
+            texts.append(d.strftime(rng.choice(DATE_FORMATS)))
+        texts += [" 2023-01-02 ", "1/2/2023", "2023-1-2", "31/02/2023", "2023-02-31", "12-Jan-23"]
+        for text in texts:
+            try:
+                expected = self._strptime_date(text)
+            except ValueError:
+                self.assertRaises(ValueError, parser.parse, text)
+                continue
+            self.assertEqual(parser.parse(text), expected)
+            self.assertEqual(Day.parse(text), Day.from_date(expected))
+
+    @RandomisedTest(number_of_runs=20)
+    def test_parse_all_same_as_parsing_each_text(self, rng):
+        texts = [random_day(rng).date.strftime(rng.choice(DATE_FORMATS)) for _ in range(20)]
+        texts = [rng.choice(texts) for _ in range(50)]
+        self.assertEqual(DateParser().parse_all(texts), [self._strptime_date(text) for text in texts])
+        bad_texts = texts + ["", "31/02/2023"]
+        self.assertRaises(ValueError, DateParser().parse_all, bad_texts)
+        self.assertEqual(
+            DateParser().parse_all(bad_texts, strict=False),
+            [self._strptime_date(text) for text in texts] + [None, None]
+        )
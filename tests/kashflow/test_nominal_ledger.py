@@ -0,0 +1,91 @@
+import pickle
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+from unittest import TestCase
+
+from banking.fixtures import random_amount
+from date_range.fixtures import random_day
+from testing_utils import RandomisedTest
+from vortex.date_range import Day
+from vortex.kashflow.nominal_ledger import NominalLedger, NominalLedgerItem, NominalLedgerItemType
+from vortex.utils import RandomNumberGenerator
+from vortex.utils.file_utils import write_csv_file
+
+
+def random_ledger_items(
+        rng: RandomNumberGenerator,
+        num_items: int,
+        exponents: tuple[int, ...] = (-2,),
+) -> list[NominalLedgerItem]:
+    return [
+        NominalLedgerItem(
+            code=rng.randint(1000, 9999),
+            item_type=rng.choice(list(NominalLedgerItemType)),
+            date=random_day(rng, Day(2023, 1, 1), Day(2024, 12, 31)),
+            reference=f"REF{rng.randint(0, 1000)}",
+            narrative=rng.choice(["Rent", "Bar stock", "Piano tuning"]),
+            amount=random_amount(rng, exponents),
+        )
+        for _ in range(num_items)
+    ]
+
+
+class NominalLedgerItemTests(TestCase):
+    FIELDS = ["code", "item_type", "date", "reference", "narrative", "amount"]
+
+    def assert_same_slots(self, i1: NominalLedgerItem, i2: NominalLedgerItem):
+        self.assertEqual(
+            [getattr(i1, s) for s in NominalLedgerItem.__slots__], [getattr(i2, s) for s in NominalLedgerItem.__slots__]
+        )
+
+    @RandomisedTest(number_of_runs=10)
+    def test_fields_cannot_be_assigned(self, rng):
+        for item in random_ledger_items(rng, 5):
+            for slot in NominalLedgerItem.__slots__:
+                with self.assertRaises(AttributeError):
+                    setattr(item, slot, getattr(item, slot))
+            with self.assertRaises(AttributeError):
+                item.note = "new attribute"
+
+    @RandomisedTest(number_of_runs=10)
+    def test_trusted_matches_constructor(self, rng):
+        for item in random_ledger_items(rng, 20, exponents=(-3, -2, 0)):
+            self.assert_same_slots(NominalLedgerItem.trusted(*[getattr(item, f) for f in self.FIELDS]), item)
+
+    @RandomisedTest(number_of_runs=10)
+    def test_pickle_round_trip(self, rng):
+        items = random_ledger_items(rng, 20, exponents=(-3, -2, 0))
+        for i1, i2 in zip(pickle.loads(pickle.dumps(items)), items):
+            self.assert_same_slots(i1, i2)
+
+
+class NominalLedgerTests(TestCase):
+    def test_empty_total_is_zero(self):
+        total = NominalLedger.empty().total_amount()
+        self.assertEqual((type(total), total), (int, 0))
+
+    @RandomisedTest(number_of_runs=50)
+    def test_total_matches_summing_amounts(self, rng):
+        # Mixed exponents, sometimes with fractional pence, which can't be held as whole pence
+        exponents = rng.choice([(-2,), (-2, -1, 0), (-3, -2, 0), (0, 1)])
+        ledger = NominalLedger(random_ledger_items(rng, rng.randint(1, 50), exponents))
+        self.assertEqual(str(ledger.total_amount()), str(sum(item.amount for item in ledger.ledger_items)))
+        for item_type in ledger.item_types:
+            expected = sum(item.amount for item in ledger.ledger_items if item.item_type == item_type)
+            self.assertEqual(str(ledger.total_for(item_type)), str(expected))
+
+    @RandomisedTest(number_of_runs=10)
+    def test_read_from_csv_file(self, rng):
+        items = random_ledger_items(rng, rng.randint(1, 30))
+        rows = [["Nominal Ledger Report"], ["Code", "Type", "Date", "Reference", "Narrative", "Debit", "Credit"]]
+        for item in items:
+            debit, credit = (str(-item.amount), "") if item.amount < 0 else ("", str(item.amount))
+            date = item.date.date.strftime(rng.choice(["%d/%m/%Y", "%d %b %Y"]))
+            rows.append([item.code, item.item_type.value, date, item.reference, item.narrative, debit, credit])
+        rows += [["", "", "", "", "TOTALS", "", ""], ["End of report"]]
+        with tempfile.TemporaryDirectory() as tmp:
+            file = Path(tmp) / "ledger.csv"
+            write_csv_file(file, rows)
+            ledger = NominalLedger._from_csv_file(file)
+        self.assertEqual(list(map(str, ledger.ledger_items)), list(map(str, items)))
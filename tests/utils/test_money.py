@@ -0,0 +1,25 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from testing_utils import RandomisedTest
+from vortex.utils.money import to_pence, from_pence, maybe_to_pence
+
+
+class MoneyTestCase(TestCase):
+    @RandomisedTest(number_of_runs=10)
+    def test_round_trip(self, rng):
+        for _ in range(100):
+            pence = rng.randint(-10 ** 9, 10 ** 9)
+            amount = from_pence(pence)
+            self.assertEqual(to_pence(amount), pence)
+            self.assertEqual(amount, Decimal(pence) / 100)
+            self.assertEqual(amount.as_tuple().exponent, -2)
+
+    def test_whole_pence(self):
+        self.assertEqual(to_pence(Decimal("12.3")), 1230)
+        self.assertEqual(to_pence(Decimal("-7")), -700)
+        self.assertEqual(to_pence(Decimal("1.500")), 150)
+        self.assertEqual(to_pence(Decimal("1E+1")), 1000)
+        self.assertIsNone(maybe_to_pence(Decimal("0.001")))
+        with self.assertRaises(ValueError):
+            to_pence(Decimal("0.125"))
@@ -0,0 +1,25 @@
+from unittest import TestCase
+
+from testing_utils import RandomisedTest
+from vortex.utils.multi_pattern import MultiPatternMatcher
+
+
+class MultiPatternMatcherTestCase(TestCase):
+    @RandomisedTest(number_of_runs=20)
+    def test_same_as_naive_matching(self, rng):
+        def random_text(max_length):
+            return "".join(rng.choice("abc ") for _ in range(rng.randint(0, max_length)))
+
+        patterns = list({random_text(4) for _ in range(30)})
+        matcher = MultiPatternMatcher(prefixes=patterns, substrings=patterns, suffixes=patterns)
+        for _ in range(100):
+            text = random_text(20)
+            self.assertEqual(sorted(matcher.prefixes_of(text)), sorted(p for p in patterns if text.startswith(p)))
+            self.assertEqual(matcher.substrings_of(text), {p for p in patterns if p in text})
+            self.assertEqual(sorted(matcher.suffixes_of(text)), sorted(p for p in patterns if text.endswith(p)))
+
+    def test_overlapping_substrings(self):
+        matcher = MultiPatternMatcher(substrings=["he", "she", "his", "hers"])
+        self.assertEqual(matcher.substrings_of("ushers"), {"he", "she", "hers"})
+        self.assertEqual(matcher.substrings_of("this"), {"his"})
+        self.assertEqual(matcher.substrings_of("xyz"), set())
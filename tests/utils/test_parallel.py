@@ -0,0 +1,44 @@
+import io
+from contextlib import redirect_stdout
+from unittest import TestCase
+from unittest.mock import patch
+
+from vortex.utils import parallel
+from vortex.utils.parallel import parallel_map
+
+
+def _negate(x: int) -> int:
+    return -x
+
+
+def _subtract(x: int, y: int) -> int:
+    return x - y
+
+
+class ParallelMapTests(TestCase):
+    def test_same_as_serial(self):
+        values = list(range(100))
+        self.assertEqual(parallel_map(_negate, values, min_items=0, description="test"), [-x for x in values])
+        self.assertEqual(
+            parallel_map(_subtract, values, values[::-1], min_items=0, description="test"),
+            [x - y for x, y in zip(values, values[::-1])]
+        )
+        self.assertEqual(parallel_map(_negate, [], min_items=0, description="test"), [])
+
+    def test_serial_without_a_pool(self):
+        values = list(range(10))
+        with patch.object(parallel, "ProcessPoolExecutor") as executor:
+            with patch.object(parallel.os, "cpu_count", return_value=1):
+                self.assertEqual(parallel_map(_negate, values, min_items=0, description="test"), [-x for x in values])
+            self.assertEqual(parallel_map(_negate, [7], min_items=2, description="test"), [-7])
+            executor.assert_not_called()
+
+    def test_falls_back_to_serial_when_the_pool_fails(self):
+        values = list(range(10))
+        with (
+            patch.object(parallel, "ProcessPoolExecutor", side_effect=OSError("no processes")),
+            patch.object(parallel.os, "cpu_count", return_value=4),
+            redirect_stdout(io.StringIO()) as output,
+        ):
+            self.assertEqual(parallel_map(_negate, values, min_items=0, description="test"), [-x for x in values])
+        self.assertIn("running serially", output.getvalue())
@@ -0,0 +1,51 @@
+from unittest import TestCase
+
+from vortex.utils import checked_type, checked_list_type, checked_dict_type, ValidationPolicy, \
+    set_validation_policy, validation_boundary, collecting_validation_stats
+
+
+class TypeChecksTestCase(TestCase):
+    def tearDown(self):
+        set_validation_policy(ValidationPolicy.FULL)
+
+    def test_full(self):
+        self.assertEqual(checked_list_type([1, 2], int), [1, 2])
+        with self.assertRaises(AssertionError):
+            checked_list_type([1, "2"], int)
+        with self.assertRaises(AssertionError):
+            checked_dict_type({1: "a", 2: 3}, int, str)
+
+    def test_boundary(self):
+        set_validation_policy(ValidationPolicy.BOUNDARY)
+        self.assertEqual(checked_type("1", int), "1")
+        self.assertEqual(checked_list_type([1, "2"], int), [1, "2"])
+        with validation_boundary():
+            with self.assertRaises(AssertionError):
+                checked_type("1", int)
+        checked_type("1", int)
+
+    def test_sampled(self):
+        set_validation_policy(ValidationPolicy.SAMPLED, sample_fraction=0.25)
+        with self.assertRaises(AssertionError):
+            checked_type("1", int)
+        with self.assertRaises(AssertionError):
+            checked_list_type(["1"] * 100, int)
+        with collecting_validation_stats() as stats:
+            checked_list_type(list(range(100)), int)
+        self.assertEqual(stats.by_type["int"][:2], [1, 25])
+        with collecting_validation_stats() as stats:
+            checked_dict_type({i: str(i) for i in range(100)}, int, str)
+        self.assertEqual(stats.by_type["int"][:2], [1, 25])
+        self.assertEqual(stats.by_type["str"][:2], [1, 25])
+
+    def test_stats(self):
+        with collecting_validation_stats() as stats:
+            checked_type(1, int)
+            checked_list_type([1, 2, 3], int)
+            checked_dict_type({1: "a"}, int, str)
+        self.assertEqual(stats.by_type["int"][:2], [3, 5])
+        self.assertEqual(stats.by_type["str"][:2], [1, 1])
+        self.assertGreaterEqual(stats.total_seconds, 0)
+        lines = str(stats).splitlines()
+        self.assertEqual(lines[0].split(), ["Type", "Checks", "Elements", "Seconds"])
+        self.assertEqual(sorted(line.split()[:3] for line in lines[2:]), [["int", "3", "5"], ["str", "1", "1"]])